@@ -0,0 +1,518 @@
+"""
+Micro-benchmarks for the competition system.
+Run from the folder that holds countries.csv:  python benchmarks.py
+"""
+import copy
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from runner import Runner
+from competition import Competition
+from standings import ordinal_labels
+from custom_errors import CustomTypeError, CustomValueError
+
+
+def make_runners(n: int, seed: int = 0) -> list:
+    """
+    Builds n runners quickly by copying one validated template runner.
+
+    Args:
+    n(int):The number of runners to build.
+    seed(int):Seed for the random speeds.
+    Returns:
+    list: List of Runner objects with unique names.
+    """
+    rng = random.Random(seed)
+    template = Runner('Template', 20, 'Australia', 4.0, 3.0)
+    runners = []
+    for i in range(n):
+        runner = copy.copy(template)  # skip the per-runner csv lookup, the template is already valid
+        runner.name = f"Runner{i}"
+        runner.sprint_speed = round(rng.uniform(2.2, 6.8), 2)
+        runner.endurance_speed = round(rng.uniform(1.8, 5.4), 2)
+        runners.append(runner)
+    return runners
+
+
+def bench_leaderboard(n: int = 10**5, repeat: int = 5) -> float:
+    """
+    Times update_leaderboard on a board of n runners.
+
+    Args:
+    n(int):The number of runners on the board.
+    repeat(int):How many updates are timed, the best one is reported.
+    Returns:
+    float: Best time of a single update in seconds.
+    """
+    runners = make_runners(n)
+    competition = Competition(runners, 1, [1.0], [1.0])
+    rng = random.Random(1)
+    results = [(runner, rng.uniform(100.0, 900.0)) for runner in runners]
+    ordinal_labels(n)  # the first update pays for the labels only once
+    best = min(timeit.repeat(lambda: competition.update_leaderboard(results), number=1, repeat=repeat))
+    print(f"update_leaderboard, {n} runners: {best * 1000:.1f} ms")
+    return best
+
+
+def bench_categories(n: int = 10**5, repeat: int = 5) -> tuple:
+    """
+    Times update_leaderboard plus a top-10 query of every country and age group against the global board alone.
+    The runners are spread over four countries and every age group.
+
+    Args:
+    n(int):The number of runners on the board.
+    repeat(int):How many updates are timed, the best one is reported.
+    Returns:
+    tuple: Best update time with and without the category standings in seconds.
+    """
+    rng = random.Random(1)
+    runners = make_runners(n)
+    for runner in runners:
+        runner.age = rng.randint(5, 80)
+        runner.country = rng.choice(['Australia', 'Botswana', 'France', 'Iceland'])
+    results = [(runner, rng.uniform(100.0, 900.0)) for runner in runners]
+    ordinal_labels(n)
+    competition = Competition(runners, 1, [1.0], [1.0])
+    def update_and_query():
+        competition.update_leaderboard(results)
+        for category, boards in competition.categories.items():
+            for value in boards:
+                competition.category_leaderboard(category, value, 10)
+    with_categories = min(timeit.repeat(update_and_query, number=1, repeat=repeat))
+    global_only = Competition(runners, 1, [1.0], [1.0]) # never queried, so it builds no category boards
+    without = min(timeit.repeat(lambda: global_only.update_leaderboard(results), number=1, repeat=repeat))
+    print(f"category standings, {n} runners: {with_categories * 1000:.1f} ms per race, global board only {without * 1000:.1f} ms")
+    return with_categories, without
+
+
+def bench_snapshots(n: int = 1000, readers: int = 4, seconds: float = 1.0) -> tuple:
+    """
+    Measures read throughput of the standings while a writer thread keeps updating the leaderboard,
+    reading lock-free snapshots against reading a copy of the leaderboard under the update lock.
+
+    Args:
+    n(int):The number of runners.
+    readers(int):The number of reader threads.
+    seconds(float):How long each mode runs.
+    Returns:
+    tuple: Reads per second lock-free and locked.
+    """
+    import threading
+    runners = make_runners(n)
+    rng = random.Random(2)
+    races = [[(runner, rng.uniform(100.0, 900.0)) for runner in runners] for _ in range(20)]
+
+    def measure(read) -> float:
+        competition = Competition(runners, 1, [1.0], [1.0])
+        competition.update_leaderboard(races[0])
+        stop = threading.Event()
+        counts = [0] * readers
+        def writer():
+            i = 0
+            while not stop.is_set():
+                competition.update_leaderboard(races[i % len(races)])
+                i += 1
+        def reader(slot):
+            count = 0
+            while not stop.is_set():
+                read(competition)
+                count += 1
+            counts[slot] = count
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return sum(counts) / seconds
+
+    def locked(competition):
+        with competition._update_lock:
+            return dict(competition.leaderboard)
+    lock_free = measure(lambda competition: competition.snapshot().top(10))
+    with_lock = measure(locked)
+    print(f"standings reads, {readers} readers and 1 writer: {lock_free:,.0f}/s lock-free, {with_lock:,.0f}/s locked")
+    return lock_free, with_lock
+
+
+def bench_schedule(competitions: int = 10**4, rounds: int = 3, repeat: int = 5) -> tuple:
+    """
+    Times creating many small competitions that share one plan, from one Schedule against from the distance lists.
+
+    Args:
+    competitions(int):The number of competitions created.
+    rounds(int):The number of rounds of the plan.
+    repeat(int):How many batches are timed, the best one is reported.
+    Returns:
+    tuple: Best batch time from the schedule and from the lists in seconds.
+    """
+    from schedule import Schedule
+    runners = make_runners(8)
+    short, marathon = [0.5 + i / 10 for i in range(rounds)], [4.0 + i for i in range(rounds)]
+    saved = Competition.MAX_ROUNDS
+    Competition.MAX_ROUNDS = max(saved, rounds)
+    try:
+        schedule = Schedule(rounds, short, marathon)
+        slow = min(timeit.repeat(lambda: [Competition(runners, rounds, short, marathon) for _ in range(competitions)], number=1, repeat=repeat))
+        fast = min(timeit.repeat(lambda: [Competition.from_schedule(runners, schedule) for _ in range(competitions)], number=1, repeat=repeat))
+    finally:
+        Competition.MAX_ROUNDS = saved
+    print(f"{competitions} competitions of {rounds} rounds: {fast * 1000:.1f} ms from a schedule, {slow * 1000:.1f} ms from lists")
+    return fast, slow
+
+
+def bench_rounds(n: int = 1000, rounds: tuple = (50, 100, 200)) -> list:
+    """
+    Times competitions with more and more rounds and traces their peak memory, both should stay
+    proportional to the rounds and flat respectively.
+
+    Args:
+    n(int):The number of runners.
+    rounds(tuple):The round counts to run.
+    Returns:
+    list: (rounds, seconds per round, peak bytes) for every round count.
+    """
+    import tracemalloc
+    measured = []
+    for count in rounds:
+        runners = make_runners(n)
+        competition = Competition(runners, count, [0.5, 1.0] * (count // 2), [4.0, 2.0] * (count // 2), max_rounds=count)
+        tracemalloc.start()
+        start = timeit.default_timer()
+        competition.conduct_competition()
+        elapsed = timeit.default_timer() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        measured.append((count, elapsed / count, peak))
+        print(f"{count} rounds of {n} runners: {elapsed / count * 1000:.2f} ms per round, peak {peak / 2**20:.1f} MiB")
+    return measured
+
+
+FIRST_RESULT_SCRIPT = """
+from competition import Competition
+from runner import Runner
+runners = [Runner('Elijah', 19, 'Australia', 6.4, 5.2), Runner('Rupert', 67, 'Botswana', 2.2, 1.8)]
+Competition(runners, 1, [0.5], [4.0]).conduct_competition()
+"""
+
+
+def bench_startup(repeat: int = 5) -> tuple:
+    """
+    Measures the cost of importing competition (python -X importtime) and the
+    wall time of a fresh process that conducts one small competition.
+
+    Args:
+    repeat(int):How many processes are started for each measurement, the best one is reported.
+    Returns:
+    tuple: Best import time and best time to first result, both in seconds.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    import_times = []
+    for _ in range(repeat):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import competition'],
+                                env=env, capture_output=True, text=True, check=True).stderr
+        # the last line is the top level import, its cumulative column covers everything it pulled in
+        import_times.append(int(stderr.strip().splitlines()[-1].split('|')[1]) / 1e6)
+    first_result_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', FIRST_RESULT_SCRIPT], env=env, check=True)
+        first_result_times.append(time.perf_counter() - start)
+    print(f"import competition: {min(import_times) * 1000:.1f} ms")
+    print(f"process start to first result: {min(first_result_times) * 1000:.1f} ms")
+    return min(import_times), min(first_result_times)
+
+
+def bench_replay(events: int = 10**6, field: int = 100) -> float:
+    """
+    Writes a replay log of about 'events' events and times loading it and rebuilding the final leaderboard,
+    the load being where every event is decoded once.
+
+    Args:
+    events(int):The approximate number of events in the log.
+    field(int):The number of runners in every race.
+    Returns:
+    float: Replayed events per second.
+    """
+    from replay import ReplayWriter, ReplayLog
+    runners = make_runners(field)
+    races = events // (2 * field + 1) # a start, one result and one points award per runner
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.log')
+        with ReplayWriter(path, runners) as log:
+            for race in range(races):
+                log.race_start(race // 2 + 1, 'short' if race % 2 == 0 else 'long', 1.0)
+                for runner in runners:
+                    log.result(runner, 100.0)
+                for points, runner in enumerate(runners):
+                    log.points(runner, points)
+        start = time.perf_counter()
+        replay = ReplayLog(path)
+        replay.leaderboard_at(replay.race_count)
+        elapsed = time.perf_counter() - start
+    rate = len(replay) / elapsed
+    print(f"replay of {len(replay)} events: {elapsed * 1000:.1f} ms ({rate / 1e6:.1f} M events/s)")
+    return rate
+
+
+def bench_relay(teams: int = 10**4, legs: int = 4, repeat: int = 5) -> float:
+    """
+    Times a relay race of 'teams' teams with 'legs' legs each.
+
+    Args:
+    teams(int):The number of teams.
+    legs(int):The number of runners per team.
+    repeat(int):How many races are timed, the best one is reported.
+    Returns:
+    float: Best race time in seconds.
+    """
+    from relay import Team, RelayRace
+    runners = make_runners(teams * legs)
+    relay = RelayRace(4.0, [Team(f"Team{i}", runners[i * legs:(i + 1) * legs]) for i in range(teams)])
+    def run():
+        for runner in runners:
+            runner.energy = runner.max_energy
+        relay.conduct_race()
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    print(f"relay, {teams} teams x {legs} legs: {best * 1000:.1f} ms")
+    return best
+
+
+def bench_recovery(n: int = 10**5, repeat: int = 5) -> tuple:
+    """
+    Times recovering a whole roster with an age-based policy against one Runner.recover_energy call per runner.
+
+    Args:
+    n(int):The number of runners.
+    repeat(int):How many passes are timed, the best one is reported.
+    Returns:
+    tuple: Best bulk time and best per-runner time in seconds.
+    """
+    from recovery import AgeBasedRecovery, recover_roster
+    runners = make_runners(n)
+    policy = AgeBasedRecovery(300)
+    def drain():
+        for runner in runners:
+            runner.energy = 100
+    def per_runner():
+        drain()
+        for runner in runners:
+            runner.recover_energy(300)
+    def bulk():
+        drain()
+        recover_roster(runners, policy)
+    slow = min(timeit.repeat(per_runner, number=1, repeat=repeat))
+    fast = min(timeit.repeat(bulk, number=1, repeat=repeat))
+    print(f"recovery, {n} runners: bulk {fast * 1000:.1f} ms, per runner {slow * 1000:.1f} ms")
+    return fast, slow
+
+
+def bench_timing(n: int = 10**5, repeat: int = 5) -> tuple:
+    """
+    Times a short race of 'n' runners with its times looked up in a TimingTable against computing them.
+
+    Args:
+    n(int):The number of runners.
+    repeat(int):How many races are timed, the best one is reported.
+    Returns:
+    tuple: Best race time with and without the table in seconds.
+    """
+    from race import ShortRace
+    from timing import TimingTable
+    runners = make_runners(n)
+    race = ShortRace(1.0, runners)
+    slow = min(timeit.repeat(race.conduct_race, number=1, repeat=repeat))
+    race.timing_table = TimingTable(runners, {'short': [1.0]})
+    fast = min(timeit.repeat(race.conduct_race, number=1, repeat=repeat))
+    print(f"timing table, {n} runners: {fast * 1000:.1f} ms with table, {slow * 1000:.1f} ms without")
+    return fast, slow
+
+
+def bench_pipeline(field: int = 100, races: int = 500, producers: int = 4) -> float:
+    """
+    Times the asyncio pipeline scoring 'races' races of 'field' runners from each of 'producers' load generators.
+
+    Args:
+    field(int):The number of runners in the competition, every race has all of them.
+    races(int):The number of races per producer.
+    producers(int):The number of concurrent producers.
+    Returns:
+    float: Events scored per second.
+    """
+    from competition import Competition
+    from pipeline import run_load
+    competition = Competition(make_runners(field), 1, [1.0], [1.0])
+    start = timeit.default_timer()
+    pipeline = run_load(competition, races, producers=producers)
+    rate = pipeline.events / (timeit.default_timer() - start)
+    print(f"pipeline, {pipeline.events} events: {rate:,.0f} events/s, deepest queue {pipeline.max_depth}")
+    return rate
+
+
+def bench_roster_index(n: int = 10**5, repeat: int = 5) -> tuple:
+    """
+    Times a combined country, age and speed query on a RosterIndex against a linear scan of the roster.
+
+    Args:
+    n(int):The number of runners.
+    repeat(int):How many queries are timed, the best one is reported.
+    Returns:
+    tuple: Best query time with the index and with the scan in seconds.
+    """
+    from roster_index import RosterIndex
+    rng = random.Random(0)
+    runners = make_runners(n)
+    countries = ['Australia', 'Botswana', 'France', 'Iceland']
+    for runner in runners:
+        runner.age = rng.randint(5, 80)
+        runner.country = rng.choice(countries)
+    index = RosterIndex(runners)
+    def scan():
+        return [i for i, r in enumerate(runners) if r.country == 'Australia' and 18 <= r.age <= 25 and r.sprint_speed >= 6.5]
+    def query():
+        return index.query(country='Australia', age=(18, 25), sprint_speed=(6.5, None))
+    assert scan() == query()
+    slow = min(timeit.repeat(scan, number=1, repeat=repeat))
+    fast = min(timeit.repeat(query, number=1, repeat=repeat))
+    print(f"roster index, {n} runners: query {fast * 1000:.2f} ms, scan {slow * 1000:.2f} ms")
+    return fast, slow
+
+
+def bench_bracket(entrants: int = 10**5, repeat: int = 3) -> float:
+    """
+    Times a knockout bracket of 'entrants' runners.
+
+    Args:
+    entrants(int):The number of runners entered.
+    repeat(int):How many brackets are timed, the best one is reported.
+    Returns:
+    float: Best bracket time in seconds.
+    """
+    from bracket import KnockoutBracket
+    bracket = KnockoutBracket(make_runners(entrants), 0.4)
+    best = min(timeit.repeat(bracket.run, number=1, repeat=repeat))
+    print(f"knockout bracket, {entrants} entrants: {best * 1000:.1f} ms")
+    return best
+
+
+def bench_validation(n: int = 10**5, dirty: float = 0.5, repeat: int = 3) -> tuple:
+    """
+    Times validating runner rows, a part of them bad, in one batch against creating a Runner per row and catching its error.
+
+    Args:
+    n(int):The number of rows.
+    dirty(float):The part of the rows that are bad.
+    repeat(int):How many batches are timed, the best one is reported.
+    Returns:
+    tuple: Best batch time and best per row time in seconds.
+    """
+    from validation import validate_runner_rows
+    rng = random.Random(0)
+    countries = sorted(Runner.valid_countries())
+    rows = [(f"Runner {i}", rng.randint(5, 120), rng.choice(countries), rng.uniform(2.2, 6.8), rng.uniform(1.8, 5.4)) for i in range(n)]
+    for i in rng.sample(range(n), int(n * dirty)):
+        rows[i] = (rows[i][0], 200) + rows[i][2:]
+
+    def per_row():
+        for row in rows:
+            try:
+                Runner(*row)
+            except (CustomTypeError, CustomValueError):
+                pass
+
+    batch = min(timeit.repeat(lambda: validate_runner_rows(rows), number=1, repeat=repeat))
+    single = min(timeit.repeat(per_row, number=1, repeat=repeat))
+    print(f"{n} rows, {dirty:.0%} bad: {batch * 1000:.1f} ms in one batch, {single * 1000:.1f} ms row by row")
+    return batch, single
+
+
+def bench_amend(n: int = 1000, races: int = 200, repeat: int = 5) -> tuple:
+    """
+    Times correcting one result of a competition against scoring every race again with the corrected result.
+
+    Args:
+    n(int):The number of runners.
+    races(int):The number of races scored.
+    repeat(int):How many corrections are timed, the best one is reported.
+    Returns:
+    tuple: Best time of an amend and of a full rescore in seconds.
+    """
+    rng = random.Random(0)
+    runners = make_runners(n)
+    results = [[(runner, rng.uniform(60.0, 600.0)) for runner in runners] for _ in range(races)]
+    competition = Competition(runners, 1, [1.0], [4.0])
+    competition.keep_history = True
+    competition.update_leaderboards(results)
+    amend = min(timeit.repeat(lambda: competition.amend_result(races // 2, runners[0], rng.uniform(60.0, 600.0)), number=1, repeat=repeat))
+
+    def rescore():
+        fresh = Competition(runners, 1, [1.0], [4.0])
+        fresh.update_leaderboards(results)
+
+    full = min(timeit.repeat(rescore, number=1, repeat=repeat))
+    print(f"correcting one result of {races} races of {n} runners: {amend * 1000:.2f} ms, {full * 1000:.1f} ms rescoring everything")
+    return amend, full
+
+
+def bench_sweep(n: int = 10**4, size: int = 100, processes: int = None) -> float:
+    """
+    Times a size x size sweep of the short race time multiplier and the marathon energy per kilometre.
+
+    Args:
+    n(int):The number of runners.
+    size(int):The number of values of each swept parameter.
+    processes(int):The number of worker processes, by default the number of CPUs.
+    Returns:
+    float: The sweep time in seconds.
+    """
+    from schedule import Schedule
+    from sweep import sweep
+    runners = make_runners(n)
+    schedule = Schedule(3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5])
+    start = time.perf_counter()
+    table = sweep(runners, schedule, [1.0 + i / size for i in range(size)], [i * 400 // size for i in range(size)], [Runner.max_energy],
+                  processes=processes)
+    elapsed = time.perf_counter() - start
+    print(f"sweep of {len(table)} grid points over {n} runners: {elapsed:.2f} s")
+    return elapsed
+
+def bench_synthetic(n: int = 10**7) -> float:
+    """
+    Times generating a synthetic roster of n runners.
+
+    Args:
+    n(int):The number of runners.
+    Returns:
+    float: The generation time in seconds.
+    """
+    from synthetic import generate
+    start = time.perf_counter()
+    roster = generate(n, seed=1)
+    elapsed = time.perf_counter() - start
+    print(f"synthetic roster of {len(roster)} runners: {elapsed:.2f} s")
+    return elapsed
+
+
+if __name__ == '__main__':
+    bench_leaderboard()
+    bench_categories()
+    bench_snapshots()
+    bench_schedule()
+    bench_rounds()
+    bench_startup()
+    bench_replay()
+    bench_relay()
+    bench_recovery()
+    bench_timing()
+    bench_pipeline()
+    bench_roster_index()
+    bench_bracket()
+    bench_validation()
+    bench_amend()
+    bench_sweep()
+    bench_synthetic()
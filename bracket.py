@@ -0,0 +1,131 @@
+from __future__ import annotations
+import heapq
+from custom_errors import *
+from race import ShortRace
+from race_types import RACE_TYPES
+from runner import Runner
+
+class Stage:
+    """
+    The outcome of one stage of a knockout bracket.
+
+    Attributes:
+    name(str):The name of the stage ('heats', 'quarter-finals', 'semi-finals' or 'final').
+    heats(int):The number of heats run in the stage.
+    entrants(int):The number of runners that started the stage.
+    qualified(list[Runner]):The runners that advanced, fastest first (the finishing order for the final).
+    times(list[float]):The times of the qualified runners, in the same order.
+    """
+
+    def __init__(self, name: str, heats: int, entrants: int, qualified: list[Runner], times: list[float]) -> None:
+        self.name = name
+        self.heats = heats
+        self.entrants = entrants
+        self.qualified = qualified
+        self.times = times
+
+    def __str__(self):
+        return f"{self.name}: {self.entrants} runners in {self.heats} heat(s), {len(self.qualified)} through"
+
+
+class KnockoutBracket:
+    """
+    A knockout competition of short races: heats, then quarter-finals and semi-finals as needed, then a final.
+    From every heat the first 'advance_by_place' runners go through, plus the 'fastest_losers' fastest
+    runners of the whole stage that did not place. The entrants are seeded by sprint speed, fastest first,
+    and every stage deals its field out to the heats round robin, so the fastest runners meet in the late rounds.
+
+    Attributes:
+    entrants(list[Runner]):The runners entered in the bracket.
+    distance(float):The distance in kilometers of every race.
+    advance_by_place(int):The number of runners that advance from each heat by place.
+    fastest_losers(int):The number of further runners per stage that advance on time.
+    heat_size(int):The number of runners per heat, the maximum participants of a ShortRace.
+
+    Methods:
+    run:Runs the whole bracket and returns its stages.
+    """
+
+    def __init__(self, entrants: list[Runner], distance: float, advance_by_place: int = 2, fastest_losers: int = 2) -> None:
+        """
+        Initializes a KnockoutBracket.
+
+        Args:
+        entrants(list[Runner]):The runners entered in the bracket.
+        distance(float):The distance in kilometers of every race.
+        advance_by_place(int):The number of runners that advance from each heat by place.
+        fastest_losers(int):The number of further runners per stage that advance on time.
+
+        Raises:
+        CustomTypeError:Error is raised, if an argument has the wrong type.
+        CustomValueError:Error is raised, if an argument has an invalid value.
+        """
+        if not isinstance(entrants, list):
+            raise CustomTypeError(f"Incorrect input type for entrants, expected list got {type(entrants)} instead")
+        if not entrants:
+            raise CustomValueError("A bracket needs at least one entrant")
+        if not isinstance(distance, float):
+            raise CustomTypeError(f"Incorrect input type for distance, expected float got {type(distance)} instead")
+        if not isinstance(advance_by_place, int) or not isinstance(fastest_losers, int):
+            raise CustomTypeError("advance_by_place and fastest_losers must be integers")
+        self.heat_size = RACE_TYPES['short'].maximum_participants
+        if advance_by_place < 1 or fastest_losers < 0 or advance_by_place >= self.heat_size:
+            raise CustomValueError(f"advance_by_place must be between 1 and {self.heat_size - 1} and fastest_losers cannot be negative")
+        self.entrants = entrants
+        self.distance = distance
+        self.advance_by_place = advance_by_place
+        self.fastest_losers = fastest_losers
+
+    def _run_stage(self, field: list[Runner]) -> tuple:
+        """
+        Runs one stage and returns the number of heats and the advancing runners with their times, fastest first.
+        """
+        heats = -(-len(field) // self.heat_size)
+        qualified = []
+        losers = [] # max-heap of the fastest losers so far, as (-time, -seed, runner)
+        for heat in range(heats):
+            # the field is ordered fastest first (by seed, then by time), dealing it out round robin spreads the fast runners over the heats
+            heat_field = field[heat::heats]
+            seeds = {id(runner): seed for seed, runner in enumerate(heat_field)}
+            results = ShortRace(self.distance, heat_field).conduct_race()
+            results.sort(key=lambda x: x[1])
+            qualified.extend((time_taken, runner) for runner, time_taken in results[:self.advance_by_place])
+            for runner, time_taken in results[self.advance_by_place:]:
+                entry = (-time_taken, -seeds[id(runner)] * heats - heat, runner)
+                if len(losers) < self.fastest_losers:
+                    heapq.heappush(losers, entry)
+                elif losers and entry[:2] > losers[0][:2]:
+                    heapq.heapreplace(losers, entry)
+        qualified.extend((-negative, runner) for negative, _, runner in losers)
+        qualified.sort(key=lambda x: x[0])
+        return heats, [runner for _, runner in qualified], [time_taken for time_taken, _ in qualified]
+
+    def run(self) -> list[Stage]:
+        """
+        Runs the bracket until one final is left and runs the final.
+
+        Returns:
+        list[Stage]: The stages in order, the last one is the final whose qualified list is the finishing order.
+
+        Raises:
+        CustomValueError:Error is raised, if the advancement settings would not shrink the field.
+        """
+        rounds = []
+        # seed the opening stage by sprint speed, equal speeds keep their entry order; later stages are ordered by time
+        field = sorted(self.entrants, key=lambda runner: -runner.sprint_speed)
+        while len(field) > self.heat_size:
+            heats, qualified, times = self._run_stage(field)
+            if len(qualified) >= len(field):
+                raise CustomValueError("The advancement settings do not reduce the field, the bracket cannot finish")
+            rounds.append((heats, len(field), qualified, times))
+            field = qualified
+        final = sorted(ShortRace(self.distance, field).conduct_race(), key=lambda x: x[1])
+        rounds.append((1, len(field), [runner for runner, _ in final], [time_taken for _, time_taken in final]))
+
+        names = ['final', 'semi-finals', 'quarter-finals']
+        stages = []
+        for back, (heats, entrants, qualified, times) in enumerate(reversed(rounds)):
+            name = names[back] if back < len(names) else 'heats'
+            stages.append(Stage(name, heats, entrants, qualified, times))
+        stages.reverse()
+        return stages
@@ -1,6 +1,13 @@
-from race import *
+from __future__ import annotations
+import threading
+from array import array
+from collections import deque
+from custom_errors import *
+from race import ShortRace, MarathonRace
+from results import DNF, RaceResult, ScoredRace
 from runner import Runner
-from typing import List,Tuple,Dict,Union
+from schedule import Schedule
+from standings import RankedBoard, Standings, age_group
 
 class Competition:
 
@@ -8,28 +15,33 @@ class Competition:
     A class of a competition amongst runners.
 
     Attributes:
-        MAX_ROUNDS (int): The maximum number of rounds allowed in the competition.
+        MAX_ROUNDS (int): The default maximum number of rounds allowed in the competition, a competition can set its own with max_rounds.
+        result_cache (RaceResultCache): Optional cache the races are conducted through, shared by every competition it is set on.
+        recovery_policy (RecoveryPolicy): Optional policy that recovers the energy of the whole roster between rounds.
+        keep_history (bool): Keep every scored race in race_history, so results can be amended later.
 
     Methods:
         __init__: Initializes a Competition instance.
-        __get_ordinal: Helper method to get the ordinal suffix for a number.
+        from_schedule: Creates a competition from a validated Schedule.
         conduct_competition: Conducts the competition, for all the rounds.
         conduct_race:Conducts the race
         update_leaderboard: Updates the leaderboard with the race results.
+        update_leaderboards: Updates the leaderboard with the results of several races at once.
+        category_leaderboard: Returns the standings of one country or age group.
+        snapshot: Returns the latest immutable standings without locking.
+        amend_result: Corrects one result of a scored race and rescores only that race.
+        what_if: Returns the standings as they would be with one result changed.
+        submit_results: Queues race results from any thread and applies queued results in batches.
+        flush_results: Applies every queued result.
         print_leaderboard: Prints the leaderboard.
     """
 
     MAX_ROUNDS = 3 # Maximum number of rounds
+    result_cache = None # set to a race_cache.RaceResultCache to reuse results of repeated races
+    recovery_policy = None # set to a recovery.RecoveryPolicy to recover every runner between rounds
+    keep_history = False # set to True to keep the scored races, needed to amend results
 
-    def __get_ordinal(self, n:int) -> str:
-        suffixes = {1: 'st', 2: 'nd', 3: 'rd'}
-        if 11 <= n % 100 <= 13:
-            suffix = 'th'
-        else:
-            suffix = suffixes.get(n % 10, 'th')
-        return f"{n}{suffix}"
-
-    def __init__(self, runners: list, rounds: int, distances_short: list, distances_marathon: list)-> None:
+    def __init__(self, runners: list, rounds: int, distances_short: list, distances_marathon: list, max_rounds: int = None)-> None:
         """
         Initializes a Competition instance.
 
@@ -38,6 +50,7 @@ class Competition:
         rounds (int): Number of rounds of the competition.
         distances_short (list): List of distances for short races.
         distances_marathon (list): List of distances for marathon races.
+        max_rounds (int): The maximum number of rounds of this competition, by default MAX_ROUNDS.
         
         Raises:
         CustomAttributeError: If an attribute is not present.
@@ -50,128 +63,383 @@ class Competition:
             raise CustomAttributeError ("MAX_ROUNDS is not present in the class competition")
         #raise error if runners is not a list 
         if not isinstance(runners,list):
-            raise CustomTypeError ("Incorrect input type for runners, expected list got {type(runners)} instead")
+            raise CustomTypeError (f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        # The rounds and distances are validated by the schedule, in one pass
+        schedule = Schedule(rounds, distances_short, distances_marathon, self.__max_rounds(max_rounds))
+        self.__setup(runners, schedule)
+        # keep the lists the competition was created with
+        self.distances_short = distances_short
+        self.distances_marathon = distances_marathon
+
+    @classmethod
+    def from_schedule(cls, runners: list, schedule: Schedule, max_rounds: int = None)-> Competition:
+        """
+        Creates a competition that runs an already validated schedule, without validating the plan again.
+        One schedule can be shared by any number of competitions.
+
+        Args:
+        runners (list): List of runners present in the competition.
+        schedule (Schedule): The rounds and distances of the competition.
+        max_rounds (int): The maximum number of rounds of this competition, by default MAX_ROUNDS.
+
+        Returns: Competition: The new competition.
+
+        Raises:
+        CustomTypeError: If runners is not a list or schedule is not a Schedule.
+        CustomValueError: If the schedule has more rounds than the maximum.
+        """
+        if not isinstance(runners, list):
+            raise CustomTypeError(f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        if not isinstance(schedule, Schedule):
+            raise CustomTypeError(f"Incorrect input type for schedule, expected Schedule got {type(schedule)} instead")
+        competition = cls.__new__(cls)
+        if schedule.rounds > competition.__max_rounds(max_rounds):
+            raise CustomValueError("Incorrect input type for rounds,rounds cannot be more than max rounds")
+        competition.__setup(runners, schedule)
+        return competition
+
+    def __max_rounds(self, max_rounds: int)-> int:
+        # the competition's own limit, or the class default
+        if max_rounds is None:
+            return self.MAX_ROUNDS
+        if not isinstance(max_rounds, int):
+            raise CustomTypeError(f"Incorrect input type for max_rounds, expected int got {type(max_rounds)} instead")
+        if max_rounds <= 0:
+            raise CustomValueError("Incorrect input value for max_rounds, max_rounds must be a positive integer")
+        return max_rounds
+
+    def __setup(self, runners: list, schedule: Schedule)-> None:
         #setting attributes 
         self.runners = runners
         self.runners_count=len(self.runners)
-        self.rounds = rounds
-        self.distances_short = distances_short
-        self.distances_marathon = distances_marathon
+        self.schedule = schedule
+        self.rounds = schedule.rounds
+        self.distances_short = schedule.distances_short
+        self.distances_marathon = schedule.distances_marathon
         self.intial_leaderboard = {runner.name: 0 for runner in runners}
-        self.leaderboard={}
-        #raise error if distances_short is not presnet in class competition
-        if not hasattr (self,'distances_short'):
-            raise CustomAttributeError ("distances_short is not present in the class competition")
-        #raise error if rounds is not presnet in class competition
-        if not hasattr (self,'rounds'):
-            raise CustomAttributeError ("rounds is not present in the class the class competition")
-        #raise error if distances_marathon is not presnet in class competition
-        if not hasattr (self, 'distances_marathon'):
-            raise CustomAttributeError ("distances_marathon is not present in the class competition")
-        # Raise error if rounds is not a integer
-        if not isinstance(self.rounds,int):
-            raise CustomTypeError ("Incorrect input type for rounds, expected int got {type(rounds)} instead")
-        # Raise error if rounds is a negative integer
-        if self.rounds <=0:
-            raise CustomValueError("Incorrect input type for rounds,rounds is cannot be a negative integer")
-        # Raise error if rounds are greater then max.rounds
-        if self.rounds> self.MAX_ROUNDS:
-            raise CustomValueError ("Incorrect input type for rounds,rounds cannot be more than max rounds")
-        # Raise error if distances_short is not a list
-        if not isinstance(self.distances_short, list):
-            raise CustomTypeError("Incorrect input type for distances_short, expected list got {type(distances_short)} instead")
-        # Raise error if distances_marathon is not a list
-        if not isinstance(self.distances_marathon, list):
-            raise CustomTypeError("Incorrect input type for distances_marathon, expected list got {type(distances_marathon)} instead")
-        for i in range(len(self.distances_short)):
-            # Raise error if short_distance is not a float
-            if not isinstance(self.distances_short[i],float):
-                raise CustomTypeError ("Incorrect input type for short_distance, expected float got {type(distances_short[i])} instead")
-            # Raise error if distance_short is a negative integer
-            if self.distances_short[i] <0:
-                raise CustomValueError("Incorrect input value for distances_short, distances_short cannot be a negative integer")
-        for i in range(len(self.distances_marathon)):
-            # Raise error if distance_marathon is not a float
-            if not isinstance(self.distances_marathon[i],float):
-                raise CustomTypeError ("Incorrect input type for marathon_distance, expected float got {type(distances_marathon[i])} instead")
-            # Raise error if distance_marathon is a negative integer
-            if self.distances_marathon[i] <0:
-                raise CustomValueError("Incorrect input value for distances_marathon, distances_marathon cannot be a negative integer")
-        # Raise error if distance_shorts are not equal to the number of rounds
-        if len(self.distances_short) != self.rounds:
-            raise CustomValueError("the number of distances for short race are not equal to the number of rounds")
-         # Raise error if distance_marathons are not equal to the number of rounds
-        if len(self.distances_marathon) != self.rounds:
-            raise CustomValueError("the number of distances for marathon race are not equal to the number of rounds")
-
-    def conduct_competition(self)-> dict:
+        self.standings = Standings(0, (), array('q')) # replaced as a whole by every leaderboard update
+        self._leaderboard = (self.standings, {}) # the standings the leaderboard dict was last built from, and the dict
+        # overall standings, kept sorted as points are awarded instead of sorting every runner after each race
+        self._overall = RankedBoard()
+        for position, runner in enumerate(runners):
+            if runner.name not in self._overall:
+                self._overall.add(runner.name, position)
+        # standings per country and per age group, built on the first category query and kept sorted as points
+        # are awarded from then on, so competitions that never ask for them do not pay for them
+        self._categories = None
+        self._runner_boards = {} # runner name -> the category boards the runner is on
+        self.replay_log = None
+        self.timing_table = None # built from the runners and distances when the competition is first conducted
+        self._update_lock = threading.RLock() # guards the points and the leaderboard
+        self._pending = deque() # results submitted by other threads, waiting to be applied
+        self.race_history = [] # every scored race, in scoring order, when keep_history is set
+
+    def conduct_competition(self, log=None)-> dict:
         """
         Conducts the competition for all rounds.
 
+        Args:
+        log(ReplayWriter): Optional replay log that every race, result, energy change and points award is written to.
+
         Returns: dict: Leaderboard with final results.
         """
-        # Conducts the competition, loop is being runned for all rounds.
-        current_round = 1
-        while current_round <= self.rounds:
-            # Conduct short race for the current round
-            short_race = ShortRace(self.distances_short[current_round-1], runners = self.runners)
-            short_result = short_race.conduct_race()
-            
-            # Conduct marathon race for the current round
-            marathon_race = MarathonRace(self.distances_marathon[current_round-1], runners = self.runners)
-            marathon_result = marathon_race.conduct_race()
-            
-            # Here we recover energy for players who did not finish the race
-            for runner, time_taken in marathon_result :
-                if time_taken =='DNF':
-                    runner.recover_energy(1000) # calling recovery energy function
-
-             # Update leaderboard with results from both races
-            self.update_leaderboard(short_result)
-            self.update_leaderboard(marathon_result)
-            current_round = current_round + 1 # iterate to the next round
+        self.replay_log = log
+        if self.timing_table is None:
+            # every round reuses the same field and distances, so their times are computed once
+            # only distances run more than once are worth precomputing, which also keeps the table
+            # the same size however many rounds there are
+            from timing import TimingTable # imported on first use, like the other optional engines
+            self.timing_table = TimingTable(self.runners, self.schedule.repeated_distances())
+        races = {} # one race object per race class, reused every round with the round's distance
+        try:
+            # Conducts the competition, loop is being runned for all rounds.
+            for scheduled_short, scheduled_marathon in self.schedule.races:
+                current_round = scheduled_short.round
+                # Conduct short race for the current round and update leaderboard with its results
+                short_race = self.__race_for(races, scheduled_short)
+                if log is not None:
+                    log.race_start(current_round, short_race.race_type, short_race.distance)
+                short_result = self.conduct_race(short_race)
+                self.__log_results(short_result)
+                self.update_leaderboard(short_result)
+
+                # Conduct marathon race for the current round
+                marathon_race = self.__race_for(races, scheduled_marathon)
+                if log is not None:
+                    log.race_start(current_round, marathon_race.race_type, marathon_race.distance)
+                    energy_before = [runner.energy for runner in self.runners]
+                marathon_result = self.conduct_race(marathon_race)
+                self.__log_results(marathon_result)
+                if log is not None:
+                    for runner, energy in zip(self.runners, energy_before):
+                        if runner.energy != energy:
+                            log.drain(runner, energy - runner.energy)
+
+                # Here we recover energy for players who did not finish the race
+                for runner, time_taken in marathon_result :
+                    if time_taken == DNF:
+                        energy = runner.energy
+                        runner.recover_energy(1000) # calling recovery energy function
+                        if log is not None:
+                            log.recover(runner, runner.energy - energy)
+
+                self.update_leaderboard(marathon_result)
+
+                # Recover the whole roster before the next round, if a recovery policy is set
+                if self.recovery_policy is not None and current_round < self.rounds:
+                    if log is not None:
+                        energy_before = [runner.energy for runner in self.runners]
+                    from recovery import recover_roster # optional engine, imported when a policy is first used
+                    recover_roster(self.runners, self.recovery_policy)
+                    if log is not None:
+                        for runner, energy in zip(self.runners, energy_before):
+                            if runner.energy != energy:
+                                log.recover(runner, runner.energy - energy)
+        finally:
+            self.replay_log = None
         return self.leaderboard
 
-    def conduct_race(self,race: Union[ShortRace, MarathonRace]) -> List[Tuple[Runner, str]]:
+    def __race_for(self, races: dict, scheduled)-> ShortRace | MarathonRace:
+        # the race of a scheduled race's class, built on first use and then moved to the new distance
+        race = races.get(scheduled.race_class)
+        if race is None:
+            race = races[scheduled.race_class] = scheduled.build(self.runners)
+            race.timing_table = self.timing_table
+        else:
+            race.distance = scheduled.distance
+        return race
+
+    def __log_results(self, results: list)-> None:
+        # write every runner's result to the replay log, if one is being kept
+        if self.replay_log is not None:
+            for runner, time_taken in results:
+                self.replay_log.result(runner, time_taken)
+
+    def conduct_race(self,race: ShortRace | MarathonRace) -> list[RaceResult]:
         """
         Conducts a race.
         Args:
         race: The race object to be conducted can be either ShortRace or MarathonRace.
         Returns:The result of the race(tuple).
         """
+        if self.result_cache is not None:
+            return self.result_cache.conduct(race)
         return race.conduct_race()
 
-    def update_leaderboard(self, results:List[Tuple[Runner, str]])-> None:
+    def update_leaderboard(self, results:list[tuple[Runner, float]])-> None:
         """
         Updates the leaderboard according to the results of each round of race.
 
-        Args:results (list): List of tuples which has runner name and their time taken to finish the race.
-        """
-        # Updates the leaderboard based on race results.
-        # Sort the results based on time_taken by runners
-        sorted_result = sorted(results, key=lambda x: x[1] if isinstance(x[1], float) else float('inf'))
-        num_players = len(results)
-         
-        # Assign points based on position in the race
-        for i, runner_time_taken in enumerate(sorted_result):
-            runner, run_time = runner_time_taken
-            if run_time == 'DNF': # if time_taken is DNF then assign 0 to points
-                points = 0
-            else:
-                points = num_players - (i + 1) # else calculate the points according to their position
+        Args:results (list): The runners and their time taken to finish the race, DNF for runners that did not finish.
+        """
+        with self._update_lock:
+            self.__award_points(results)
+            self.__rebuild_leaderboard(len(results))
+
+    def update_leaderboards(self, races:list[list[tuple[Runner, float]]])-> None:
+        """
+        Updates the leaderboard with the results of several races, rebuilding the ordinal leaderboard once.
+
+        Args:races (list): The results of each race, in the form update_leaderboard takes them.
+        """
+        if not races:
+            return
+        with self._update_lock:
+            for results in races:
+                self.__award_points(results)
+            self.__rebuild_leaderboard(len(races[-1]))
+
+    def category_leaderboard(self, category: str, value: str, k: int = None)-> list[tuple[str, int]]:
+        """
+        Returns the standings of one category.
+
+        Args:
+        category (str): 'country' or 'age_group'.
+        value (str): The country, or the age group label from standings.AGE_GROUP_LABELS.
+        k (int): The number of runners to return, by default every runner in the category.
+
+        Returns: list: (runner name, points) pairs, best first.
+
+        Raises:
+        CustomKeyError: If the category is unknown or has no runners with that value.
+        """
+        with self._update_lock:
+            boards = self.categories.get(category)
+            if boards is None:
+                raise CustomKeyError(f"Unknown category {category}, expected one of {', '.join(self.categories)}")
+            board = boards.get(value)
+            if board is None:
+                raise CustomKeyError(f"No runners in {category} {value}")
+            return board.top(k)
+
+    @property
+    def categories(self)-> dict:
+        """
+        The category standings, 'country' and 'age_group' each mapping a value to its RankedBoard.
+        They are built from the current points when first read.
+        """
+        with self._update_lock:
+            if self._categories is None:
+                self.__build_categories()
+            return self._categories
+
+    def __build_categories(self)-> None:
+        # every runner joins its boards with 0 points in roster order, which only appends to the boards,
+        # then gets the points awarded so far, which the boards sort once on the first query
+        categories = {'country': {}, 'age_group': {}}
+        for position, runner in enumerate(self.runners):
+            if runner.name not in self._runner_boards:
+                boards = (categories['country'].setdefault(runner.country, RankedBoard()),
+                          categories['age_group'].setdefault(age_group(runner.age), RankedBoard()))
+                points = self.intial_leaderboard[runner.name]
+                for board in boards:
+                    board.add(runner.name, position)
+                    board.add_points(runner.name, points)
+                self._runner_boards[runner.name] = boards
+        self._categories = categories
+
+    def snapshot(self)-> Standings:
+        """
+        Returns the latest standings. Snapshots are immutable and replaced as a whole after every update,
+        so any thread can read one without locking while the competition runs.
+
+        Returns: Standings: The standings after the latest leaderboard update.
+        """
+        return self.standings
+
+    def amend_result(self, race: int, runner: Runner, time_taken: float)-> Standings:
+        """
+        Corrects the time of one runner in a race that has already been scored. Only that race is rescored and
+        the difference in points of the runners whose place changed is applied to the standings, so a correction
+        costs the size of the race's field whatever the number of races. Energies are not changed, no race is run again.
+
+        Args:
+        race (int): The number of the race in race_history, in scoring order. conduct_competition scores the short
+        race of round r as race 2 * (r - 1) and its marathon as race 2 * (r - 1) + 1.
+        runner (Runner): The runner whose time is corrected.
+        time_taken (float): The corrected time, results.DNF if the runner did not finish.
+
+        Returns: Standings: The standings after the correction.
+
+        Raises:
+        CustomValueError: If the competition does not keep its history, the race does not exist or the time is not positive.
+        CustomTypeError: If time_taken is not a float.
+        RunnerDoesntExistError: If the runner did not run the race.
+        """
+        with self._update_lock:
+            scored, index = self.__scored_result(race, runner, time_taken)
+            self.__add_points(scored.amend(index, time_taken))
+            self.__rebuild_leaderboard(self.standings.field)
+            return self.standings
+
+    def what_if(self, race: int, runner: Runner, time_taken: float)-> Standings:
+        """
+        Returns the standings as they would be if one result of a scored race had been different,
+        leaving the competition as it is. Takes the same arguments as amend_result.
+
+        Returns: Standings: The hypothetical standings, with the version of the current standings.
+        """
+        with self._update_lock:
+            scored, index = self.__scored_result(race, runner, time_taken)
+            original = scored.times[index]
+            self.__add_points(scored.amend(index, time_taken), log=False)
+            try:
+                names, points = self._overall.columns()
+                return Standings(self.standings.version, names, array('q', points), self.standings.field)
+            finally:
+                self.__add_points(scored.amend(index, original), log=False)
+
+    def __scored_result(self, race: int, runner: Runner, time_taken: float)-> tuple:
+        # the scored race and the position of the runner in it, after checking the correction
+        if not self.keep_history:
+            raise CustomValueError("Results can only be amended when the competition keeps its history, set keep_history")
+        if not isinstance(race, int) or not 0 <= race < len(self.race_history):
+            raise CustomValueError(f"Incorrect input value for race, expected a race number below {len(self.race_history)} got {race!r}")
+        if not isinstance(time_taken, float):
+            raise CustomTypeError(f"Incorrect input type for time_taken, expected float got {type(time_taken)} instead")
+        if not time_taken > 0:
+            raise CustomValueError("Incorrect input value for time_taken, time_taken must be positive")
+        scored = self.race_history[race]
+        index = scored.index_of(runner)
+        if index is None:
+            raise RunnerDoesntExistError(f"Runner {getattr(runner, 'name', runner)} did not run race {race}")
+        return scored, index
+
+    def submit_results(self, results:list[tuple[Runner, float]])-> None:
+        """
+        Submits race results from any thread.
+        Results are queued and whichever thread holds the update lock applies every queued race in one batch,
+        so producers never wait for each other's leaderboard rebuilds.
+
+        Args:results (list): List of tuples which has runner and their time taken to finish the race.
+        """
+        self._pending.append(results) # deque appends are atomic, no lock needed to queue
+        # keep applying while results are queued and no other thread is already applying them;
+        # the check after releasing the lock picks up results queued while this thread was applying
+        while self._pending and self._update_lock.acquire(blocking=False):
+            try:
+                self.__apply_pending()
+            finally:
+                self._update_lock.release()
+
+    def flush_results(self)-> None:
+        """
+        Waits for the update lock and applies every submitted result that is still queued.
+        """
+        with self._update_lock:
+            self.__apply_pending()
+
+    def __apply_pending(self)-> None:
+        # award points for every queued race, then rebuild the ordinal leaderboard once for the batch
+        num_players = None
+        while self._pending:
+            results = self._pending.popleft()
+            self.__award_points(results)
+            num_players = len(results)
+        if num_players is not None:
+            self.__rebuild_leaderboard(num_players)
+
+    def __award_points(self, results:list)-> None:
+        # Updates the leaderboard based on race results, the points of each position are worked out by ScoredRace
+        scored = ScoredRace.score(results)
+        if self.keep_history:
+            self.race_history.append(scored)
+        self.__add_points(zip(scored.runners, scored.points))
+
+    def __add_points(self, awards, log: bool = True)-> None:
+        # add (runner, points) awards to the overall and category standings, and to the replay log unless told not to
+        runner_boards = self._runner_boards if self._categories is not None else None
+        for runner, points in awards:
             # add points to the specific runners' points 
             self.intial_leaderboard[runner.name] = self.intial_leaderboard[runner.name]+points
-        # Sort the leaderboard based on total points
-        sorted_leaderboard = sorted(self.intial_leaderboard.items(), key=lambda x: x[1], reverse=True)
-        # Assign runners and their points positions according to their points in the original leaderboard
-        for i, (runner, points) in enumerate(sorted_leaderboard):
-            location = self.__get_ordinal(i + 1)
-            self.leaderboard[location] = (runner, points)
-   
-        # Set positions beyond the number of runners to None
-        for i in range(num_players,self.runners_count):
-            location = self.__get_ordinal(i + 1)
-            self.leaderboard[location] = None
+            if points:
+                self._overall.add_points(runner.name, points)
+                if runner_boards is not None:
+                    for board in runner_boards[runner.name]:
+                        board.add_points(runner.name, points)
+            if log and self.replay_log is not None:
+                self.replay_log.points(runner, points)
+
+    def __rebuild_leaderboard(self, num_players:int)-> None:
+        # The overall board is kept sorted as points are awarded, so the standings are read off it.
+        # They are published as a new immutable snapshot with one reference assignment, so threads
+        # reading the standings or the leaderboard see the old or the new ones, never half-built ones
+        names, points = self._overall.columns()
+        self.standings = Standings(self.standings.version + 1, names, array('q', points), num_players)
+
+    @property
+    def leaderboard(self)-> dict:
+        """
+        The leaderboard, ordinal position mapped to (runner name, points), with the positions past the
+        number of runners in the latest race set to None. It is built from the latest standings when it is
+        first read after an update, so competitions with many rounds do not build a dict per race.
+        """
+        standings = self.standings
+        built_from, leaderboard = self._leaderboard
+        if built_from is not standings:
+            leaderboard = standings.leaderboard(self.runners_count)
+            self._leaderboard = (standings, leaderboard)
+        return leaderboard
 
     def print_leaderboard(self)-> None:
         """
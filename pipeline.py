@@ -0,0 +1,267 @@
+from __future__ import annotations
+import asyncio
+import math
+import random
+from custom_errors import *
+from results import DNF, RaceResult
+
+_STOP = object() # sentinel that shuts a stage down
+
+class RacePipeline:
+    """
+    An asyncio pipeline that scores race results as they arrive.
+    Producers put (runner_id, race_id, time) events on a bounded queue, where runner_id is the index
+    of the runner in competition.runners and time is the time taken, results.DNF if the runner did not finish. The scorer stage collects
+    the events of each race, and once a race has one event per runner of the field it is scored together
+    with every other race completed in the same batch. After each scored batch the competition's immutable
+    standings snapshot is handed to the publisher stage, which passes it on to on_snapshot. The leaderboard dict
+    is not built here, a consumer that needs it calls Standings.leaderboard.
+
+    Both queues are bounded: a producer that outpaces the scorer waits in put(), and a publisher that falls
+    behind only keeps the newest snapshot. At most max_open races wait for their results at once, the oldest
+    one is dropped to make room for a new one, so memory stays bounded whatever the producers do.
+    If the scorer fails, the error is raised by the next put() and by close().
+
+    Attributes:
+    competition(Competition):The competition whose leaderboard is updated.
+    field_size(int):The number of results that complete a race.
+    batch_size(int):The largest number of events the scorer takes from the queue at once.
+    on_snapshot(callable):Called by the publisher with every (races scored, Standings) snapshot it publishes.
+    events(int):The number of events the scorer has taken.
+    max_open(int):The largest number of races waiting for results at once.
+    rejected(int):The number of events with an unknown runner, a runner already timed in that race or a time
+    that is neither a positive number nor DNF.
+    dropped(int):The number of unfinished races dropped to keep at most max_open races open.
+    races_scored(int):The number of races scored.
+    max_depth(int):The most events ever waiting in the event queue, at most queue_size.
+    latest(tuple):The newest published (races scored, Standings) snapshot, None before the first one.
+
+    Methods:
+    start:Starts the scorer and publisher stages.
+    put:Queues an event, waiting while the queue is full.
+    close:Scores every queued event, publishes the last snapshot and stops the stages.
+    """
+
+    def __init__(self, competition, field_size: int = None, queue_size: int = 1024, batch_size: int = 256, on_snapshot=None,
+                 max_open: int = 1024) -> None:
+        """
+        Initializes a RacePipeline, call start() from a running event loop (or use it as an async context manager).
+
+        Args:
+        competition(Competition):The competition whose leaderboard is updated.
+        field_size(int):The number of results that complete a race, by default the number of runners in the competition.
+        queue_size(int):The capacity of the event queue.
+        batch_size(int):The largest number of events the scorer takes from the queue at once.
+        on_snapshot(callable):Called with every published snapshot.
+        max_open(int):The largest number of races waiting for results at once.
+
+        Raises:
+        CustomTypeError:Error is raised, if a size is not an int or 'on_snapshot' is not callable.
+        CustomValueError:Error is raised, if a size is not positive or the field is larger than the competition.
+        """
+        if field_size is None:
+            field_size = competition.runners_count
+        sizes = (field_size, queue_size, batch_size, max_open)
+        if not all(isinstance(size, int) for size in sizes):
+            raise CustomTypeError("field_size, queue_size, batch_size and max_open must be integers")
+        if min(sizes) <= 0:
+            raise CustomValueError("field_size, queue_size, batch_size and max_open must be positive integers")
+        if field_size > competition.runners_count:
+            raise CustomValueError("field_size cannot be more than the number of runners in the competition")
+        if on_snapshot is not None and not callable(on_snapshot):
+            raise CustomTypeError("on_snapshot must be callable")
+        self.competition = competition
+        self.field_size = field_size
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.on_snapshot = on_snapshot
+        self.max_open = max_open
+        self.events = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.races_scored = 0
+        self.max_depth = 0
+        self.latest = None
+        self._open = {} # race_id -> {runner_id: time} of the races still waiting for results
+        self._events = None
+        self._snapshots = None
+        self._tasks = []
+        self._error = None # the exception that stopped the scorer
+
+    def start(self) -> RacePipeline:
+        """
+        Creates the queues and starts the scorer and publisher stages on the running event loop.
+        Returns:
+        RacePipeline: The pipeline itself.
+        """
+        self._events = asyncio.Queue(self.queue_size)
+        self._snapshots = asyncio.Queue(1)
+        self._tasks = [asyncio.create_task(self._score()), asyncio.create_task(self._publish())]
+        return self
+
+    async def put(self, runner_id: int, race_id, time_taken) -> None:
+        """
+        Queues one result event, waiting while the event queue is full.
+
+        Args:
+        runner_id(int):The index of the runner in competition.runners.
+        race_id:Any hashable id of the race.
+        time_taken(float):The time taken, DNF if the runner did not finish.
+        Raises:
+        Exception:The error that stopped the scorer, if it failed.
+        """
+        if self._error is None:
+            await self._events.put((runner_id, race_id, time_taken))
+        if self._error is not None:
+            raise self._error
+
+    async def close(self) -> None:
+        """
+        Waits for every queued event to be scored, publishes the last snapshot and stops both stages.
+        Races that never received all their results stay unscored.
+        Raises:
+        Exception:The error that stopped the scorer, if it failed.
+        """
+        await self._events.put(_STOP)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        if self._error is not None:
+            raise self._error
+
+    async def __aenter__(self) -> RacePipeline:
+        return self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _score(self) -> None:
+        # Scorer stage: wait for one event, then drain whatever else is queued up to batch_size
+        events = self._events
+        stopping = False
+        try:
+            while not stopping:
+                batch = [await events.get()]
+                if events.qsize() >= self.max_depth:
+                    self.max_depth = events.qsize() + 1
+                while len(batch) < self.batch_size and not events.empty():
+                    batch.append(events.get_nowait())
+                stopping = batch[-1] is _STOP
+                if stopping:
+                    batch.pop()
+                completed = self._collect(batch)
+                if completed:
+                    self.competition.update_leaderboards(completed)
+                    self.races_scored += len(completed)
+                    self._offer((self.races_scored, self.competition.snapshot()))
+        except Exception as error:
+            self._error = error
+            if not stopping:
+                # producers waiting in put() must still wake up and see the error. The events are taken by a task
+                # of their own, so the scorer's frame in the error's traceback is finished rather than suspended
+                self._tasks.append(asyncio.create_task(self._discard()))
+        finally:
+            # the stop signal waits its turn, so the last snapshot is still published
+            if not self._tasks[1].done():
+                await self._snapshots.put(_STOP)
+
+    async def _discard(self) -> None:
+        # take and drop every event until the stop signal, once the scorer has failed
+        while await self._events.get() is not _STOP:
+            pass
+
+    def _collect(self, batch: list) -> list:
+        # group the events by race and return the results of the races they complete
+        runners = self.competition.runners
+        count = len(runners)
+        completed = []
+        for runner_id, race_id, time_taken in batch:
+            self.events += 1
+            if not isinstance(runner_id, int) or not 0 <= runner_id < count or not _valid_time(time_taken):
+                self.rejected += 1
+                continue
+            race = self._open.get(race_id)
+            if race is None:
+                if len(self._open) >= self.max_open:
+                    # drop the race that has waited longest, it is unlikely to be completed
+                    del self._open[next(iter(self._open))]
+                    self.dropped += 1
+                race = self._open[race_id] = {}
+            elif runner_id in race:
+                self.rejected += 1
+                continue
+            race[runner_id] = time_taken
+            if len(race) == self.field_size:
+                del self._open[race_id]
+                completed.append([RaceResult(runners[i], t) for i, t in race.items()])
+        return completed
+
+    def _offer(self, snapshot) -> None:
+        # a slow publisher only ever has the newest snapshot waiting, older ones are dropped
+        if self._snapshots.full():
+            self._snapshots.get_nowait()
+        self._snapshots.put_nowait(snapshot)
+
+    async def _publish(self) -> None:
+        # Publisher stage: hand every snapshot on to on_snapshot
+        while True:
+            snapshot = await self._snapshots.get()
+            if snapshot is _STOP:
+                break
+            self.latest = snapshot
+            if self.on_snapshot is not None:
+                published = self.on_snapshot(snapshot)
+                if asyncio.iscoroutine(published):
+                    await published
+
+
+def _valid_time(time_taken) -> bool:
+    # a positive finite number of seconds, or DNF
+    return (isinstance(time_taken, (int, float)) and not isinstance(time_taken, bool)
+            and (time_taken == DNF or 0 < time_taken < math.inf))
+
+
+async def load_generator(pipeline: RacePipeline, races: int, seed: int = 0, dnf_rate: float = 0.0, race_ids=None) -> int:
+    """
+    Local producer for testing: puts the results of 'races' races with random times on the pipeline,
+    each race's results in random order.
+
+    Args:
+    pipeline(RacePipeline):The pipeline to feed.
+    races(int):The number of races.
+    seed(int):The random seed.
+    dnf_rate(float):The chance of each result being DNF.
+    race_ids(iterable):The ids of the races, by default 0 to races - 1.
+    Returns:
+    int: The number of events produced.
+    """
+    rng = random.Random(seed)
+    field = list(range(pipeline.field_size))
+    produced = 0
+    for race_id in (range(races) if race_ids is None else race_ids):
+        rng.shuffle(field)
+        for runner_id in field:
+            time_taken = DNF if rng.random() < dnf_rate else round(rng.uniform(60.0, 600.0), 2)
+            await pipeline.put(runner_id, race_id, time_taken)
+            produced += 1
+    return produced
+
+def run_load(competition, races: int, producers: int = 4, seed: int = 0, **options) -> RacePipeline:
+    """
+    Runs a pipeline over a competition fed by several load generators and waits until everything is scored.
+
+    Args:
+    competition(Competition):The competition whose leaderboard is updated.
+    races(int):The number of races each producer generates.
+    producers(int):The number of concurrent producers.
+    seed(int):The random seed of the first producer, the others use the following seeds.
+    options:Further RacePipeline arguments.
+    Returns:
+    RacePipeline: The closed pipeline, with its counters and latest snapshot.
+    """
+    async def main():
+        async with RacePipeline(competition, **options) as pipeline:
+            # every producer has its own race ids so races are never mixed up between producers
+            await asyncio.gather(*(load_generator(pipeline, races, seed + p, race_ids=[(p, r) for r in range(races)])
+                                   for p in range(producers)))
+        return pipeline
+    return asyncio.run(main())
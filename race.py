@@ -1,22 +1,27 @@
+from __future__ import annotations
 from custom_errors import *
 from abc import ABC, abstractmethod
 from runner import Runner
-import math
-from typing import List,Tuple,Dict,Union
+from race_types import RACE_TYPES
+from results import RaceResult
 
 class Race(ABC):
     """
     Abstract base class representing a race.
     Attributes:
     distance(float):The distance in kilometers of the race.
-    runners(List[Runner]):The list of runners present in the race.
+    runners(List[Runner]):The list of runners present in the race, changed through add_runner and remove_runner.
+    timing_table(TimingTable):Optional precomputed times the race looks its runners' times up in, None by default.
 
     Methods:
     add_runner:Adds a runner to the race.
     remove_runner:Removes a runner from the race.
+    apply_race_type:Sets the race's settings and timing kernel from the race type registry.
     conduct_race():Abstract method to conduct the race.
     """
-    def __init__(self, distance, runners: List[Runner] = None)-> None:
+    timing_table = None # set to a timing.TimingTable to look times up instead of computing them
+
+    def __init__(self, distance, runners: list[Runner] = None)-> None:
         """
         Initializes a Race object.
         Args:
@@ -42,13 +47,32 @@ class Race(ABC):
                     raise CustomAttributeError("runner is not an object of Runner class") # if it is not an instance of runner class raise attribute error
         # Raise error if distance is not a float
         if not isinstance(distance,float):
-            raise CustomTypeError ("Incorrect input type for distance, expected float got {type(distance)} instead")
+            raise CustomTypeError (f"Incorrect input type for distance, expected float got {type(distance)} instead")
         # Raise error if distance is negative
         elif distance <=0:
             raise CustomValueError("Incorrect input value for distance, distance must be a positive integer")
         # Set the distance 
         else:
             self.distance = distance
+
+    @property
+    def runners(self) -> list[Runner]:
+        """
+        The list of runners present in the race.
+        """
+        return self._runners
+
+    @runners.setter
+    def runners(self, runners: list[Runner]) -> None:
+        self._runners = runners
+        self._runner_set = set(runners) # the runners as a set, so add_runner does not scan the list
+        self._runner_count = len(runners) # the length of the list when the set was last brought up to date
+
+    def _members(self) -> set:
+        # the set of runners, rebuilt if the list was appended to or removed from directly
+        if len(self._runners) != self._runner_count:
+            self.runners = self._runners
+        return self._runner_set
     
     def add_runner(self, runner: Runner) -> None:
         """
@@ -64,10 +88,12 @@ class Race(ABC):
         if not hasattr(self, 'runners'):
             raise CustomAttributeError("Attribute 'runners' not found in Class Race.")
         # Raise error if runner is already in the race
-        if runner in self.runners:
-            raise RunnerAlreadyExistsError("Runner {runner.name} already exists so cannot add again")
+        if runner in self._members():
+            raise RunnerAlreadyExistsError(f"Runner {runner.name} already exists so cannot add again")
         else:
             self.runners.append(runner)  # Add runner to the race
+            self._runner_set.add(runner)
+            self._runner_count += 1
         # Raise error if the race is full
         if len(self.runners)>self.maximum_participants:
             raise RaceIsFullError ("The limit of maximum participants has been reached so cannot add more runners")
@@ -86,18 +112,39 @@ class Race(ABC):
         if not hasattr(self, 'runners'):
             raise CustomAttributeError("Attribute 'runners' not found.")
         # Raise error if runner is not in the race
-        if runner not in self.runners:
-            raise RunnerDoesntExistError ("Runner {runner.name} doesn't exist so cannot remove ")
+        if runner not in self._members():
+            raise RunnerDoesntExistError (f"Runner {runner.name} doesn't exist so cannot remove ")
         else:
             self.runners.remove(runner) # Remove runner from the race
+            self._runner_count -= 1
+            if runner not in self.runners: # the list given to __init__ may hold a runner twice
+                self._runner_set.discard(runner)
     
+    def apply_race_type(self, race_type: str) -> None:
+        """
+        Sets race_type, maximum_participants, time_multiplier, energy_per_km and the timing kernel
+        from the registered race type.
+        Args:
+        race_type(str):The name of a race type registered in race_types.RACE_TYPES.
+        Raises:
+        CustomValueError:This error is raised if the race type is not registered.
+        """
+        spec = RACE_TYPES.get(race_type)
+        if spec is None:
+            raise CustomValueError(f"Incorrect input value for race_type, race_type must be one of {', '.join(RACE_TYPES)}")
+        self.race_type = spec.name
+        self.maximum_participants = spec.maximum_participants
+        self.time_multiplier = spec.time_multiplier
+        self.energy_per_km = spec.energy_per_km
+        self.kernel = spec.kernel
+
     @abstractmethod
-    def conduct_race(self) -> List[Tuple[Runner, Union[str, float]]]:
+    def conduct_race(self) -> list[RaceResult]:
         """
         Conducts the race and returns the results.
         Returns:
-        List[Tuple[Runner, Union[str, float]]]:
-        A list of tuples containing the runner and their time taken to finish the race.
+        list[RaceResult]:
+        The runner and their time taken to finish the race, results.DNF if they did not finish.
         """
         pass
 
@@ -118,7 +165,7 @@ class ShortRace(Race):
     CustomTypeError:This error is raised, if 'maximum_participants' is not an int, or if 'race_type' is not str or 'time_multiplier' is not float.
     """
     
-    def __init__(self, distance, runners: List[Runner] = None)-> None:
+    def __init__(self, distance, runners: list[Runner] = None)-> None:
         """
         Initializes a ShortRace object.
         Args:
@@ -128,9 +175,7 @@ class ShortRace(Race):
         super().__init__(distance, runners) # inheriting parent class init method 
 
         # Set specific attributes for ShortRace
-        self.race_type = "short"
-        self.maximum_participants = 8
-        self.time_multiplier = 1.2
+        self.apply_race_type("short")
         
         # Raise error if 'race_type' attribute is not present 
         if not hasattr(self, 'race_type'):
@@ -143,23 +188,19 @@ class ShortRace(Race):
             raise CustomAttributeError("Attribute 'time_multiplier' not found in ShortRace .")
         # Raise error if maximum_participants's data type is not an int
         if not isinstance(self.maximum_participants,int):
-            raise CustomTypeError ("Incorrect input type for maximum_participants, expected int got {type(maximum_participants)} instead")
+            raise CustomTypeError (f"Incorrect input type for maximum_participants, expected int got {type(self.maximum_participants)} instead")
         # Raise error if race_type's data type is not a str
         if not isinstance(self.race_type,str):
-            raise CustomTypeError ("Incorrect input type for race_type, expected str got {type(race_type)} instead")
+            raise CustomTypeError (f"Incorrect input type for race_type, expected str got {type(self.race_type)} instead")
         
-    def conduct_race(self)-> List[Tuple[Runner, Union[str, float]]]:
+    def conduct_race(self)-> list[RaceResult]:
 
         """
         Conducts the short race and returns the results.
-        Returns:List[Tuple[Runner, Union[str, float]]]:A list of tuples containing the runner's name and their time taken to finish the race.
+        Returns:list[RaceResult]:The runner and their time taken to finish the race.
         """
-        result = []
         # Calculate time taken by each runner and apply time multiplier
-        for i, runner in enumerate(self.runners):
-            time_taken = runner.run_race(self.race_type, self.distance) * self.time_multiplier
-            result.append((runner, time_taken)) # append the runner and the time taken in result list as tuple
-        return result
+        return self.kernel(self)
 
 class MarathonRace(Race):
 
@@ -174,7 +215,7 @@ class MarathonRace(Race):
     conduct_race():Conducts the marathon race and returns the results.
     """
     
-    def __init__(self, distance: float, runners: List[Runner] = None)-> None:
+    def __init__(self, distance: float, runners: list[Runner] = None)-> None:
         """
         Initializes a MarathonRace object.
 
@@ -188,9 +229,7 @@ class MarathonRace(Race):
         """
         super().__init__(distance, runners) # inheriting parent class init method 
         # Set specific attributes for MarathonRace
-        self.race_type = "long"
-        self.energy_per_km = 100
-        self.maximum_participants = 16
+        self.apply_race_type("long")
          
         # Raise error if 'race_type' attribute is not present 
         if not hasattr(self, 'race_type'):
@@ -203,29 +242,71 @@ class MarathonRace(Race):
             raise CustomAttributeError("Attribute 'energy_per_km' not found in class MarathonRace.")
         # Raise error if maximum_participants's data type is not an int
         if not isinstance(self.maximum_participants,int):
-            raise CustomTypeError ("Incorrect input type for maximum_participants, expected int got {type(maximum_participants)} instead")   
+            raise CustomTypeError (f"Incorrect input type for maximum_participants, expected int got {type(self.maximum_participants)} instead")   
         # Raise error if race_type's data type is not a str
         if not isinstance(self.race_type,str):
-            raise CustomTypeError ("Incorrect input type for race_type, expected str got {type(race_type)} instead")
+            raise CustomTypeError (f"Incorrect input type for race_type, expected str got {type(self.race_type)} instead")
         # Raise error if energy_per_km's is not an int
         if not isinstance(self.energy_per_km,int):
-            raise CustomTypeError ("Incorrect input type for energy_per_km, expected str got {type(energy_per_km)} instead")
+            raise CustomTypeError (f"Incorrect input type for energy_per_km, expected str got {type(self.energy_per_km)} instead")
     
-    def conduct_race(self)-> List[Tuple[Runner, Union[str, float]]]:
-        result = []
-       
-        for i, runner in enumerate(self.runners): # Iterate through each runner
-             time_taken = 0
-             for km in range(math.ceil(self.distance)): # Iterate through each kilometer
-                    if runner.energy > 0:
-                        time_taken += runner.run_race("long", self.distance) # Calculate time taken by the runner and drain energy per km
-                        runner.drain_energy(self.energy_per_km)
-                    else:
-                        time_taken = 'DNF'  # Assign 'DNF' if runner has no energy left anymore
-                        break
-             result.append((runner, time_taken)) # Append result for each runner
-        return result
-        
+    def conduct_race(self)-> list[RaceResult]:
+        """
+        Conducts the marathon race kilometre by kilometre, draining energy, and returns the results.
+        Returns:list[RaceResult]:The runner and their time taken, DNF if they ran out of energy.
+        """
+        return self.kernel(self)
+
+class MiddleDistanceRace(Race):
+    """
+    Class representing a middle-distance race, run at the average of sprint and endurance speed with a moderate energy cost.
+
+    Methods:
+    conduct_race():Conducts the middle-distance race and returns the results.
+    """
+
+    def __init__(self, distance: float, runners: list[Runner] = None)-> None:
+        """
+        Initializes a MiddleDistanceRace object.
+        Args:
+        distance(float):The distance in kilometers of the race.
+        runners(List[Runner] = None):The list of runners present in the race, by default None
+        """
+        super().__init__(distance, runners)
+        self.apply_race_type("middle")
+
+    def conduct_race(self)-> list[RaceResult]:
+        """
+        Conducts the middle-distance race and returns the results.
+        Returns:list[RaceResult]:The runner and their time taken, DNF if they ran out of energy.
+        """
+        return self.kernel(self)
+
+class TrailRace(Race):
+    """
+    Class representing a trail race, run at endurance speed with a higher time multiplier and energy cost than a marathon.
+
+    Methods:
+    conduct_race():Conducts the trail race and returns the results.
+    """
+
+    def __init__(self, distance: float, runners: list[Runner] = None)-> None:
+        """
+        Initializes a TrailRace object.
+        Args:
+        distance(float):The distance in kilometers of the race.
+        runners(List[Runner] = None):The list of runners present in the race, by default None
+        """
+        super().__init__(distance, runners)
+        self.apply_race_type("trail")
+
+    def conduct_race(self)-> list[RaceResult]:
+        """
+        Conducts the trail race and returns the results.
+        Returns:list[RaceResult]:The runner and their time taken, DNF if they ran out of energy.
+        """
+        return self.kernel(self)
+
 if __name__ == '__main__':
     short_race = ShortRace(5.0)
     long_race = MarathonRace(5.0)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import sys
+from collections import OrderedDict
+from custom_errors import *
+from results import unpack_results
+from runner import ALL_ENERGY_LOCKS
+
+class RaceResultCache:
+    """
+    A bounded LRU cache of race results.
+
+    A race's result only depends on the race class and settings, the distance and the
+    speeds and starting energy of its field, so a repeated scenario can reuse the times
+    (and the energies the runners finished with) instead of running the race again.
+
+    Attributes:
+    max_bytes(int):The memory budget of the cached entries, least recently used entries are evicted beyond it.
+    current_bytes(int):The estimated memory used by the cached entries.
+    hits(int):The number of races answered from the cache.
+    misses(int):The number of races that had to be conducted.
+    evictions(int):The number of entries evicted to stay within the budget.
+
+    Methods:
+    key:Builds the cache key of a race.
+    conduct:Conducts a race through the cache.
+    stats:Returns the hit/miss statistics.
+    clear:Empties the cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+        max_bytes(int):The memory budget in bytes, by default 64 MiB.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'max_bytes' is not an int.
+        CustomValueError:Error is raised, if 'max_bytes' is not positive.
+        """
+        if not isinstance(max_bytes, int):
+            raise CustomTypeError(f"Incorrect input type for max_bytes, expected int got {type(max_bytes)} instead")
+        if max_bytes <= 0:
+            raise CustomValueError("Incorrect input value for max_bytes, max_bytes must be a positive integer")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict() # key -> (times, energies, size), oldest first
+
+    @staticmethod
+    def key(race) -> tuple:
+        """
+        Builds the cache key of a race from its settings and the fingerprint of its field.
+
+        Args:
+        race(Race):The race to build the key for.
+        Returns:
+        tuple: The cache key.
+        """
+        fingerprint = tuple((runner.sprint_speed, runner.endurance_speed, runner.energy) for runner in race.runners)
+        return (type(race), race.race_type, race.distance,
+                getattr(race, 'time_multiplier', None), getattr(race, 'energy_per_km', None), fingerprint)
+
+    def conduct(self, race) -> list[tuple]:
+        """
+        Conducts a race, reusing the cached result if the same scenario was run before.
+
+        Args:
+        race(Race):The race to conduct.
+        Returns:
+        list: The race results, the same as race.conduct_race() would return.
+        """
+        key = self.key(race)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            times, energies, _ = entry
+            # leave the runners with the energy they would have finished the race with
+            with ALL_ENERGY_LOCKS:
+                for runner, energy in zip(race.runners, energies):
+                    runner.energy = energy
+            return unpack_results(race.runners, times)
+
+        self.misses += 1
+        results = race.conduct_race()
+        times = tuple(time_taken for _, time_taken in results)
+        energies = tuple(runner.energy for runner in race.runners)
+        # only races that report their whole field in order can be replayed from the cache
+        if len(results) == len(race.runners) and all(r is runner for (r, _), runner in zip(results, race.runners)):
+            self._store(key, times, energies)
+        return results
+
+    def _store(self, key: tuple, times: tuple, energies: tuple) -> None:
+        """
+        Stores an entry and evicts the least recently used ones beyond the memory budget.
+        """
+        size = (sys.getsizeof(key) + sys.getsizeof(key[-1]) + sum(sys.getsizeof(f) for f in key[-1])
+                + sys.getsizeof(times) + sys.getsizeof(energies))
+        if size > self.max_bytes:
+            return # an entry larger than the whole budget is not worth keeping
+        self._entries[key] = (times, energies, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the cache statistics.
+        Returns:
+        dict: hits, misses, evictions, number of entries and estimated bytes in use.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._entries), 'bytes': self.current_bytes}
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets the statistics.
+        """
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import math
+from operator import attrgetter
+from custom_errors import *
+from results import DNF, RaceResult, unpack_results
+
+def base_times(race) -> list[float]:
+    """
+    Returns every runner's Runner.run_race time for the race, looked up in race.timing_table when one is set.
+
+    Args:
+    race(Race):The race to time.
+    Returns:
+    list[float]: The time of every runner in race.runners, before the race's time multiplier.
+    """
+    if race.timing_table is not None:
+        return race.timing_table.race_times(race.race_type, race.distance, race.runners)
+    race_type, distance = race.race_type, race.distance
+    return [runner.run_race(race_type, distance) for runner in race.runners]
+
+def timed_kernel(race) -> list[RaceResult]:
+    """
+    Timing kernel of races run in one go: every runner's time is multiplied by the race's time multiplier.
+
+    Args:
+    race(Race):The race to conduct.
+    Returns:
+    list[RaceResult]: The runner and their time taken to finish the race.
+    """
+    multiplier = race.time_multiplier
+    return unpack_results(race.runners, [time_taken * multiplier for time_taken in base_times(race)])
+
+def energy_kernel(race) -> list[RaceResult]:
+    """
+    Timing kernel of races run kilometre by kilometre: every kilometre costs energy_per_km and
+    a runner that has no energy left at the start of a kilometre does not finish, their time is DNF.
+
+    Args:
+    race(Race):The race to conduct.
+    Returns:
+    list[RaceResult]: The runner and their time taken to finish the race.
+    """
+    times = []
+    kilometres = math.ceil(race.distance)
+    # the time of a kilometre only depends on the runner and the race, so it is computed once
+    for runner, base_time in zip(race.runners, base_times(race)): # Iterate through each runner
+        time_taken = 0.0
+        lap_time = base_time * race.time_multiplier
+        for km in range(kilometres): # Iterate through each kilometer
+            if runner.energy > 0:
+                time_taken += lap_time
+                runner.drain_energy(race.energy_per_km)
+            else:
+                time_taken = DNF  # Assign DNF if runner has no energy left anymore
+                break
+        times.append(time_taken) # Append result for each runner
+    return unpack_results(race.runners, times)
+
+def relay_kernel(race) -> list[RaceResult]:
+    """
+    Timing kernel of relay races: each team member runs one leg of race.distance / number of legs.
+    Legs are computed in batches, leg k of every team still running at once. A runner must have energy
+    at the start of every kilometre of their leg (the same rule as energy_kernel), otherwise the team
+    does not finish and their time is DNF.
+
+    Args:
+    race(RelayRace):The race to conduct, with its teams in race.teams.
+    Returns:
+    list[RaceResult]: The team and their total time taken to finish the race.
+    """
+    spec = RACE_TYPES[race.race_type]
+    speed, multiplier, energy_per_km = spec.speed, race.time_multiplier, race.energy_per_km
+    members = [team.runners for team in race.teams]
+    leg_distance = [race.distance / len(runners) for runners in members]
+    leg_km = [math.ceil(d) for d in leg_distance]
+    totals = [0.0] * len(members)
+    running = list(range(len(members))) # indexes of the teams that have not dropped out
+    legs = max(map(len, members), default=0)
+    from runner import ALL_ENERGY_LOCKS # runner imports this module, so it is imported here
+    with ALL_ENERGY_LOCKS: # the energies are checked and drained here rather than by Runner.drain_energy
+        for leg in range(legs):
+            batch = [i for i in running if leg < len(members[i])]
+            runners = [members[i][leg] for i in batch]
+            # time of the leg, rounded to the hundredth of a second like Runner.run_race
+            times = [round(leg_distance[i] * 1000 / speed(r), 2) * multiplier for i, r in zip(batch, runners)]
+            dropped = False
+            for i, runner, time_taken in zip(batch, runners, times):
+                km = leg_km[i]
+                energy = runner.energy
+                # the runner needs energy left at the start of the last kilometre of the leg
+                if energy - (km - 1) * energy_per_km > 0:
+                    totals[i] += time_taken
+                    energy -= km * energy_per_km
+                    runner.energy = energy if energy > 0 else 0
+                else:
+                    runner.energy = 0
+                    totals[i] = DNF
+                    dropped = True
+            if dropped:
+                running = [i for i in running if totals[i] != DNF]
+    return unpack_results(race.teams, totals)
+
+def mixed_speed(runner) -> float:
+    """
+    Speed selector for middle distances, the average of the runner's sprint and endurance speeds.
+    """
+    return (runner.sprint_speed + runner.endurance_speed) / 2
+
+class RaceType:
+    """
+    The settings and timing kernel of one type of race.
+
+    Attributes:
+    name(str):The name of the race type, as passed to Runner.run_race.
+    speed(callable):Returns the speed of a runner in this type of race.
+    time_multiplier(float):The multiplier applied to the runners' times.
+    energy_per_km(int):The energy drained per kilometer, 0 if the race does not drain energy.
+    maximum_participants(int):The maximum number of participants allowed in the race.
+    kernel(callable):Conducts a race of this type and returns its results.
+    code(int):The number of the race type in registration order.
+    """
+
+    def __init__(self, name: str, speed, time_multiplier: float, energy_per_km: int, maximum_participants: int, kernel) -> None:
+        """
+        Initializes a RaceType.
+
+        Args:
+        name(str):The name of the race type.
+        speed(callable):Returns the speed of a runner in this type of race.
+        time_multiplier(float):The multiplier applied to the runners' times.
+        energy_per_km(int):The energy drained per kilometer.
+        maximum_participants(int):The maximum number of participants allowed in the race.
+        kernel(callable):Conducts a race of this type and returns its results.
+
+        Raises:
+        CustomTypeError:Error is raised, if a setting has the wrong type.
+        CustomValueError:Error is raised, if a setting has an invalid value.
+        """
+        if not isinstance(name, str) or not name:
+            raise CustomTypeError(f"Incorrect input type for name, expected a non-empty str got {type(name)} instead")
+        if not callable(speed) or not callable(kernel):
+            raise CustomTypeError("speed and kernel must be callable")
+        if not isinstance(time_multiplier, float):
+            raise CustomTypeError(f"Incorrect input type for time_multiplier, expected float got {type(time_multiplier)} instead")
+        if not isinstance(energy_per_km, int):
+            raise CustomTypeError(f"Incorrect input type for energy_per_km, expected int got {type(energy_per_km)} instead")
+        if not isinstance(maximum_participants, int):
+            raise CustomTypeError(f"Incorrect input type for maximum_participants, expected int got {type(maximum_participants)} instead")
+        if time_multiplier <= 0 or energy_per_km < 0 or maximum_participants <= 0:
+            raise CustomValueError(f"Incorrect settings for race type {name}, they cannot be negative")
+        self.name = name
+        self.speed = speed
+        self.time_multiplier = time_multiplier
+        self.energy_per_km = energy_per_km
+        self.maximum_participants = maximum_participants
+        self.kernel = kernel
+        self.code = None
+
+
+RACE_TYPES = {} # race type name -> RaceType
+
+def register_race_type(race_type: RaceType) -> RaceType:
+    """
+    Adds a race type to the registry.
+
+    Args:
+    race_type(RaceType):The race type to add.
+    Returns:
+    RaceType: The registered race type.
+    Raises:
+    CustomTypeError:Error is raised, if 'race_type' is not a RaceType.
+    CustomValueError:Error is raised, if a race type with the same name is already registered.
+    """
+    if not isinstance(race_type, RaceType):
+        raise CustomTypeError(f"Incorrect input type for race_type, expected RaceType got {type(race_type)} instead")
+    if race_type.name in RACE_TYPES:
+        raise CustomValueError(f"Race type {race_type.name} is already registered")
+    race_type.code = len(RACE_TYPES)
+    RACE_TYPES[race_type.name] = race_type
+    return race_type
+
+register_race_type(RaceType('short', attrgetter('sprint_speed'), 1.2, 0, 8, timed_kernel))
+register_race_type(RaceType('long', attrgetter('endurance_speed'), 1.0, 100, 16, energy_kernel))
+register_race_type(RaceType('middle', mixed_speed, 1.1, 50, 12, energy_kernel))
+register_race_type(RaceType('trail', attrgetter('endurance_speed'), 1.3, 150, 16, energy_kernel))
+register_race_type(RaceType('relay', attrgetter('sprint_speed'), 1.0, 100, 100000, relay_kernel))
@@ -0,0 +1,179 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from array import array
+from custom_errors import *
+from runner import ALL_ENERGY_LOCKS
+
+class RecoveryPolicy(ABC):
+    """
+    Base class of the energy recovery policies applied to a whole roster between rounds.
+    A policy works on plain sequences of energies and ages, so a roster is recovered in one pass
+    instead of one validated Runner.recover_energy call per runner.
+
+    Methods:
+    apply:Returns the energies after recovery.
+    """
+
+    @abstractmethod
+    def apply(self, energies: list, ages: list, max_energy: int) -> list:
+        """
+        Returns the energies after recovery, capped at max_energy.
+
+        Args:
+        energies(list):The current energy of every runner.
+        ages(list):The age of every runner, in the same order.
+        max_energy(int):The maximum energy of a runner.
+        Returns:
+        list: The recovered energies.
+        """
+        pass
+
+
+class FixedRecovery(RecoveryPolicy):
+    """
+    Every runner recovers the same amount of energy.
+
+    Attributes:
+    amount(int):The energy recovered by every runner.
+    """
+
+    def __init__(self, amount: int) -> None:
+        """
+        Args:
+        amount(int):The energy recovered by every runner.
+        Raises:
+        CustomTypeError:Error is raised, if 'amount' is not an int.
+        CustomValueError:Error is raised, if 'amount' is negative.
+        """
+        if not isinstance(amount, int):
+            raise CustomTypeError(f"Incorrect input type for amount, expected int got {type(amount)} instead")
+        if amount < 0:
+            raise CustomValueError("Incorrect input value for amount, amount must be a positive integer")
+        self.amount = amount
+
+    def apply(self, energies: list, ages: list, max_energy: int) -> list:
+        amount = self.amount
+        return [e + amount if e + amount < max_energy else max_energy for e in energies]
+
+
+class ProportionalRecovery(RecoveryPolicy):
+    """
+    Every runner recovers a fraction of the energy they are missing.
+
+    Attributes:
+    fraction(float):The fraction of the missing energy that is recovered, between 0 and 1.
+    """
+
+    def __init__(self, fraction: float) -> None:
+        """
+        Args:
+        fraction(float):The fraction of the missing energy that is recovered, between 0 and 1.
+        Raises:
+        CustomTypeError:Error is raised, if 'fraction' is not a float.
+        CustomValueError:Error is raised, if 'fraction' is not between 0 and 1.
+        """
+        if not isinstance(fraction, float):
+            raise CustomTypeError(f"Incorrect input type for fraction, expected float got {type(fraction)} instead")
+        if fraction < 0 or fraction > 1:
+            raise CustomValueError("Incorrect input value for fraction, fraction must be between 0 and 1")
+        self.fraction = fraction
+
+    def apply(self, energies: list, ages: list, max_energy: int) -> list:
+        fraction = self.fraction
+        # energies stay whole numbers, like the ones Runner.recover_energy produces
+        return [e + int((max_energy - e) * fraction) for e in energies]
+
+
+class AgeBasedRecovery(RecoveryPolicy):
+    """
+    Runners recover a base amount that shrinks the further their age is from the peak age.
+
+    Attributes:
+    base(int):The energy recovered at the peak age.
+    peak_age(int):The age that recovers fastest.
+    decline_per_year(float):The fraction of the base amount lost per year away from the peak age.
+    minimum_fraction(float):The smallest fraction of the base amount any runner recovers.
+    """
+
+    def __init__(self, base: int, peak_age: int = 25, decline_per_year: float = 0.01, minimum_fraction: float = 0.25) -> None:
+        """
+        Args:
+        base(int):The energy recovered at the peak age.
+        peak_age(int):The age that recovers fastest.
+        decline_per_year(float):The fraction of the base amount lost per year away from the peak age.
+        minimum_fraction(float):The smallest fraction of the base amount any runner recovers.
+        Raises:
+        CustomTypeError:Error is raised, if an argument has the wrong type.
+        CustomValueError:Error is raised, if an argument is negative or a fraction is above 1.
+        """
+        if not isinstance(base, int) or not isinstance(peak_age, int):
+            raise CustomTypeError("base and peak_age must be integers")
+        if not isinstance(decline_per_year, float) or not isinstance(minimum_fraction, float):
+            raise CustomTypeError("decline_per_year and minimum_fraction must be floats")
+        if base < 0 or peak_age < 0 or decline_per_year < 0 or not 0 <= minimum_fraction <= 1:
+            raise CustomValueError("Incorrect settings for AgeBasedRecovery, they cannot be negative and minimum_fraction cannot be above 1")
+        self.base = base
+        self.peak_age = peak_age
+        self.decline_per_year = decline_per_year
+        self.minimum_fraction = minimum_fraction
+        self._amounts = {} # age -> recovered amount, there are only ~116 valid ages
+
+    def amount_for(self, age: int) -> int:
+        """
+        Returns the energy a runner of the given age recovers.
+        """
+        amount = self._amounts.get(age)
+        if amount is None:
+            fraction = max(self.minimum_fraction, 1 - self.decline_per_year * abs(age - self.peak_age))
+            amount = self._amounts[age] = round(self.base * fraction)
+        return amount
+
+    def apply(self, energies: list, ages: list, max_energy: int) -> list:
+        amounts = self._amounts
+        amount_for = self.amount_for
+        recovered = []
+        for e, age in zip(energies, ages):
+            e += amounts[age] if age in amounts else amount_for(age)
+            recovered.append(e if e < max_energy else max_energy)
+        return recovered
+
+
+def recover_roster(runners: list, policy: RecoveryPolicy) -> None:
+    """
+    Applies a recovery policy to a list of runners in one pass.
+
+    Args:
+    runners(list[Runner]):The runners to recover.
+    policy(RecoveryPolicy):The recovery policy.
+    Raises:
+    CustomTypeError:Error is raised, if 'policy' is not a RecoveryPolicy.
+    """
+    if not isinstance(policy, RecoveryPolicy):
+        raise CustomTypeError(f"Incorrect input type for policy, expected RecoveryPolicy got {type(policy)} instead")
+    if not runners:
+        return
+    with ALL_ENERGY_LOCKS: # the energies are read and written here rather than by Runner.recover_energy
+        recovered = policy.apply([runner.energy for runner in runners], [runner.age for runner in runners], runners[0].max_energy)
+        for runner, energy in zip(runners, recovered):
+            runner.energy = energy
+
+def recover_shared(roster, policy: RecoveryPolicy) -> None:
+    """
+    Applies a recovery policy to the energy column of a shared_state.SharedRoster in place,
+    and copies the result to its Runner objects.
+
+    Args:
+    roster(SharedRoster):The shared roster to recover.
+    policy(RecoveryPolicy):The recovery policy.
+    """
+    if not isinstance(policy, RecoveryPolicy):
+        raise CustomTypeError(f"Incorrect input type for policy, expected RecoveryPolicy got {type(policy)} instead")
+    if not roster.runners:
+        return
+    energies = roster.column('energy')
+    try:
+        recovered = policy.apply([int(e) for e in energies], [runner.age for runner in roster.runners], roster.runners[0].max_energy)
+        energies[:] = memoryview(array('d', recovered))
+    finally:
+        energies.release()
+    roster.store_energies()
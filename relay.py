@@ -0,0 +1,147 @@
+from __future__ import annotations
+from operator import itemgetter
+from custom_errors import *
+from race import Race
+from results import DNF, RaceResult
+from runner import Runner
+from standings import ordinal_labels
+
+class Team:
+    """
+    A class representing a relay team.
+
+    Attributes:
+    name(str):The name of the team.
+    runners(list[Runner]):The team members in leg order.
+    """
+
+    def __init__(self, name: str, runners: list[Runner]) -> None:
+        """
+        Initializes a Team.
+
+        Args:
+        name(str):The name of the team.
+        runners(list[Runner]):The team members in leg order, one leg each.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'name' is not a str or 'runners' is not a list.
+        CustomValueError:Error is raised, if 'name' is empty, the team has no runners or a runner appears twice.
+        CustomAttributeError:Error is raised, if a member is not a Runner.
+        """
+        if not isinstance(name, str):
+            raise CustomTypeError(f"Incorrect input type for name, expected str got {type(name)} instead")
+        if not name:
+            raise CustomValueError("Incorrect input value for name, as name cannot be empty strings")
+        if not isinstance(runners, list):
+            raise CustomTypeError(f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        if not runners:
+            raise CustomValueError(f"Team {name} has no runners")
+        for runner in runners:
+            if not isinstance(runner, Runner):
+                raise CustomAttributeError("runner is not an object of Runner class")
+        if len(set(map(id, runners))) != len(runners):
+            raise CustomValueError(f"A runner cannot run two legs for team {name}")
+        self.name = name
+        self.runners = list(runners)
+
+    def __str__(self):
+        return f"Team: {self.name} Runners: {', '.join(runner.name for runner in self.runners)}"
+
+
+class RelayRace(Race):
+    """
+    Class representing a relay race between teams.
+    The race distance is split evenly over each team's legs, and every team member runs one leg.
+
+    Attributes:
+    teams(list[Team]):The teams present in the race.
+
+    Methods:
+    add_team:Adds a team to the race.
+    conduct_race():Conducts the relay race and returns the team results.
+    """
+
+    def __init__(self, distance: float, teams: list[Team] = None) -> None:
+        """
+        Initializes a RelayRace object.
+
+        Args:
+        distance(float):The distance in kilometers of the whole relay.
+        teams(list[Team] = None):The teams present in the race, by default None which assigns an empty list.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'teams' is not None or a list.
+        """
+        super().__init__(distance, None)
+        self.apply_race_type("relay")
+        if not (teams is None or isinstance(teams, list)):
+            raise CustomTypeError("teams must be None or a list")
+        self.teams = []
+        self._team_member_ids = set()
+        for team in teams or []:
+            self.add_team(team)
+
+    def add_team(self, team: Team) -> None:
+        """
+        Adds a team to the race.
+
+        Args:
+        team(Team):The team that needs to be added.
+
+        Raises:
+        CustomAttributeError:Error is raised, if 'team' is not a Team.
+        RunnerAlreadyExistsError:Error is raised, if the team or one of its runners is already in the race.
+        RaceIsFullError:Error is raised, if the race is full.
+        """
+        if not isinstance(team, Team):
+            raise CustomAttributeError("team is not an object of Team class")
+        if len(self.teams) >= self.maximum_participants:
+            raise RaceIsFullError("The limit of maximum participants has been reached so cannot add more teams")
+        members = set(map(id, team.runners))
+        if not members.isdisjoint(self._team_member_ids):
+            raise RunnerAlreadyExistsError(f"A runner of team {team.name} is already in the race")
+        self.teams.append(team)
+        self._team_member_ids |= members
+        self.runners.extend(team.runners)
+
+    def conduct_race(self) -> list[RaceResult]:
+        """
+        Conducts the relay race, leg by leg for all teams at once.
+        Returns:list[RaceResult]:The team and their total time, DNF if a runner ran out of energy.
+        """
+        return self.kernel(self)
+
+
+class TeamLeaderboard:
+    """
+    Scores relay results into a team leaderboard, with the same points as Competition.update_leaderboard.
+
+    Attributes:
+    points(dict):Team name mapped to total points.
+    leaderboard(dict):Ordinal position mapped to (team name, points).
+
+    Methods:
+    update:Awards points for a relay race and rebuilds the leaderboard.
+    """
+
+    def __init__(self) -> None:
+        self.points = {}
+        self.leaderboard = {}
+
+    def update(self, results: list[tuple[Team, float]]) -> None:
+        """
+        Awards points for a relay race: the winner gets one point less than the number of teams,
+        each place after that one point less, and teams that did not finish get 0.
+
+        Args:
+        results(list):The team results returned by RelayRace.conduct_race.
+        """
+        sorted_result = sorted(results, key=itemgetter(1))
+        num_teams = len(results)
+        points = self.points
+        for i, (team, time_taken) in enumerate(sorted_result):
+            awarded = 0 if time_taken == DNF else num_teams - (i + 1)
+            points[team.name] = points.get(team.name, 0) + awarded
+        standings = sorted(points.items(), key=lambda x: x[1], reverse=True)
+        labels = ordinal_labels(len(standings))
+        self.leaderboard = {labels[i]: entry for i, entry in enumerate(standings)}
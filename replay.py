@@ -0,0 +1,260 @@
+from __future__ import annotations
+import struct
+from array import array
+from custom_errors import *
+from race_types import RACE_TYPES
+from results import status_of
+from standings import ordinal_labels
+
+# Every event is one fixed size record: kind, two integer fields and a float value
+RECORD = struct.Struct('<BIId')
+HEADER = struct.Struct('<4sHI')
+MAGIC = b'RCRL'
+VERSION = 1
+
+# Event kinds
+RACE_START = 1   # a: round, b: race type code (RaceType.code), value: distance
+RESULT = 2       # a: runner index, b: 1 if the runner did not finish, value: time taken (DNF, infinity, if the runner did not finish)
+DRAIN = 3        # a: runner index, value: energy drained during the race
+RECOVER = 4      # a: runner index, value: energy recovered after not finishing or between rounds
+POINTS = 5       # a: runner index, value: points awarded for the race
+
+# ReplayLog keeps the running points and energies every this many races, so a query only replays the races since
+CHECKPOINT_INTERVAL = 64
+
+class ReplayWriter:
+    """
+    A buffered, append-only writer of the binary event log of a competition.
+
+    Attributes:
+    path(str):The file the log is written to.
+    names(list):The runner names, the position of a name is the runner index used by the events.
+
+    Methods:
+    race_start:Records the start of a race.
+    result:Records the result of a runner in the current race.
+    drain:Records energy drained from a runner.
+    recover:Records energy recovered by a runner.
+    points:Records points awarded to a runner.
+    close:Flushes and closes the log.
+    """
+
+    def __init__(self, path: str, runners: list, buffer_size: int = 1 << 16) -> None:
+        """
+        Creates the log file and writes its header (runner names and starting energies).
+
+        Args:
+        path(str):The file the log is written to, an existing file is replaced.
+        runners(list):The runners of the competition.
+        buffer_size(int):The size of the write buffer in bytes.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'runners' is not a list.
+        """
+        if not isinstance(runners, list):
+            raise CustomTypeError(f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        self.path = path
+        self.names = [runner.name for runner in runners]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._pack = RECORD.pack
+        header = bytearray(HEADER.pack(MAGIC, VERSION, len(runners)))
+        for runner in runners:
+            encoded = runner.name.encode('utf-8')
+            header += struct.pack('<H', len(encoded)) + encoded + struct.pack('<d', runner.energy)
+        self._file.write(header)
+
+    def race_start(self, round_number: int, race_type: str, distance: float) -> None:
+        """
+        Records the start of a race of the given round, registered race type and distance.
+        """
+        self._file.write(self._pack(RACE_START, round_number, RACE_TYPES[race_type].code, distance))
+
+    def result(self, runner, time_taken) -> None:
+        """
+        Records the time of a runner in the current race, with its status code.
+        """
+        self._file.write(self._pack(RESULT, self._index[runner.name], status_of(time_taken), time_taken))
+
+    def drain(self, runner, amount: int) -> None:
+        """
+        Records the energy a runner lost during the current race.
+        """
+        self._file.write(self._pack(DRAIN, self._index[runner.name], 0, amount))
+
+    def recover(self, runner, amount: int) -> None:
+        """
+        Records the energy a runner recovered after the current race.
+        """
+        self._file.write(self._pack(RECOVER, self._index[runner.name], 0, amount))
+
+    def points(self, runner, points: int) -> None:
+        """
+        Records the points a runner was awarded for the current race.
+        """
+        self._file.write(self._pack(POINTS, self._index[runner.name], 0, points))
+
+    def close(self) -> None:
+        """
+        Flushes the buffered events and closes the file.
+        """
+        self._file.close()
+
+    def __enter__(self) -> ReplayWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ReplayLog:
+    """
+    Reads an event log written by ReplayWriter and rebuilds intermediate state without re-simulating.
+
+    Attributes:
+    names(list):The runner names in runner index order.
+    starting_energy(list):The energy of each runner when the log was started.
+    race_count(int):The number of races in the log.
+
+    Methods:
+    events:Iterates over the decoded events.
+    points_at:Returns the points of every runner after a given number of races.
+    leaderboard_at:Returns the leaderboard after a given number of races.
+    energies_at:Returns the energy of every runner after a given number of races.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Loads a log, indexes where every race starts and keeps the standings and energies every CHECKPOINT_INTERVAL races.
+
+        Args:
+        path(str):The log file.
+
+        Raises:
+        CustomValueError:Error is raised, if the file is not a replay log or its header is truncated.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            raise CustomValueError(f"{path} is not a version {VERSION} replay log")
+        magic, version, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise CustomValueError(f"{path} is not a version {VERSION} replay log")
+        offset = HEADER.size
+        self.names = []
+        self.starting_energy = []
+        try:
+            for _ in range(count):
+                (length,) = struct.unpack_from('<H', data, offset)
+                offset += 2
+                self.names.append(data[offset:offset + length].decode('utf-8'))
+                offset += length
+                self.starting_energy.append(struct.unpack_from('<d', data, offset)[0])
+                offset += 8
+        except (struct.error, UnicodeDecodeError):
+            raise CustomValueError(f"{path} is a truncated or damaged replay log, its runner table is incomplete") from None
+        usable = (len(data) - offset) // RECORD.size * RECORD.size # ignore a torn trailing record
+        self._records = memoryview(data)[offset:offset + usable]
+        # record number of every race start, so a point in the competition can be found without scanning,
+        # and the points and energies before every CHECKPOINT_INTERVAL-th race as (record number, points, energies)
+        self._race_starts = race_starts = []
+        points, energies = array('d', bytes(8 * count)), array('d', self.starting_energy)
+        self._checkpoints = [(0, array('d', points), array('d', energies))]
+        for i, (kind, index, _, value) in enumerate(RECORD.iter_unpack(self._records)):
+            if kind == RACE_START:
+                if race_starts and len(race_starts) % CHECKPOINT_INTERVAL == 0:
+                    self._checkpoints.append((i, array('d', points), array('d', energies)))
+                race_starts.append(i)
+            elif kind == POINTS:
+                points[index] += value
+            elif kind == DRAIN:
+                energies[index] -= value
+            elif kind == RECOVER:
+                energies[index] += value
+        self.race_count = len(race_starts)
+
+    def _prefix(self, races: int) -> memoryview:
+        """
+        Returns the records written before race number 'races' started (all records past the last race).
+        """
+        if not isinstance(races, int):
+            raise CustomTypeError(f"Incorrect input type for races, expected int got {type(races)} instead")
+        if races < 0 or races > self.race_count:
+            raise CustomValueError(f"Incorrect input value for races, races must be between 0 and {self.race_count}")
+        if races == self.race_count:
+            return self._records
+        return self._records[:self._race_starts[races] * RECORD.size]
+
+    def _totals(self, races: int, kind: int) -> array:
+        """
+        Returns every runner's points (kind POINTS) or energy (kind DRAIN) after the first 'races' races,
+        replaying only the records since the last checkpoint before them.
+        """
+        end = len(self._prefix(races)) // RECORD.size
+        start, points, energies = self._checkpoints[min(races // CHECKPOINT_INTERVAL, len(self._checkpoints) - 1)]
+        records = self._records[start * RECORD.size:end * RECORD.size]
+        if kind == POINTS:
+            totals = array('d', points)
+            for event, index, _, value in RECORD.iter_unpack(records):
+                if event == POINTS:
+                    totals[index] += value
+        else:
+            totals = array('d', energies)
+            for event, index, _, value in RECORD.iter_unpack(records):
+                if event == DRAIN:
+                    totals[index] -= value
+                elif event == RECOVER:
+                    totals[index] += value
+        return totals
+
+    def events(self, races: int = None):
+        """
+        Iterates over the decoded events.
+
+        Args:
+        races(int):Only the events of the first 'races' races, by default all of them.
+        Yields:
+        tuple: kind, field a, field b and value of each event.
+        """
+        records = self._records if races is None else self._prefix(races)
+        return RECORD.iter_unpack(records)
+
+    def points_at(self, races: int) -> dict:
+        """
+        Returns the points of every runner after the first 'races' races.
+
+        Args:
+        races(int):The number of races that have been scored.
+        Returns:
+        dict: Runner name mapped to points.
+        """
+        totals = self._totals(races, POINTS)
+        return {name: int(points) for name, points in zip(self.names, totals)}
+
+    def leaderboard_at(self, races: int) -> dict:
+        """
+        Returns the leaderboard as Competition builds it, after the first 'races' races.
+
+        Args:
+        races(int):The number of races that have been scored.
+        Returns:
+        dict: Ordinal position mapped to (runner name, points).
+        """
+        standings = sorted(self.points_at(races).items(), key=lambda x: x[1], reverse=True)
+        labels = ordinal_labels(len(standings))
+        return {labels[i]: entry for i, entry in enumerate(standings)}
+
+    def energies_at(self, races: int) -> dict:
+        """
+        Returns the energy of every runner after the first 'races' races (including any DNF recovery).
+
+        Args:
+        races(int):The number of races that have been run.
+        Returns:
+        dict: Runner name mapped to energy.
+        """
+        energies = self._totals(races, DRAIN)
+        return {name: int(energy) for name, energy in zip(self.names, energies)}
+
+    def __len__(self) -> int:
+        return len(self._records) // RECORD.size
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import math
+from array import array
+from functools import partial
+from operator import itemgetter
+
+# The time of a runner that did not finish. It is a float like every other time, so results can be
+# sorted by time directly and packed into float arrays, and it sorts after every finishing time.
+DNF = math.inf
+
+# Status codes of a result
+FINISHED = 0
+DID_NOT_FINISH = 1
+
+class RaceResult(tuple):
+    """
+    The result of one runner, or one relay team, in a race. It unpacks as (runner, time) like a pair.
+    A plain tuple subclass rather than a typing.NamedTuple, so importing the results does not import typing.
+
+    Attributes:
+    runner(Runner):The runner, or the team in a relay race.
+    time(float):The time taken in seconds, DNF if the runner did not finish.
+    """
+    __slots__ = ()
+
+    def __new__(cls, runner, time: float) -> RaceResult:
+        return tuple.__new__(cls, (runner, time))
+
+    def __getnewargs__(self) -> tuple:
+        return tuple(self)
+
+    def __repr__(self) -> str:
+        return f"RaceResult(runner={self[0]!r}, time={self[1]!r})"
+
+    runner = property(itemgetter(0))
+    time = property(itemgetter(1))
+
+    @property
+    def finished(self) -> bool:
+        """
+        True if the runner finished the race.
+        """
+        return self.time != DNF
+
+    @property
+    def status(self) -> int:
+        """
+        The status code of the result, FINISHED or DID_NOT_FINISH.
+        """
+        return FINISHED if self.time != DNF else DID_NOT_FINISH
+
+def status_of(time_taken: float) -> int:
+    """
+    Returns the status code of a time, FINISHED or DID_NOT_FINISH.
+    """
+    return FINISHED if time_taken != DNF else DID_NOT_FINISH
+
+def pack_results(results: list) -> tuple[list, array, array]:
+    """
+    Splits race results into columns.
+
+    Args:
+    results(list):(runner, time) results, as the races return them.
+    Returns:
+    tuple: The runners, their times as an array('d') with DNF for runners that did not finish,
+    and their status codes as an array('b').
+    """
+    runners = [runner for runner, _ in results]
+    times = array('d', [time_taken for _, time_taken in results])
+    statuses = array('b', [FINISHED if time_taken != DNF else DID_NOT_FINISH for time_taken in times])
+    return runners, times, statuses
+
+# builds a RaceResult from a (runner, time) pair without going through RaceResult.__new__
+_make_result = partial(tuple.__new__, RaceResult)
+
+def unpack_results(runners: list, times) -> list[RaceResult]:
+    """
+    Returns the results of runners and their times, the reverse of pack_results.
+    The race kernels build their results with it, it is about twice as fast as calling RaceResult per runner.
+    """
+    return list(map(_make_result, zip(runners, times)))
+
+
+class ScoredRace:
+    """
+    A race as it was scored: its runners in result order, their times and the points each of them was awarded.
+    The winner gets one point less than the number of runners, each place after that one point less,
+    runners with equal times keep their result order, and runners that did not finish get 0.
+
+    Attributes:
+    runners(tuple):The runners, in the order of the results.
+    times(array):The time of every runner, DNF for runners that did not finish.
+    points(array):The points awarded to every runner.
+
+    Methods:
+    score:Scores the results of a race.
+    index_of:Returns the position of a runner in the race.
+    amend:Changes the time of one runner and rescores the race.
+    """
+
+    __slots__ = ('runners', 'times', 'points', '_positions')
+
+    def __init__(self, runners: tuple, times: array) -> None:
+        self.runners = runners
+        self.times = times
+        self.points = self._award(times)
+        self._positions = None # id(runner) -> position, built on the first amend
+
+    @classmethod
+    def score(cls, results: list) -> ScoredRace:
+        """
+        Scores the results of a race.
+
+        Args:
+        results(list):(runner, time) results, as the races return them.
+        Returns:
+        ScoredRace: The scored race.
+        """
+        return cls(tuple([runner for runner, _ in results]), array('d', [time_taken for _, time_taken in results]))
+
+    @staticmethod
+    def _award(times: array) -> array:
+        # points of every position, from the places of a stable sort by time
+        count = len(times)
+        points = array('q', bytes(8 * count))
+        for place, i in enumerate(sorted(range(count), key=times.__getitem__)):
+            if times[i] != DNF:
+                points[i] = count - (place + 1)
+        return points
+
+    def index_of(self, runner) -> int:
+        """
+        Returns the position of a runner in the results of the race, None if the runner did not run it.
+        """
+        if self._positions is None:
+            self._positions = {id(r): i for i, r in enumerate(self.runners)}
+        return self._positions.get(id(runner))
+
+    def amend(self, index: int, time_taken: float) -> list[tuple]:
+        """
+        Changes the time of one runner and rescores the race.
+
+        Args:
+        index(int):The position of the runner in the results.
+        time_taken(float):The corrected time, DNF if the runner did not finish.
+        Returns:
+        list: (runner, points difference) of every runner whose points changed.
+        """
+        old = self.points
+        self.times[index] = time_taken
+        self.points = self._award(self.times)
+        return [(runner, new - before) for runner, before, new in zip(self.runners, old, self.points) if new != before]
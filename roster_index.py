@@ -0,0 +1,188 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from custom_errors import *
+
+# Runner attributes that get a sorted index
+SORTED_FIELDS = ('age', 'sprint_speed', 'endurance_speed')
+
+class RosterIndex:
+    """
+    Indexes over a roster of runners for combined queries by country, age and speeds.
+    Runner ids are the positions the runners were added in. Countries have a hash index (country -> ids)
+    and every field of SORTED_FIELDS a sorted index of (value, id), so every condition of a query can count
+    its matches with one lookup or two bisects. A query walks only the matches of its most selective
+    condition and checks the other conditions on those.
+
+    The index keeps the values the runners had when they were added; call reindex() after changing one.
+
+    Attributes:
+    runners(list[Runner]):The indexed runners, runners[runner_id] is the runner with that id.
+
+    Methods:
+    add:Adds a runner and returns its id.
+    reindex:Updates the indexes after a runner's attributes changed.
+    query:Returns the ids of the runners matching every given condition.
+    """
+
+    def __init__(self, runners: list = None) -> None:
+        """
+        Initializes a RosterIndex.
+
+        Args:
+        runners(list[Runner]):Runners to add, by default None.
+        """
+        self.runners = []
+        self._ids = {} # id(runner) -> runner id
+        self._countries = {} # country -> runner ids, in increasing order
+        self._keys = {field: [] for field in SORTED_FIELDS} # sorted values
+        self._order = {field: [] for field in SORTED_FIELDS} # runner ids, in the order of the sorted values
+        self._values = {field: [] for field in SORTED_FIELDS} # indexed value of every runner id
+        self._country_of = [] # indexed country of every runner id
+        if runners is not None:
+            self._add_all(runners)
+
+    def _add_all(self, runners: list) -> None:
+        # the constructor's runners are added to the hash indexes one by one and every sorted index is built
+        # with one sort, rather than with one list insertion per runner
+        for runner in runners:
+            if id(runner) in self._ids:
+                raise RunnerAlreadyExistsError(f"Runner {runner.name} is already indexed")
+            runner_id = len(self.runners)
+            self.runners.append(runner)
+            self._ids[id(runner)] = runner_id
+            self._country_of.append(runner.country)
+            self._countries.setdefault(runner.country, []).append(runner_id)
+        for field in SORTED_FIELDS:
+            values = self._values[field]
+            values.extend(getattr(runner, field) for runner in self.runners)
+            # a stable sort of the ids, so ties are kept in id order like _insert keeps them
+            order = self._order[field] = sorted(range(len(values)), key=values.__getitem__)
+            self._keys[field] = [values[runner_id] for runner_id in order]
+
+    def add(self, runner) -> int:
+        """
+        Adds a runner to every index.
+
+        Args:
+        runner(Runner):The runner to add.
+        Returns:
+        int: The id of the runner.
+        Raises:
+        RunnerAlreadyExistsError:Error is raised, if the runner is already indexed.
+        """
+        if id(runner) in self._ids:
+            raise RunnerAlreadyExistsError(f"Runner {runner.name} is already indexed")
+        runner_id = len(self.runners)
+        self.runners.append(runner)
+        self._ids[id(runner)] = runner_id
+        self._country_of.append(runner.country)
+        self._countries.setdefault(runner.country, []).append(runner_id)
+        for field in SORTED_FIELDS:
+            value = getattr(runner, field)
+            self._values[field].append(value)
+            self._insert(field, value, runner_id)
+        return runner_id
+
+    def _insert(self, field: str, value, runner_id: int) -> None:
+        keys, order = self._keys[field], self._order[field]
+        # ties are kept in id order, so the new id goes after the equal values
+        position = bisect_right(keys, value)
+        keys.insert(position, value)
+        order.insert(position, runner_id)
+
+    def _delete(self, field: str, value, runner_id: int) -> None:
+        keys, order = self._keys[field], self._order[field]
+        position = bisect_left(keys, value)
+        while order[position] != runner_id:
+            position += 1
+        del keys[position]
+        del order[position]
+
+    def id_of(self, runner) -> int:
+        """
+        Returns the id of an indexed runner.
+        Raises:
+        RunnerDoesntExistError:Error is raised, if the runner is not indexed.
+        """
+        runner_id = self._ids.get(id(runner))
+        if runner_id is None:
+            raise RunnerDoesntExistError(f"Runner {runner.name} is not indexed")
+        return runner_id
+
+    def reindex(self, runner) -> None:
+        """
+        Updates the indexes of a runner whose country, age or speeds changed.
+
+        Args:
+        runner(Runner):An indexed runner.
+        """
+        runner_id = self.id_of(runner)
+        if runner.country != self._country_of[runner_id]:
+            self._countries[self._country_of[runner_id]].remove(runner_id)
+            ids = self._countries.setdefault(runner.country, [])
+            ids.insert(bisect_left(ids, runner_id), runner_id)
+            self._country_of[runner_id] = runner.country
+        for field in SORTED_FIELDS:
+            value = getattr(runner, field)
+            if value != self._values[field][runner_id]:
+                self._delete(field, self._values[field][runner_id], runner_id)
+                self._insert(field, value, runner_id)
+                self._values[field][runner_id] = value
+
+    def _span(self, field: str, bounds: tuple) -> tuple:
+        # positions in the sorted index of the values within the inclusive bounds, None meaning unbounded
+        if not isinstance(bounds, tuple) or len(bounds) != 2:
+            raise CustomTypeError(f"Incorrect input type for {field}, expected a (low, high) tuple got {bounds!r} instead")
+        low, high = bounds
+        keys = self._keys[field]
+        start = 0 if low is None else bisect_left(keys, low)
+        stop = len(keys) if high is None else bisect_right(keys, high)
+        return start, max(start, stop)
+
+    def query(self, country: str = None, age: tuple = None, sprint_speed: tuple = None, endurance_speed: tuple = None) -> list[int]:
+        """
+        Returns the ids of the runners matching every given condition, in increasing order.
+
+        Args:
+        country(str):The country of the runners, by default any.
+        age(tuple):Inclusive (low, high) bounds of the age, either bound may be None.
+        sprint_speed(tuple):Inclusive (low, high) bounds of the sprint speed, either bound may be None.
+        endurance_speed(tuple):Inclusive (low, high) bounds of the endurance speed, either bound may be None.
+        Returns:
+        list[int]: The matching runner ids.
+        Raises:
+        CustomTypeError:Error is raised, if a range is not a (low, high) tuple.
+        """
+        ranges = {field: bounds for field, bounds in zip(SORTED_FIELDS, (age, sprint_speed, endurance_speed)) if bounds is not None}
+        spans = {field: self._span(field, bounds) for field, bounds in ranges.items()}
+        # the candidates come from the condition with the fewest matches
+        candidates = range(len(self.runners)) if country is None else self._countries.get(country, [])
+        driver = None # the sorted field the candidates come from, None for the country index or every runner
+        for field, (start, stop) in spans.items():
+            if stop - start < len(candidates):
+                candidates = self._order[field][start:stop]
+                driver = field
+        checks = [(self._values[field], bounds) for field, bounds in ranges.items() if field != driver]
+        if driver is not None and country is not None:
+            country_of = self._country_of
+            candidates = [runner_id for runner_id in candidates if country_of[runner_id] == country]
+        matches = []
+        for runner_id in candidates:
+            for values, (low, high) in checks:
+                value = values[runner_id]
+                if (low is not None and value < low) or (high is not None and value > high):
+                    break
+            else:
+                matches.append(runner_id)
+        if driver is not None:
+            matches.sort()
+        return matches
+
+    def runners_for(self, runner_ids: list[int]) -> list:
+        """
+        Returns the runners with the given ids.
+        """
+        return [self.runners[runner_id] for runner_id in runner_ids]
+
+    def __len__(self) -> int:
+        return len(self.runners)
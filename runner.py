@@ -1,5 +1,23 @@
-import csv
+import threading
 from custom_errors import *
+from race_types import RACE_TYPES
+
+# Striped locks guarding the read-modify-write of a runner's energy, shared by all runners
+_ENERGY_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+class _AllEnergyLocks:
+    # holds every energy lock, taken in the same order by every holder, for updating many runners at once
+    def __enter__(self) -> None:
+        for lock in _ENERGY_LOCKS:
+            lock.acquire()
+
+    def __exit__(self, *exc) -> None:
+        for lock in reversed(_ENERGY_LOCKS):
+            lock.release()
+
+# Code that sets runner.energy without drain_energy or recover_energy runs inside 'with ALL_ENERGY_LOCKS:',
+# one acquisition per stripe for the whole update instead of one per runner
+ALL_ENERGY_LOCKS = _AllEnergyLocks()
 
 class Runner:
     """
@@ -18,6 +36,7 @@ class Runner:
     Methods:
     __init__:Initializes a new Runner instance.
     country_csv():Reads the country names from a CSV file and returns them as a list.
+    valid_countries():Returns the cached set of country names.
     drain_energy:Drains the energy from the runner.
     recover_energy:Recovers the energy of the runner.
     run_race:conducts the race and calculates the time taken by runner to finish the race.
@@ -26,6 +45,7 @@ class Runner:
     """
    
     max_energy = 1000
+    _countries = None # valid country names, read from the csv on first use
     def __init__(self,name: str, age: int, country: str, sprint_speed: float, endurance_speed: float) ->None:
 
 
@@ -53,7 +73,7 @@ class Runner:
                 raise CustomValueError("Incorrect input value for name, as name cannot be empty strings")
             # Raise an error if name is not of type str
         if not isinstance(name,str):
-                raise CustomTypeError ("Incorrect input type for name, expected str got {type(name)} instead")
+                raise CustomTypeError (f"Incorrect input type for name, expected str got {type(name)} instead")
             # Raise an error if name is not alphanumeric
         if not ''.join(name.split()).isalnum():
                 raise CustomValueError ("Incorrect input type for name,name is not alphanumeric")
@@ -62,29 +82,28 @@ class Runner:
                 raise CustomValueError ("Incorrect input type for name,name is not alphanumeric")
             # Raise an error if age is not of type int
         if not isinstance(age,int):
-                raise CustomTypeError ("Incorrect input type for age, expected int got {type(age)} instead")
+                raise CustomTypeError (f"Incorrect input type for age, expected int got {type(age)} instead")
             # Raise an error if age is not between 5 and 120
         if (age<5 or age >120):
                 raise CustomValueError ("Incorrect input value for age, age is not between 5 and 120")
             # Raise an error if sprint_speed is not of type float
         if not isinstance(sprint_speed,float):
-                raise CustomTypeError ("Incorrect input type for sprint_speed, expected float got {type(sprint_speed)} instead")
+                raise CustomTypeError (f"Incorrect input type for sprint_speed, expected float got {type(sprint_speed)} instead")
             # Raise an error if sprint_speed is not between 2.2 and 6.8
         if (sprint_speed<2.2 or sprint_speed >6.8):
                 raise CustomValueError ("Incorrect input value for sprint_speed, sprint_speed is not between 2.2 and 6.8")
             # Raise an error if endurance_speed is not of type float
         if not isinstance(endurance_speed,float):
-                raise CustomTypeError ("Incorrect input type for endurancess_speed, expected float got {type(endurance_speed)} instead")
+                raise CustomTypeError (f"Incorrect input type for endurancess_speed, expected float got {type(endurance_speed)} instead")
             # Raise an error if endurance_speed is not between 1.8 and 5.4
         if (endurance_speed<1.8 or endurance_speed >5.4):
                 raise CustomValueError ("Incorrect input value for endurance_speed, endurance_speed is not between 1.8 and 5.4") 
             # Raise an error if country is not alphabetic
         if not isinstance(country,str):
-                raise CustomTypeError ("Incorrect input type for country, expected str got {type(country)} instead")
+                raise CustomTypeError (f"Incorrect input type for country, expected str got {type(country)} instead")
             # Validate country against the CSV file
-        correct_country=self.country_csv()
         # Raise an error if country is not in the list of countries from the CSV
-        if country not in correct_country:
+        if country not in self.valid_countries():
                 raise CustomValueError ("This country is not present in the provided csv")
 
         # Initialize instance attributes
@@ -95,7 +114,8 @@ class Runner:
         self.endurance_speed = endurance_speed
         self.energy = self.max_energy
         
-    def country_csv(self) -> list:
+    @staticmethod
+    def country_csv() -> list:
         """
         Reads the country names from a CSV file and returns them as a list.
         Returns:
@@ -103,6 +123,7 @@ class Runner:
         Raises:
         CustomKeyError: Error is raised,if a given country name (key) is not found in the CSV row
         """
+        import csv # only needed the first time a runner is created
         countries=[]
         with open ('countries.csv','r') as file:
             # Read the CSV file
@@ -115,6 +136,17 @@ class Runner:
                 countries.append(row['name'])
             return countries
     
+    @classmethod
+    def valid_countries(cls) -> frozenset:
+        """
+        Returns the country names from the CSV file, the file is read only once per process.
+        Returns:
+        frozenset: The valid country names.
+        """
+        if Runner._countries is None:
+            Runner._countries = frozenset(cls.country_csv())
+        return Runner._countries
+
     def drain_energy(self, drain_points: int)-> None:
         """
         Drains energy from the runner.
@@ -130,7 +162,7 @@ class Runner:
             raise CustomAttributeError("Attribute 'energy' not found in class runner.")
             # Raise an error if drain_points is not of type int
         if not isinstance(drain_points,int):
-            raise CustomTypeError ("Incorrect input type for drain_points, expected int got {type(drain_points)} instead")
+            raise CustomTypeError (f"Incorrect input type for drain_points, expected int got {type(drain_points)} instead")
             # Raise an error if drain_points is negative
         if drain_points <0:
             raise CustomValueError("Incorrect input value for drain_points, drain_points must be a positive integer")
@@ -138,10 +170,11 @@ class Runner:
         if drain_points > self.max_energy:
             raise CustomValueError("Incorrect input value for drain_points, drain_points must be less then max energy")
 
-        self.energy=self.energy-drain_points #reduce energy by drain_points
-        if self.energy <=0: # check if energy goes below 0
-            # Ensure energy does not go below 0
-            self.energy=0
+        with _ENERGY_LOCKS[(id(self) >> 4) % len(_ENERGY_LOCKS)]:
+            self.energy=self.energy-drain_points #reduce energy by drain_points
+            if self.energy <=0: # check if energy goes below 0
+                # Ensure energy does not go below 0
+                self.energy=0
         
     
     def recover_energy(self, recovery_amount:int)-> None:
@@ -159,7 +192,7 @@ class Runner:
             raise CustomAttributeError("Attribute 'energy' not found in class runner.")
         # Raise an error if recovery_amount is not of type int
         if not isinstance(recovery_amount,int):
-            raise CustomTypeError ("Incorrect input type for recovery_amount, expected int got {type(recovery_amount)} instead")
+            raise CustomTypeError (f"Incorrect input type for recovery_amount, expected int got {type(recovery_amount)} instead")
         # Raise an error if recovery_amount is negative
         if recovery_amount <0:
             raise CustomValueError("Incorrect input value for recovery_amount, recovery_amount must be a positive integer")
@@ -167,9 +200,10 @@ class Runner:
         if recovery_amount > self.max_energy:
             raise CustomValueError("Incorrect input value for Recovery amount, Recovery_amount cannot be greater than max energy")
         
-        self.energy = self.energy + recovery_amount # recovering energy by the recovery_amount
-        if self.energy > self.max_energy: # checking if energy is greater than max energy 
-            self.energy=self.max_energy #if it is assign max energy to energy
+        with _ENERGY_LOCKS[(id(self) >> 4) % len(_ENERGY_LOCKS)]:
+            self.energy = self.energy + recovery_amount # recovering energy by the recovery_amount
+            if self.energy > self.max_energy: # checking if energy is greater than max energy 
+                self.energy=self.max_energy #if it is assign max energy to energy
         
     
     def run_race(self, race_type: str, distance: float)->float:
@@ -178,7 +212,7 @@ class Runner:
         conducts the race and calculates the time taken by the runner to finish the race.
 
         Args:
-        race_type(str):The type of race can be either 'short' or 'long'.
+        race_type(str):The type of race, any name registered in race_types.RACE_TYPES ('short', 'long', ...).
         distance(float):The distance in kilometers of the race.
 
         Returns:
@@ -188,26 +222,23 @@ class Runner:
         CustomTypeError: Error is raised,if 'distance' is not of type float.
         CustomValueError:Error is raised, if 'distance' is negative.
         CustomTypeError:Error is raised, if 'race_type' is not of type str.
-        CustomValueError:Error is raised, if 'race_type' is not 'short' or 'long'.
+        CustomValueError:Error is raised, if 'race_type' is not a registered race type.
         """
           #Raise an error if distance is not of type float
         if not isinstance(distance,float):
-            raise CustomTypeError ("Incorrect input type for distance, expected float got {type(distance)} instead")
+            raise CustomTypeError (f"Incorrect input type for distance, expected float got {type(distance)} instead")
           # Raise an error if distance is negative
         if distance <=0:
             raise CustomValueError("Incorrect input value for distance, distance must be a positive integer")
          # Raise an error if race_type is not of type str
         if not isinstance(race_type,str):
-            raise CustomTypeError ("Incorrect input type for race_type, expected str got {type(race_type)} instead")
-          # Raise an error if race_type is not 'short' or 'long'
-        if race_type not in ["short","long"]:
-            raise CustomValueError("Incorrect input value for race_type, race_type must be either long or short")
-       # checking if race_type is short 
-        if race_type=='short':
-            speed=self.sprint_speed
-       # checking if race_type is long 
-        elif race_type=='long':
-            speed=self.endurance_speed
+            raise CustomTypeError (f"Incorrect input type for race_type, expected str got {type(race_type)} instead")
+        spec = RACE_TYPES.get(race_type)
+          # Raise an error if race_type is not registered
+        if spec is None:
+            raise CustomValueError(f"Incorrect input value for race_type, race_type must be one of {', '.join(RACE_TYPES)}")
+        # the race type decides which speed the runner uses
+        speed=spec.speed(self)
          # Convert distance to meters
         distance_meters = distance * 1000
         # Calculate time taken to complete the race
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from array import array
+from collections import Counter
+from custom_errors import *
+from race import ShortRace, MarathonRace
+
+class ScheduledRace:
+    """
+    One race of a schedule: which round it belongs to, the class of race and its distance.
+
+    Attributes:
+    round(int):The round of the race, starting at 1.
+    race_class(type):The Race subclass that is conducted.
+    race_type(str):The race type of race_class.
+    distance(float):The distance in kilometers.
+    """
+
+    __slots__ = ('round', 'race_class', 'race_type', 'distance')
+
+    def __init__(self, round: int, race_class: type, race_type: str, distance: float) -> None:
+        self.round = round
+        self.race_class = race_class
+        self.race_type = race_type
+        self.distance = distance
+
+    def build(self, runners: list):
+        """
+        Returns a new race of this descriptor with the given runners.
+        """
+        return self.race_class(self.distance, runners)
+
+
+class Schedule:
+    """
+    A validated competition plan: the number of rounds and the short and marathon distance of each round.
+    The plan is checked once when the schedule is created and can then be shared by any number of
+    competitions through Competition.from_schedule, which skips validating it again.
+
+    Attributes:
+    rounds(int):The number of rounds.
+    distances_short(array):The short race distance of every round.
+    distances_marathon(array):The marathon distance of every round.
+    races(tuple):The races of every round, a (short, marathon) pair of ScheduledRace per round.
+
+    Methods:
+    distances:Returns the distances run at each race type.
+    repeated_distances:Returns the distances run more than once at each race type.
+    """
+
+    def __init__(self, rounds: int, distances_short: list, distances_marathon: list, max_rounds: int = None) -> None:
+        """
+        Validates the plan and builds the race descriptors.
+
+        Args:
+        rounds(int):The number of rounds.
+        distances_short(list):The distance of the short race of every round, floats in kilometers.
+        distances_marathon(list):The distance of the marathon of every round, floats in kilometers.
+        max_rounds(int):The largest number of rounds allowed, by default no limit.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'rounds' is not an int, or a distance list is not a list of floats.
+        CustomValueError:Error is raised, if 'rounds' is not positive or above max_rounds, a distance is not positive,
+        or a distance list does not have one distance per round.
+        """
+        if not isinstance(rounds, int):
+            raise CustomTypeError(f"Incorrect input type for rounds, expected int got {type(rounds)} instead")
+        if rounds <= 0:
+            raise CustomValueError("Incorrect input type for rounds,rounds is cannot be a negative integer")
+        if max_rounds is not None and rounds > max_rounds:
+            raise CustomValueError("Incorrect input type for rounds,rounds cannot be more than max rounds")
+        self.rounds = rounds
+        self.distances_short = self._check_distances('distances_short', distances_short)
+        self.distances_marathon = self._check_distances('distances_marathon', distances_marathon)
+        self.races = tuple((ScheduledRace(i + 1, ShortRace, 'short', short), ScheduledRace(i + 1, MarathonRace, 'long', marathon))
+                           for i, (short, marathon) in enumerate(zip(self.distances_short, self.distances_marathon)))
+
+    def _check_distances(self, name: str, distances: list) -> array:
+        # one pass over a distance list, returning it as a compact array
+        if not isinstance(distances, list):
+            raise CustomTypeError(f"Incorrect input type for {name}, expected list got {type(distances)} instead")
+        for distance in distances:
+            if not isinstance(distance, float):
+                raise CustomTypeError(f"Incorrect input type for {name}, expected float got {type(distance)} instead")
+            if distance <= 0:
+                raise CustomValueError(f"Incorrect input value for {name}, {name} must be positive")
+        if len(distances) != self.rounds:
+            raise CustomValueError(f"the number of {name} is not equal to the number of rounds")
+        return array('d', distances)
+
+    def distances(self) -> dict:
+        """
+        Returns the distances run at each race type, in the form TimingTable takes them.
+        """
+        return {'short': list(self.distances_short), 'long': list(self.distances_marathon)}
+
+    def repeated_distances(self, limit: int = 32) -> dict:
+        """
+        Returns the distances run more than once at each race type, the most frequent first and at most
+        'limit' per type, in the form TimingTable takes them. Precomputing only these keeps a timing table
+        small however many rounds the schedule has.
+        """
+        repeated = {}
+        for race_type, distances in (('short', self.distances_short), ('long', self.distances_marathon)):
+            repeated[race_type] = [distance for distance, count in Counter(distances).most_common(limit) if count > 1]
+        return repeated
+
+    def __len__(self) -> int:
+        return self.rounds
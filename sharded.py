@@ -0,0 +1,210 @@
+from __future__ import annotations
+import heapq
+import multiprocessing
+import os
+from bisect import bisect_left, insort
+from itertools import islice
+from operator import itemgetter
+from multiprocessing import shared_memory
+from custom_errors import *
+from results import DNF
+
+def _shard_worker(conn, shm_name: str) -> None:
+    """
+    Main loop of a shard process. The shard owns the scores of its runner ids in the shared score array
+    and keeps them ordered as (-score, runner id), so top-k is a slice and ranks are a bisect.
+    """
+    # processes started by multiprocessing share the parent's resource tracker, so attaching is safe
+    block = shared_memory.SharedMemory(name=shm_name)
+    scores = block.buf.cast('d')
+    order = [] # (-score, runner id), best first
+    present = set()
+    try:
+        while True:
+            command, argument = conn.recv()
+            if command == 'add':
+                for runner_id, points in argument:
+                    old = scores[runner_id]
+                    if runner_id in present:
+                        del order[bisect_left(order, (-old, runner_id))]
+                    else:
+                        present.add(runner_id)
+                    scores[runner_id] = old + points
+                    insort(order, (-(old + points), runner_id))
+            elif command == 'top':
+                conn.send(order[:argument])
+            elif command == 'count_above':
+                # ids are never negative, so (-score, -1) sorts before every entry with that score
+                conn.send(bisect_left(order, (-argument, -1)))
+            elif command == 'score':
+                conn.send(scores[argument] if argument in present else None)
+            elif command == 'size':
+                conn.send(len(order))
+            elif command == 'stop':
+                break
+    finally:
+        scores.release()
+        block.close()
+        conn.close()
+
+
+class ShardedLeaderboard:
+    """
+    A leaderboard sharded across worker processes by runner id (runner id % number of shards).
+    Scores live in one shared memory array of doubles indexed by runner id, each shard process keeps
+    the ordered standings of its own ids, and the coordinator merges the shards' top-k lists.
+
+    Attributes:
+    capacity(int):The number of runner ids (0 to capacity - 1) the leaderboard can hold.
+    shards(int):The number of shard processes.
+
+    Methods:
+    start:Creates the shared scores and starts the shard processes.
+    close:Stops the shard processes and frees the shared scores.
+    add_points:Adds points to runners.
+    award_race:Awards points for a race the way Competition.update_leaderboard does.
+    top:Returns the global top-k.
+    rank:Returns the global rank of a runner.
+    score:Returns the score of a runner.
+    """
+
+    def __init__(self, capacity: int, shards: int = None) -> None:
+        """
+        Initializes a ShardedLeaderboard, call start() (or use it as a context manager) before using it.
+
+        Args:
+        capacity(int):The number of runner ids the leaderboard can hold.
+        shards(int):The number of shard processes, by default the number of CPUs.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'capacity' or 'shards' is not an int.
+        CustomValueError:Error is raised, if 'capacity' or 'shards' is not positive.
+        """
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if not isinstance(capacity, int) or not isinstance(shards, int):
+            raise CustomTypeError(f"Incorrect input type for capacity or shards, expected int got {type(capacity)} and {type(shards)} instead")
+        if capacity <= 0 or shards <= 0:
+            raise CustomValueError("Incorrect input value for capacity or shards, they must be positive integers")
+        self.capacity = capacity
+        self.shards = shards
+        self._block = None
+        self._connections = []
+        self._processes = []
+
+    def start(self) -> ShardedLeaderboard:
+        """
+        Creates the shared score array and starts one process per shard.
+        Returns:
+        ShardedLeaderboard: The leaderboard itself.
+        """
+        self._block = shared_memory.SharedMemory(create=True, size=self.capacity * 8)
+        self._block.buf[:] = bytes(self.capacity * 8) # every score starts at 0.0
+        for shard in range(self.shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child, self._block.name), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        return self
+
+    def close(self) -> None:
+        """
+        Stops the shard processes and frees the shared score array.
+        """
+        for conn in self._connections:
+            conn.send(('stop', None))
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._connections, self._processes = [], []
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self) -> ShardedLeaderboard:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _check_id(self, runner_id: int) -> None:
+        if not isinstance(runner_id, int):
+            raise CustomTypeError(f"Incorrect input type for runner_id, expected int got {type(runner_id)} instead")
+        if runner_id < 0 or runner_id >= self.capacity:
+            raise CustomKeyError(f"Runner id {runner_id} is outside the leaderboard capacity {self.capacity}")
+
+    def add_points(self, pairs: list[tuple[int, float]]) -> None:
+        """
+        Adds points to runners, a runner with no points yet joins the standings with the added points.
+        The updates are sent to the owning shards in one batch per shard.
+
+        Args:
+        pairs(list):(runner id, points) pairs.
+        """
+        batches = [[] for _ in range(self.shards)]
+        for runner_id, points in pairs:
+            self._check_id(runner_id)
+            batches[runner_id % self.shards].append((runner_id, points))
+        for conn, batch in zip(self._connections, batches):
+            if batch:
+                conn.send(('add', batch))
+
+    def award_race(self, results: list[tuple[int, float]]) -> None:
+        """
+        Awards points for one race: the winner gets one point less than the number of runners,
+        each place after that one point less, and runners that did not finish get 0.
+
+        Args:
+        results(list):(runner id, time taken) pairs, the time is DNF for runners that did not finish.
+        """
+        ordered = sorted(results, key=itemgetter(1))
+        count = len(results)
+        self.add_points([(runner_id, 0 if time_taken == DNF else count - (i + 1))
+                         for i, (runner_id, time_taken) in enumerate(ordered)])
+
+    def _broadcast(self, command: str, argument) -> list:
+        # ask every shard at once and collect the answers, so the shards work in parallel
+        for conn in self._connections:
+            conn.send((command, argument))
+        return [conn.recv() for conn in self._connections]
+
+    def top(self, k: int) -> list[tuple[int, float]]:
+        """
+        Returns the global top-k by merging each shard's top-k, at a cost proportional to k.
+
+        Args:
+        k(int):The number of runners to return.
+        Returns:
+        list: (runner id, score) pairs, best first.
+        """
+        if not isinstance(k, int):
+            raise CustomTypeError(f"Incorrect input type for k, expected int got {type(k)} instead")
+        if k <= 0:
+            return []
+        merged = heapq.merge(*self._broadcast('top', k))
+        return [(runner_id, -negative) for negative, runner_id in islice(merged, k)]
+
+    def score(self, runner_id: int) -> float | None:
+        """
+        Returns the score of a runner, or None if the runner has no points entry yet.
+        """
+        self._check_id(runner_id)
+        conn = self._connections[runner_id % self.shards]
+        conn.send(('score', runner_id))
+        return conn.recv()
+
+    def rank(self, runner_id: int) -> int | None:
+        """
+        Returns the global rank of a runner (1 plus the number of runners with more points),
+        or None if the runner has no points entry yet.
+        """
+        score = self.score(runner_id)
+        if score is None:
+            return None
+        return 1 + sum(self._broadcast('count_above', score))
+
+    def __len__(self) -> int:
+        return sum(self._broadcast('size', None))
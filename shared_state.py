@@ -0,0 +1,175 @@
+from __future__ import annotations
+import math
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+from custom_errors import *
+from race_types import RACE_TYPES, energy_kernel, timed_kernel
+from results import DNF, unpack_results
+from runner import ALL_ENERGY_LOCKS
+
+# Columns of the shared roster, each one float64 per runner
+COLUMNS = ('sprint_speed', 'endurance_speed', 'energy', 'speed', 'time')
+
+def _run_slice(shm_name: str, count: int, start: int, stop: int, distance: float,
+               time_multiplier: float, energy_per_km: int) -> None:
+    """
+    Runs runners start..stop-1 of a race against the shared arrays in place.
+    Follows energy_kernel (timed_kernel when energy_per_km is 0); a DNF is stored in the time column as it is, infinity.
+    """
+    block = shared_memory.SharedMemory(name=shm_name)
+    view = block.buf.cast('d')
+    energy_at = COLUMNS.index('energy') * count
+    speed_at = COLUMNS.index('speed') * count
+    time_at = COLUMNS.index('time') * count
+    kilometres = math.ceil(distance)
+    meters = distance * 1000
+    try:
+        for i in range(start, stop):
+            # the same time as Runner.run_race, multiplied like the kernels do
+            lap_time = round(meters / view[speed_at + i], 2) * time_multiplier
+            if energy_per_km == 0:
+                view[time_at + i] = lap_time
+                continue
+            energy = view[energy_at + i]
+            time_taken = 0
+            for km in range(kilometres):
+                if energy > 0:
+                    time_taken += lap_time
+                    energy = energy - energy_per_km if energy > energy_per_km else 0
+                else:
+                    time_taken = DNF
+                    break
+            view[energy_at + i] = energy
+            view[time_at + i] = time_taken
+    finally:
+        view.release()
+        block.close()
+
+
+class SharedRoster:
+    """
+    Runner speeds and energies kept in one shared memory block, so worker processes can run
+    disjoint slices of a race in place and the parent sees the results without any pickling.
+
+    Attributes:
+    runners(list[Runner]):The runners, in the order of the shared arrays.
+    name(str):The name of the shared memory block.
+
+    Methods:
+    column:Returns a column of the shared arrays.
+    load_runners:Copies speeds and energies from the Runner objects into the shared arrays.
+    store_energies:Copies the shared energies back to the Runner objects.
+    conduct:Conducts a race over the shared arrays using worker processes.
+    close:Frees the shared memory.
+    """
+
+    def __init__(self, runners: list) -> None:
+        """
+        Creates the shared arrays for the given runners and loads their state.
+
+        Args:
+        runners(list[Runner]):The runners of the roster.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'runners' is not a list.
+        """
+        if not isinstance(runners, list):
+            raise CustomTypeError(f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        self.runners = list(runners)
+        self._count = len(self.runners)
+        # a block cannot be empty, so an empty roster still gets one slot
+        self._block = shared_memory.SharedMemory(create=True, size=max(1, len(COLUMNS) * self._count) * 8)
+        self.name = self._block.name
+        self._view = self._block.buf.cast('d')
+        self.load_runners()
+
+    def column(self, name: str) -> memoryview:
+        """
+        Returns a column of the shared arrays.
+        Args:
+        name(str):One of 'sprint_speed', 'endurance_speed', 'energy', 'speed' or 'time'.
+        Returns:
+        memoryview: The float64 values of the column, one per runner. Release it before calling close().
+        """
+        start = COLUMNS.index(name) * self._count
+        return self._view[start:start + self._count]
+
+    def load_runners(self) -> None:
+        """
+        Copies the speeds and energies of the Runner objects into the shared arrays.
+        """
+        for name in ('sprint_speed', 'endurance_speed', 'energy'):
+            self._fill(name, [getattr(runner, name) for runner in self.runners])
+
+    def _fill(self, name: str, values: list) -> None:
+        # one slice assignment per column instead of a write per runner
+        start = COLUMNS.index(name) * self._count
+        self._view[start:start + self._count] = memoryview(array('d', values))
+
+    def store_energies(self) -> None:
+        """
+        Copies the shared energies back to the Runner objects.
+        """
+        energies = self.column('energy')
+        with ALL_ENERGY_LOCKS:
+            for runner, energy in zip(self.runners, energies):
+                runner.energy = int(energy)
+
+    def conduct(self, race, processes: int = None) -> list[tuple]:
+        """
+        Conducts a race of these runners in worker processes, each running a disjoint slice of the field
+        against the shared arrays. The Runner objects' energies are updated afterwards.
+
+        Args:
+        race(Race):A race whose runners are this roster's runners, in the same order.
+        processes(int):The number of worker processes, by default the number of CPUs.
+
+        Returns:
+        list[RaceResult]: The runner and their time taken, DNF if they did not finish, as race.conduct_race() returns.
+
+        Raises:
+        CustomValueError:Error is raised, if the race has other runners or a kernel that cannot run in shared memory.
+        """
+        if len(race.runners) != self._count or any(a is not b for a, b in zip(race.runners, self.runners)):
+            raise CustomValueError("The race runners are not the runners of the shared roster")
+        if race.kernel is not energy_kernel and race.kernel is not timed_kernel:
+            raise CustomValueError(f"Races of type {race.race_type} cannot be run in shared memory")
+        energy_per_km = race.energy_per_km if race.kernel is energy_kernel else 0
+        if any(energy_per_km > runner.max_energy for runner in self.runners):
+            raise CustomValueError("Incorrect input value for drain_points, drain_points must be less then max energy")
+        # the race type decides the speed, it is computed once here so workers only need numbers
+        speed = RACE_TYPES[race.race_type].speed
+        self._fill('speed', [speed(runner) for runner in self.runners])
+
+        processes = max(1, min(processes or os.cpu_count() or 1, self._count))
+        bounds = [self._count * i // processes for i in range(processes + 1)]
+        workers = [multiprocessing.Process(target=_run_slice, args=(self.name, self._count, bounds[i], bounds[i + 1],
+                                           race.distance, race.time_multiplier, energy_per_km))
+                   for i in range(processes) if bounds[i] < bounds[i + 1]]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            if worker.exitcode != 0:
+                raise CustomValueError(f"A race worker failed with exit code {worker.exitcode}")
+        if energy_per_km:
+            self.store_energies()
+        return unpack_results(self.runners, self.column('time'))
+
+    def close(self) -> None:
+        """
+        Frees the shared memory.
+        """
+        if self._block is not None:
+            self._view.release()
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self) -> SharedRoster:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, filterfalse, islice
+from custom_errors import *
+
+# Age groups: a runner belongs to the last group whose lower bound is at most their age
+AGE_GROUP_BOUNDS = (5, 18, 35, 50)
+AGE_GROUP_LABELS = ('U18', '18-34', '35-49', '50+')
+
+def age_group(age: int) -> str:
+    """
+    Returns the label of the age group of an age.
+    """
+    return AGE_GROUP_LABELS[max(0, bisect_right(AGE_GROUP_BOUNDS, age) - 1)]
+
+# Ordinal labels ('1st', '2nd', ...) shared by every leaderboard, extended on demand
+_ORDINALS = []
+_SUFFIXES = {1: 'st', 2: 'nd', 3: 'rd'}
+
+def ordinal_labels(n: int) -> list:
+    """
+    Returns the shared table of ordinal labels, extended so it holds at least n entries.
+
+    Args:
+    n(int):The number of positions that need a label.
+    Returns:
+    list: The label table, where index i holds the label for position i + 1.
+    """
+    # only the missing labels are formatted, older ones are reused as they are
+    for position in range(len(_ORDINALS) + 1, n + 1):
+        if 11 <= position % 100 <= 13:
+            suffix = 'th'
+        else:
+            suffix = _SUFFIXES.get(position % 10, 'th')
+        _ORDINALS.append(f"{position}{suffix}")
+    return _ORDINALS
+
+class RankedBoard:
+    """
+    The standings of one category of runners, sorted by points.
+    Entries are ordered by points, highest first, and runners with equal points keep the order
+    they were added in, the same order as the global leaderboard.
+
+    The sorted entries are held in blocks of at most 2 * BLOCK, so moving a runner only shifts one block,
+    whatever the size of the board. Awarding points only records the change, and the order is brought up to
+    date on the next query: a few changed runners are each moved from block to block, and when a large part
+    of the board changed the changed entries alone are sorted and merged into the unchanged ones.
+    A race therefore costs work in proportion to the runners it awarded, not a sort of the whole board.
+
+    Methods:
+    add:Adds a runner to the board.
+    add_points:Adds points to a runner.
+    top:Returns the best runners and their points.
+    columns:Returns the names and points of every runner, best first.
+    rank:Returns the rank of a runner.
+    points:Returns the points of a runner.
+    """
+
+    BLOCK = 512
+
+    def __init__(self) -> None:
+        # an entry packs -points and the position into one int, (-points << 32) | position,
+        # so entries sort by points, highest first, then position, and compare as cheap ints
+        self._blocks = [] # the entries, best first, as of the last query, cut into sorted blocks
+        self._maxes = [] # the last entry of every block
+        self._keys = {} # name -> the runner's current entry
+        self._names = {} # position -> name
+        self._stale = {} # name -> the entry the blocks still hold for runners whose points changed since
+
+    def add(self, name: str, position: int, points: int = 0) -> None:
+        """
+        Adds a runner to the board.
+
+        Args:
+        name(str):The name of the runner.
+        position(int):The tie-break of the runner, lower comes first among equal points.
+        points(int):The runner's points so far.
+        Raises:
+        RunnerAlreadyExistsError:Error is raised, if the runner is already on the board.
+        """
+        if name in self._keys:
+            raise RunnerAlreadyExistsError(f"Runner {name} is already on the board")
+        if not 0 <= position < 1 << 32 or position in self._names:
+            raise CustomValueError(f"Incorrect input value for position, {position} is taken or out of range")
+        self._settle()
+        entry = self._keys[name] = (-points << 32) | position
+        self._names[position] = name
+        self._insert(entry)
+
+    def add_points(self, name: str, points: int) -> None:
+        """
+        Adds points to a runner.
+        Raises:
+        RunnerDoesntExistError:Error is raised, if the runner is not on the board.
+        """
+        entry = self._keys.get(name)
+        if entry is None:
+            raise RunnerDoesntExistError(f"Runner {name} is not on the board")
+        if points:
+            if name not in self._stale:
+                self._stale[name] = entry
+            self._keys[name] = entry - (points << 32)
+
+    def _insert(self, entry: int) -> None:
+        # put an entry into the block it sorts into, splitting the block when it grows past 2 * BLOCK
+        blocks, maxes = self._blocks, self._maxes
+        if not blocks:
+            blocks.append([entry])
+            maxes.append(entry)
+            return
+        i = min(bisect_left(maxes, entry), len(maxes) - 1)
+        block = blocks[i]
+        insort(block, entry)
+        maxes[i] = block[-1]
+        if len(block) > 2 * self.BLOCK:
+            half = self.BLOCK
+            blocks[i:i + 1] = block[:half], block[half:]
+            maxes[i:i + 1] = block[half - 1], block[-1]
+
+    def _remove(self, entry: int) -> None:
+        # take an entry out of its block, dropping the block once it is empty
+        blocks, maxes = self._blocks, self._maxes
+        i = bisect_left(maxes, entry)
+        block = blocks[i]
+        del block[bisect_left(block, entry)]
+        if block:
+            maxes[i] = block[-1]
+        else:
+            del blocks[i], maxes[i]
+
+    def _settle(self) -> None:
+        # bring the sorted order up to date with the points awarded since the last query
+        stale = self._stale
+        if not stale:
+            return
+        keys = self._keys
+        if len(stale) * 16 < len(keys):
+            for name, old in stale.items():
+                self._remove(old)
+                self._insert(keys[name])
+        else:
+            # drop the old entries in one pass, then sort only the new ones and let the sort merge the two
+            # sorted runs in a linear pass, rather than sorting the whole board
+            old = set(stale.values())
+            settled = list(filterfalse(old.__contains__, chain.from_iterable(self._blocks)))
+            settled += sorted(map(keys.__getitem__, stale))
+            settled.sort()
+            size = self.BLOCK
+            self._blocks = [settled[i:i + size] for i in range(0, len(settled), size)]
+            self._maxes = [block[-1] for block in self._blocks]
+        stale.clear()
+
+    def _entries(self, k: int = None):
+        # the sorted entries, best first, the best k of them if k is given
+        self._settle()
+        entries = chain.from_iterable(self._blocks)
+        return entries if k is None else islice(entries, k)
+
+    def top(self, k: int = None) -> list[tuple[str, int]]:
+        """
+        Returns the best k runners, or every runner when k is None, with their points.
+        """
+        names = self._names
+        return [(names[entry & 0xFFFFFFFF], -(entry >> 32)) for entry in self._entries(k)]
+
+    def columns(self) -> tuple[tuple, list]:
+        """
+        Returns the names of every runner, best first, and their points in the same order.
+        """
+        entries = list(self._entries())
+        names = self._names
+        return tuple([names[entry & 0xFFFFFFFF] for entry in entries]), [-(entry >> 32) for entry in entries]
+
+    def rank(self, name: str) -> int:
+        """
+        Returns the 1-based place of a runner on the board.
+        """
+        entry = self._keys.get(name)
+        if entry is None:
+            raise RunnerDoesntExistError(f"Runner {name} is not on the board")
+        self._settle()
+        i = bisect_left(self._maxes, entry)
+        return sum(map(len, self._blocks[:i])) + bisect_left(self._blocks[i], entry) + 1
+
+    def points(self, name: str) -> int:
+        """
+        Returns the points of a runner on the board.
+        """
+        entry = self._keys.get(name)
+        if entry is None:
+            raise RunnerDoesntExistError(f"Runner {name} is not on the board")
+        return -(entry >> 32)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+
+class Standings:
+    """
+    An immutable snapshot of the overall standings, published by Competition after every leaderboard update.
+    A new snapshot is built for every update and swapped in as a whole, so a reader holding one never
+    sees it change and never needs a lock.
+
+    Attributes:
+    version(int):The number of the snapshot, increased by one with every leaderboard update.
+    names(tuple[str]):The runner names, best first.
+    points(array):The points of the runners, in the same order.
+    field(int):The number of runners in the latest race, None if not known.
+
+    Methods:
+    top:Returns the best runners and their points.
+    leaderboard:Returns the standings as an ordinal dict like Competition.leaderboard.
+    """
+
+    __slots__ = ('version', 'names', 'points', 'field')
+
+    def __init__(self, version: int, names: tuple, points: array, field: int = None) -> None:
+        self.version = version
+        self.names = names
+        self.points = points
+        self.field = field
+
+    def top(self, k: int = None) -> list[tuple[str, int]]:
+        """
+        Returns the best k runners, or every runner when k is None, with their points.
+        """
+        names, points = (self.names, self.points) if k is None else (self.names[:k], self.points[:k])
+        return list(zip(names, points))
+
+    def leaderboard(self, size: int = None) -> dict:
+        """
+        Returns the standings as a dict of ordinal position to (runner name, points).
+
+        Args:
+        size(int):The number of positions of the competition. As Competition.leaderboard always has,
+        positions from the size of the latest race up to 'size' are set to None.
+        Returns:
+        dict: The ordinal leaderboard.
+        """
+        labels = ordinal_labels(max(len(self.names), size or 0))
+        board = dict(zip(labels, zip(self.names, self.points)))
+        if size is not None and self.field is not None:
+            for i in range(self.field, size):
+                board[labels[i]] = None
+        return board
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> tuple[str, int]:
+        return self.names[i], self.points[i]
@@ -0,0 +1,262 @@
+from __future__ import annotations
+import math
+import multiprocessing
+import os
+from array import array
+from custom_errors import *
+from race_types import RACE_TYPES
+from runner import Runner
+from schedule import Schedule
+
+# Energy conduct_competition gives back to a runner that did not finish a marathon, which Runner.recover_energy
+# rejects when max_energy is lower, so lower maximum energies are rejected here as well
+DNF_RECOVERY = 1000
+
+# Columns of a sweep table
+COLUMNS = ('time_multiplier', 'energy_per_km', 'max_energy', 'dnf_rate', 'rank_stability', 'leader', 'mean_short_time')
+
+class SweepModel:
+    """
+    The parts of a competition that do not depend on the swept parameters, computed once and shared by every grid point.
+
+    A short race's places only depend on the sprint speeds, since the time multiplier scales every time alike,
+    so the points of all short races are summed once. The places of every marathon are sorted once too; a grid point
+    only has to follow the energies through the rounds to find who does not finish, then walk each marathon's places.
+    The rules are those of Competition.conduct_competition: short races drain no energy, a marathon drains
+    energy_per_km per kilometre started with energy left, and a runner that does not finish gets 0 points
+    and recovers DNF_RECOVERY energy.
+
+    Attributes:
+    names(tuple):The runner names.
+    rounds(int):The number of rounds.
+    short_points(array):Every runner's points from all short races.
+    base_short_time(float):The mean short race time before the time multiplier, over every runner and round.
+    baseline(list[int]):Every runner's place at the current settings of the race types and Runner.max_energy.
+
+    Methods:
+    evaluate:Returns every runner's points and the number of DNFs for an energy_per_km and max_energy.
+    summary:Returns the DNF rate, the rank stability and the leader for an energy_per_km and max_energy.
+    """
+
+    def __init__(self, runners: list, schedule: Schedule, start_energy: list = None) -> None:
+        """
+        Initializes a SweepModel.
+
+        Args:
+        runners(list[Runner]):The runners.
+        schedule(Schedule):The rounds and distances of the competition.
+        start_energy(list[float]):Every runner's energy at the start as a fraction of max_energy, by default all 1.0.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'runners' is not a list or 'schedule' is not a Schedule.
+        CustomValueError:Error is raised, if 'start_energy' does not have one fraction between 0 and 1 per runner.
+        """
+        if not isinstance(runners, list):
+            raise CustomTypeError(f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        if not isinstance(schedule, Schedule):
+            raise CustomTypeError(f"Incorrect input type for schedule, expected Schedule got {type(schedule)} instead")
+        count = len(runners)
+        if start_energy is None:
+            start_energy = [1.0] * count
+        if len(start_energy) != count or any(not 0 <= fraction <= 1 for fraction in start_energy):
+            raise CustomValueError("Incorrect input value for start_energy, expected a fraction between 0 and 1 per runner")
+        self.names = tuple(runner.name for runner in runners)
+        self.rounds = schedule.rounds
+        self.start_energy = array('d', start_energy)
+        short, long = RACE_TYPES['short'], RACE_TYPES['long']
+        sprint = [short.speed(runner) for runner in runners]
+        endurance = [long.speed(runner) for runner in runners]
+
+        self.short_points = array('q', bytes(8 * count))
+        total_time = 0.0
+        for distance in schedule.distances_short:
+            # the same time as Runner.run_race
+            times = [round(distance * 1000 / speed, 2) for speed in sprint]
+            total_time += sum(times)
+            for place, i in enumerate(sorted(range(count), key=times.__getitem__)):
+                self.short_points[i] += count - (place + 1)
+        self.base_short_time = total_time / (count * self.rounds) if count else 0.0
+
+        # every marathon's runner indexes in finishing order and its number of kilometres
+        self.marathons = []
+        for distance in schedule.distances_marathon:
+            times = [round(distance * 1000 / speed, 2) for speed in endurance]
+            self.marathons.append((array('l', sorted(range(count), key=times.__getitem__)), math.ceil(distance)))
+        self.baseline = ranks(self.evaluate(long.energy_per_km, Runner.max_energy)[0])
+        self._all_finished = None # the summary shared by every grid point without a DNF, once one is seen
+
+    def evaluate(self, energy_per_km: int, max_energy: int) -> tuple[array, int]:
+        """
+        Returns every runner's points and the number of marathon DNFs for one energy_per_km and max_energy.
+        Raises:
+        CustomValueError:Error is raised, if 'max_energy' is below DNF_RECOVERY, which a competition cannot run with.
+        """
+        if max_energy < DNF_RECOVERY:
+            raise CustomValueError(f"Incorrect input value for max_energy, {max_energy} is below the DNF recovery of {DNF_RECOVERY}")
+        count = len(self.names)
+        points = array('q', self.short_points)
+        energies = [fraction * max_energy for fraction in self.start_energy]
+        recovery = DNF_RECOVERY
+        dnfs = 0
+        for order, kilometres in self.marathons:
+            # a runner needs energy left at the start of the last kilometre, and finishes with what is left after it
+            needed = (kilometres - 1) * energy_per_km
+            drain = kilometres * energy_per_km
+            finished = [energy > needed for energy in energies]
+            place = 0
+            for i in order:
+                if finished[i]:
+                    points[i] += count - (place + 1)
+                    place += 1
+            dnfs += count - place
+            energies = [(energy - drain if energy > drain else 0) if done else recovery
+                        for energy, done in zip(energies, finished)]
+        return points, dnfs
+
+    def summary(self, energy_per_km: int, max_energy: int) -> tuple[float, float, str]:
+        """
+        Returns the share of marathon starts that did not finish, the rank correlation of the final standings
+        with the baseline standings and the name of the leader, for one energy_per_km and max_energy.
+        """
+        points, dnfs = self.evaluate(energy_per_km, max_energy)
+        if not points:
+            return 0.0, 1.0, None
+        if dnfs == 0 and self._all_finished is not None:
+            # when everyone finishes every race the standings are the same whatever the parameters
+            return self._all_finished
+        standing = ranks(points)
+        summary = dnfs / (len(points) * self.rounds), rank_correlation(standing, self.baseline), self.names[standing.index(0)]
+        if dnfs == 0:
+            self._all_finished = summary
+        return summary
+
+
+def ranks(points) -> list[int]:
+    """
+    Returns every runner's 0-based place in standings of the given points, ties kept in runner order like Competition.
+    """
+    result = [0] * len(points)
+    for place, i in enumerate(sorted(range(len(points)), key=points.__getitem__, reverse=True)):
+        result[i] = place
+    return result
+
+def rank_correlation(a: list, b: list) -> float:
+    """
+    Returns the Spearman rank correlation of two rankings of the same runners, 1.0 when they are the same.
+    """
+    count = len(a)
+    if count < 2:
+        return 1.0
+    squares = sum((x - y) * (x - y) for x, y in zip(a, b))
+    return 1.0 - 6.0 * squares / (count * (count * count - 1))
+
+
+class SweepTable:
+    """
+    The summary of a sweep, one row per grid point in the order of COLUMNS:
+    the parameters, the share of marathon starts that did not finish, the rank correlation of the final standings
+    with the standings at the baseline parameters, the name of the leader and the mean short race time.
+
+    Attributes:
+    columns(tuple):The column names.
+    rows(list[tuple]):The rows.
+
+    Methods:
+    column:Returns the values of one column.
+    format:Returns the table as aligned text.
+    """
+
+    def __init__(self, rows: list) -> None:
+        self.columns = COLUMNS
+        self.rows = rows
+
+    def column(self, name: str) -> list:
+        """
+        Returns the values of one column.
+        Raises:
+        CustomKeyError:Error is raised, if there is no such column.
+        """
+        if name not in self.columns:
+            raise CustomKeyError(f"Unknown column {name}, expected one of {', '.join(self.columns)}")
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+
+    def format(self, limit: int = None) -> str:
+        """
+        Returns the table, or its first 'limit' rows, as aligned text.
+        """
+        cells = [self.columns] + [tuple(f"{value:.4g}" if isinstance(value, float) else str(value) for value in row)
+                                  for row in self.rows[:limit]]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(self.columns))]
+        return '\n'.join('  '.join(value.rjust(width) for value, width in zip(row, widths)) for row in cells)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+_MODEL = None # the model of a worker process, set once by _init_worker
+
+def _init_worker(model: SweepModel) -> None:
+    global _MODEL
+    _MODEL = model
+
+def _summarize(point: tuple) -> tuple:
+    # the summary of one (energy_per_km, max_energy) point in a worker, only the summary is sent back
+    return point, _MODEL.summary(*point)
+
+def _check_grid(name: str, values: list, kind: type, positive: bool) -> None:
+    if not isinstance(values, list) or not values:
+        raise CustomTypeError(f"Incorrect input type for {name}, expected a non-empty list got {type(values)} instead")
+    for value in values:
+        if not isinstance(value, kind):
+            raise CustomTypeError(f"Incorrect input type for {name}, expected {kind.__name__} got {type(value)} instead")
+        if value < 0 or (positive and value == 0):
+            raise CustomValueError(f"Incorrect input value for {name}, {value} is out of range")
+
+def sweep(runners: list, schedule: Schedule, time_multipliers: list, energies_per_km: list, max_energies: list,
+          start_energy: list = None, processes: int = None) -> SweepTable:
+    """
+    Evaluates a competition over every combination of the short race time multiplier, the marathon energy per
+    kilometre and the runners' maximum energy.
+
+    The time multiplier only scales the short race times, so it changes the mean_short_time column and no place:
+    the standings are only worked out once per (energy_per_km, max_energy) pair and shared by every time multiplier. The pairs are spread over worker processes,
+    each of which receives the shared SweepModel once.
+
+    Args:
+    runners(list[Runner]):The runners.
+    schedule(Schedule):The rounds and distances of the competition.
+    time_multipliers(list[float]):The short race time multipliers to try, which only scale the mean short race time.
+    energies_per_km(list[int]):The marathon energies per kilometre to try.
+    max_energies(list[int]):The maximum energies to try, at least DNF_RECOVERY.
+    start_energy(list[float]):Every runner's energy at the start as a fraction of max_energy, by default all 1.0.
+    processes(int):The number of worker processes, by default the number of CPUs, 1 to evaluate in this process.
+    Returns:
+    SweepTable: One row per grid point, by time multiplier, then energy per kilometre, then maximum energy, in the order given.
+    Raises:
+    CustomTypeError:Error is raised, if a grid is not a non-empty list of the right type.
+    CustomValueError:Error is raised, if a grid value is negative, zero for a time multiplier or below DNF_RECOVERY
+    for a maximum energy.
+    """
+    _check_grid('time_multipliers', time_multipliers, float, True)
+    _check_grid('energies_per_km', energies_per_km, int, False)
+    _check_grid('max_energies', max_energies, int, True)
+    for max_energy in max_energies:
+        if max_energy < DNF_RECOVERY:
+            raise CustomValueError(f"Incorrect input value for max_energies, {max_energy} is below the DNF recovery of {DNF_RECOVERY}")
+    model = SweepModel(runners, schedule, start_energy)
+    pairs = sorted({(energy_per_km, max_energy) for energy_per_km in energies_per_km for max_energy in max_energies})
+    processes = max(1, min(processes or os.cpu_count() or 1, len(pairs)))
+    if processes == 1:
+        summary = {point: model.summary(*point) for point in pairs}
+    else:
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(model,)) as pool:
+            summary = dict(pool.map(_summarize, pairs, chunksize=max(1, len(pairs) // (processes * 4))))
+    rows = []
+    for time_multiplier in time_multipliers:
+        short_time = model.base_short_time * time_multiplier
+        for energy_per_km in energies_per_km:
+            for max_energy in max_energies:
+                dnf_rate, stability, leader = summary[(energy_per_km, max_energy)]
+                rows.append((time_multiplier, energy_per_km, max_energy, dnf_rate, stability, leader, short_time))
+    return SweepTable(rows)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+import copy
+import random
+from abc import ABC, abstractmethod
+from array import array
+from itertools import repeat
+from custom_errors import *
+from runner import Runner
+
+# Valid ranges of the generated fields, the ones Runner.__init__ accepts
+AGE_RANGE = (5, 120)
+SPRINT_RANGE = (2.2, 6.8)
+ENDURANCE_RANGE = (1.8, 5.4)
+
+# Runners are generated this many at a time, so no list of the whole field is ever built
+CHUNK = 1 << 16
+
+class Distribution(ABC):
+    """
+    The distribution of a generated field, drawn within the bounds of the field.
+    generate checks every chunk a distribution returns, so a custom one cannot produce invalid runners.
+
+    Methods:
+    sample:Returns values drawn within the bounds.
+    integers:Returns whole numbers drawn within the bounds.
+    """
+
+    @abstractmethod
+    def sample(self, rng: random.Random, count: int, low: float, high: float) -> list[float]:
+        """
+        Returns 'count' values between low and high.
+        """
+        pass
+
+    def integers(self, rng: random.Random, count: int, low: int, high: int) -> list[int]:
+        """
+        Returns 'count' whole numbers from low to high, both included.
+        """
+        # values over [low, high + 1) cut to whole numbers
+        return [min(high, int(value)) for value in self.sample(rng, count, low, high + 1)]
+
+
+class Uniform(Distribution):
+    """
+    Values spread evenly between the bounds.
+    """
+
+    def sample(self, rng: random.Random, count: int, low: float, high: float) -> list[float]:
+        draw, span = rng.random, high - low
+        return [low + span * draw() for _ in repeat(None, count)]
+
+    def integers(self, rng: random.Random, count: int, low: int, high: int) -> list[int]:
+        draw, span = rng.random, high - low + 1
+        return [low + int(span * draw()) for _ in repeat(None, count)]
+
+
+class Normal(Distribution):
+    """
+    Normally distributed values, clipped to the bounds.
+
+    Attributes:
+    mean(float):The mean, by default the middle of the bounds.
+    sd(float):The standard deviation, by default a sixth of the bounds' width.
+    """
+
+    def __init__(self, mean: float = None, sd: float = None) -> None:
+        if sd is not None and sd <= 0:
+            raise CustomValueError("Incorrect input value for sd, sd must be positive")
+        self.mean = mean
+        self.sd = sd
+
+    def sample(self, rng: random.Random, count: int, low: float, high: float) -> list[float]:
+        draw = rng.gauss
+        mean = (low + high) / 2 if self.mean is None else self.mean
+        sd = (high - low) / 6 if self.sd is None else self.sd
+        return [min(high, max(low, draw(mean, sd))) for _ in repeat(None, count)]
+
+
+class Triangular(Distribution):
+    """
+    Values between the bounds, most of them near the mode.
+
+    Attributes:
+    mode(float):The most likely value, by default the middle of the bounds.
+    """
+
+    def __init__(self, mode: float = None) -> None:
+        self.mode = mode
+
+    def sample(self, rng: random.Random, count: int, low: float, high: float) -> list[float]:
+        draw = rng.triangular
+        mode = (low + high) / 2 if self.mode is None else min(high, max(low, self.mode))
+        return [draw(low, high, mode) for _ in repeat(None, count)]
+
+
+class RosterColumns:
+    """
+    A roster kept as columns: one array per field and a country code per runner instead of a Runner object each,
+    about 19 bytes per runner. Names are not stored, runner i is called prefix + str(i).
+
+    Attributes:
+    prefix(str):The start of every runner name.
+    countries(tuple[str]):The country names, countries[code] is the country of a code.
+    country(array):The country code of every runner.
+    age(array):The age of every runner.
+    sprint_speed(array):The sprint speed of every runner.
+    endurance_speed(array):The endurance speed of every runner.
+
+    Methods:
+    name:Returns the name of a runner.
+    runners:Returns Runner objects for a range of runners.
+    """
+
+    def __init__(self, prefix: str, countries: tuple) -> None:
+        self.prefix = prefix
+        self.countries = countries
+        self.country = array('H')
+        self.age = array('B')
+        self.sprint_speed = array('d')
+        self.endurance_speed = array('d')
+
+    def name(self, i: int) -> str:
+        """
+        Returns the name of runner i.
+        """
+        return f"{self.prefix}{i}"
+
+    def runners(self, start: int = 0, stop: int = None) -> list:
+        """
+        Returns Runner objects for runners start to stop - 1, by default all of them.
+        Every value was drawn within the ranges Runner accepts, so the runners are copied from one validated
+        template instead of validating each of them again.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        template = Runner(self.name(0), AGE_RANGE[0], self.countries[0], SPRINT_RANGE[0], ENDURANCE_RANGE[0])
+        countries = self.countries
+        result = []
+        for i in range(start, stop):
+            runner = copy.copy(template)
+            runner.name = self.name(i)
+            runner.age = self.age[i]
+            runner.country = countries[self.country[i]]
+            runner.sprint_speed = self.sprint_speed[i]
+            runner.endurance_speed = self.endurance_speed[i]
+            result.append(runner)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+
+def _checked(values: list, count: int, low: float, high: float, field: str, whole: bool = False) -> list:
+    # the values a distribution drew for one chunk, checked against the range Runner accepts with a few
+    # whole-chunk passes; a NaN makes the sum NaN, which no comparison with the bounds would catch
+    if len(values) != count:
+        raise CustomValueError(f"Incorrect distribution for {field}, expected {count} values got {len(values)}")
+    if whole and not set(map(type, values)) <= {int}:
+        raise CustomTypeError(f"Incorrect distribution for {field}, expected whole numbers")
+    if values:
+        total = sum(values)
+        if total != total or min(values) < low or max(values) > high:
+            raise CustomValueError(f"Incorrect distribution for {field}, values must be between {low} and {high}")
+    return values
+
+def generate(count: int, seed: int = 0, age: Distribution = None, sprint_speed: Distribution = None,
+             endurance_speed: Distribution = None, country_weights: dict = None, prefix: str = 'Runner') -> RosterColumns:
+    """
+    Generates a roster of valid runners, the same one for the same arguments.
+
+    Args:
+    count(int):The number of runners.
+    seed(int):The random seed.
+    age(Distribution):The distribution of ages within 5-120, by default Uniform().
+    sprint_speed(Distribution):The distribution of sprint speeds within 2.2-6.8, by default Uniform().
+    endurance_speed(Distribution):The distribution of endurance speeds within 1.8-5.4, by default Uniform().
+    country_weights(dict):Country name mapped to its relative weight, by default every country of
+    Runner.valid_countries() is equally likely.
+    prefix(str):The start of every runner name, letters only.
+    Returns:
+    RosterColumns: The generated roster.
+    Raises:
+    CustomTypeError:Error is raised, if an argument has the wrong type.
+    CustomValueError:Error is raised, if count is negative, a weight is negative, a country is not in the csv
+    or a distribution draws values outside the range of its field.
+    """
+    if not isinstance(count, int):
+        raise CustomTypeError(f"Incorrect input type for count, expected int got {type(count)} instead")
+    if count < 0:
+        raise CustomValueError("Incorrect input value for count, count cannot be negative")
+    if not isinstance(prefix, str) or not prefix.isalpha():
+        raise CustomValueError("Incorrect input value for prefix, prefix must be letters only")
+    distributions = [Uniform() if d is None else d for d in (age, sprint_speed, endurance_speed)]
+    for distribution in distributions:
+        if not isinstance(distribution, Distribution):
+            raise CustomTypeError(f"Incorrect input type for a distribution, expected Distribution got {type(distribution)} instead")
+    age, sprint_speed, endurance_speed = distributions
+    if country_weights is None:
+        countries, cumulative = tuple(sorted(Runner.valid_countries())), None
+    else:
+        if not isinstance(country_weights, dict) or not country_weights:
+            raise CustomTypeError(f"Incorrect input type for country_weights, expected a non-empty dict got {type(country_weights)} instead")
+        unknown = set(country_weights) - Runner.valid_countries()
+        if unknown:
+            raise CustomValueError(f"Incorrect input value for country_weights, {', '.join(sorted(unknown))} not present in the provided csv")
+        if any(weight < 0 for weight in country_weights.values()) or not sum(country_weights.values()) > 0:
+            raise CustomValueError("Incorrect input value for country_weights, weights cannot be negative and must not all be 0")
+        countries = tuple(country_weights)
+        cumulative, total = [], 0
+        for weight in country_weights.values():
+            total += weight
+            cumulative.append(total)
+
+    rng = random.Random(seed)
+    roster = RosterColumns(prefix, countries)
+    codes = range(len(countries))
+    for done in range(0, count, CHUNK):
+        size = min(CHUNK, count - done)
+        roster.age.extend(_checked(age.integers(rng, size, *AGE_RANGE), size, *AGE_RANGE, 'age', whole=True))
+        roster.sprint_speed.extend(_checked(sprint_speed.sample(rng, size, *SPRINT_RANGE), size, *SPRINT_RANGE, 'sprint_speed'))
+        roster.endurance_speed.extend(_checked(endurance_speed.sample(rng, size, *ENDURANCE_RANGE), size, *ENDURANCE_RANGE, 'endurance_speed'))
+        if cumulative is None:
+            roster.country.extend(Uniform().integers(rng, size, 0, len(countries) - 1))
+        else:
+            roster.country.extend(rng.choices(codes, cum_weights=cumulative, k=size))
+    return roster
@@ -1,9 +1,31 @@
+import argparse
+import sys
 from competition import Competition
 from runner import Runner
 from custom_errors import CustomTypeError, CustomValueError, CustomAttributeError
 from race import Race, ShortRace, MarathonRace
+from validation import build_runners
 
 
+def convert_runner(runner_name: str, runner_age: str, runner_country: str, sprint_speed: str, endurance_speed: str)-> Runner:
+    """
+    Converts the given text fields to the appropriate types and creates a runner object.
+
+    Args:
+    runner_name (str): The name of the runner.
+    runner_age (str): The age of the runner.
+    runner_country (str): The country of the runner.
+    sprint_speed (str): The sprint speed of the runner.
+    endurance_speed (str): The endurance speed of the runner.
+
+    Returns:
+    Runner: Runner object.
+
+    Raises:
+    CustomTypeError, CustomValueError, ValueError: Error is raised, if a field cannot be converted or is invalid.
+    """
+    return Runner(str(runner_name).strip(), int(runner_age), runner_country.strip(), float(sprint_speed), float(endurance_speed))
+
 def create_runner(runner_name: str, runner_age: str, runner_country: str, sprint_speed: str, endurance_speed: str)-> Runner:
     """
     Create a runner object.
@@ -19,13 +41,8 @@ def create_runner(runner_name: str, runner_age: str, runner_country: str, sprint
     Runner: Runner object.
     """
     try:
-        # Try to convert input values to appropriate types unless an error is raised
-        runner_name=str(runner_name)
-        runner_age=int(runner_age)
-        sprint_speed=float(sprint_speed)
-        endurance_speed=float(endurance_speed)
-        # Create and return the Runner object
-        return Runner(runner_name.strip(), runner_age, runner_country.strip(), sprint_speed, endurance_speed)
+        # Try to convert input values to appropriate types and create the Runner object unless an error is raised
+        return convert_runner(runner_name, runner_age, runner_country, sprint_speed, endurance_speed)
     # give exception when an error of any kind is raised
     except (CustomTypeError, CustomValueError,ValueError) as e:
         print(f"Error creating runner: {e}")
@@ -103,7 +120,108 @@ def competition_information(runners)-> Competition:
         print("ERROR : Incorrect number of fields:Please enter all the fields") # give error if there are incorrect number of fields
     return competition_info
 
-def main():
+def read_fields(stream, errors)-> list:
+    """
+    Streams runner lines in the name/age/country/sprint/endurance format and groups them into fields.
+    A blank line ends the current field, so one stream can hold many competitions.
+    The lines of a field are validated together when it ends, and every problem of a bad line is reported.
+
+    Args:
+    stream: Text stream (file or stdin) with one runner per line.
+    errors: Text stream that bad lines are reported to.
+
+    Yields:
+    list: List of Runner objects for each field.
+    """
+    rows, line_numbers, problems = [], [], []
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line: # a blank line closes the field that has been read so far
+            runners = _close_field(rows, line_numbers, problems, errors)
+            if runners:
+                yield runners
+            rows, line_numbers, problems = [], [], []
+            continue
+        fields = line.split('/')
+        if len(fields) != 5: # check if number of entered fields meets the given brief
+            problems.append((line_number, "ERROR : Incorrect number of fields"))
+            continue
+        rows.append(fields)
+        line_numbers.append(line_number)
+    runners = _close_field(rows, line_numbers, problems, errors)
+    if runners:
+        yield runners
+
+def _close_field(rows: list, line_numbers: list, problems: list, errors)-> list:
+    # the rows of a field are validated in one batch, so bad lines are reported without raising per line
+    runners, report = build_runners(rows, text=True)
+    problems.extend((line_numbers[error.row], f"Error creating runner: {error.message}") for error in report)
+    problems.sort(key=lambda problem: problem[0])
+    for line_number, message in problems:
+        errors.write(f"line {line_number}: {message}\n")
+    return runners
+
+def parse_competition(comp_info: str)-> tuple:
+    """
+    Splits competition information given as rounds/short distances/long distances.
+
+    Args:
+    comp_info (str): Rounds and distances, fields separated by '/' and distances by ','.
+
+    Returns:
+    tuple: rounds, distances for short races and distances for long races.
+
+    Raises:
+    ValueError: Error is raised, if the fields are missing or cannot be converted.
+    """
+    fields = comp_info.split('/')
+    if len(fields) != 3: # checks if the number of fields meets the given brief
+        raise ValueError("Incorrect number of fields for the competition")
+    rounds, distances_short, distances_long = fields
+    return int(rounds), [float(d) for d in distances_short.split(',')], [float(d) for d in distances_long.split(',')]
+
+def run_batch(stream, comp_info: str, output, errors)-> int:
+    """
+    Runs one competition per field read from the stream and writes each leaderboard as a JSON line.
+
+    Args:
+    stream: Text stream with the runner lines.
+    comp_info (str): Rounds and distances shared by every competition.
+    output: Text stream the JSON leaderboards are written to.
+    errors: Text stream that errors are reported to.
+
+    Returns:
+    int: The number of competitions that could not be conducted.
+    """
+    import json # only the batch mode needs it
+    rounds, distances_short, distances_long = parse_competition(comp_info)
+    failed = 0
+    for runners in read_fields(stream, errors):
+        try:
+            # every competition gets its own copy of the distances since the lists are stored as they are
+            comp = Competition(runners, rounds, list(distances_short), list(distances_long))
+            leaderboard = comp.conduct_competition()
+        except (CustomTypeError, CustomValueError, CustomAttributeError) as e:
+            errors.write(f"Error creating competition: {e}\n")
+            failed += 1
+            continue
+        output.write(json.dumps(leaderboard))
+        output.write('\n')
+    return failed
+
+def build_parser()-> argparse.ArgumentParser:
+    """
+    Builds the command line parser.
+
+    Returns:
+    argparse.ArgumentParser: Parser for the task4 command line.
+    """
+    parser = argparse.ArgumentParser(description="Conduct runner competitions. Without arguments the runners are asked for interactively.")
+    parser.add_argument('input', nargs='?', help="file with one name/age/country/sprint/endurance line per runner, '-' for stdin; blank lines separate competitions")
+    parser.add_argument('-c', '--competition', help="rounds/short distances/long distances, e.g. 3/0.5,0.6,1.2/4.0,9.0,4.5")
+    return parser
+
+def interactive_main():
         runners=runner_information() # call runner_information function 
         if len(runners)==0: #if no runners are provided then program will end as there will be no competition
             print("No runners provided so no competition will take place.")
@@ -117,6 +235,36 @@ def main():
             except (AttributeError) as e: # give exception if an error occurs 
                 continue # repeat the loop if an error occurs so that user enters competition details again
 
+def main(argv: list = None)-> int:
+    """
+    Entry point, runs in batch mode when a competition is given on the command line and interactively otherwise.
+
+    Args:
+    argv (list): Command line arguments, by default the ones given to the program.
+
+    Returns:
+    int: Exit status.
+    """
+    args = build_parser().parse_args(argv)
+    if args.competition is None:
+        if args.input is not None:
+            build_parser().error("--competition is required when an input is given")
+        interactive_main()
+        return 0
+    try:
+        if args.input is None or args.input == '-':
+            failed = run_batch(sys.stdin, args.competition, sys.stdout, sys.stderr)
+        else:
+            with open(args.input, 'r') as stream:
+                failed = run_batch(stream, args.competition, sys.stdout, sys.stderr)
+    except ValueError as e:
+        sys.stderr.write(f"Error creating competition: {e}\n")
+        return 2
+    except OSError as e: # the input file is missing or cannot be read
+        sys.stderr.write(f"Error reading input: {e}\n")
+        return 2
+    return 1 if failed else 0
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
 
@@ -0,0 +1,66 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from bracket import KnockoutBracket
+from synthetic import generate
+
+class TestKnockoutBracket(unittest.TestCase):
+
+    def test_stages(self):
+        """
+        Testing that 100 entrants go through heats, quarter-finals, semi-finals and a final
+        """
+        runners = generate(100).runners()
+        stages = KnockoutBracket(runners, 0.4).run()
+        self.assertEqual([stage.name for stage in stages], ['heats', 'quarter-finals', 'semi-finals', 'final'])
+        # 13 heats send 26 by place and 2 fastest losers through
+        self.assertEqual((stages[0].heats, len(stages[0].qualified)), (13, 28))
+        self.assertLessEqual(stages[-1].entrants, 8)
+        fastest = max(runners, key=lambda runner: runner.sprint_speed)
+        self.assertIs(stages[-1].qualified[0], fastest)
+        self.assertEqual(stages[-1].times, sorted(stages[-1].times))
+
+    def test_fastest_losers(self):
+        """
+        Testing that the heat winners go through with the fastest runners that did not win their heat
+        """
+        runners = generate(40, seed=4).runners()
+        field = sorted(runners, key=lambda runner: -runner.sprint_speed)
+        bracket = KnockoutBracket(runners, 0.4, advance_by_place=1, fastest_losers=3)
+        heats, qualified, times = bracket._run_stage(field)
+        self.assertEqual(heats, 5)
+        winners, losers = [], []
+        for heat in range(5):
+            heat_field = sorted(field[heat::5], key=lambda runner: runner.run_race('short', 0.4))
+            winners.append(heat_field[0])
+            losers.extend(heat_field[1:])
+        losers.sort(key=lambda runner: runner.run_race('short', 0.4))
+        self.assertEqual(set(map(id, qualified)), set(map(id, winners + losers[:3])))
+        self.assertEqual(times, sorted(times))
+
+    def test_seeding(self):
+        """
+        Testing that the opening stage is seeded by sprint speed whatever order the runners were entered in
+        """
+        runners = generate(40, seed=5).runners()
+        slowest_first = sorted(runners, key=lambda runner: runner.sprint_speed)
+        bracket = KnockoutBracket(slowest_first, 0.4)
+        fields = [] # the field every stage is dealt out from
+        run_stage = bracket._run_stage
+        bracket._run_stage = lambda field: fields.append(field) or run_stage(field)
+        bracket.run()
+        self.assertEqual(fields[0], sorted(runners, key=lambda runner: -runner.sprint_speed))
+
+    def test_small_field_is_a_final(self):
+        stages = KnockoutBracket(generate(5).runners(), 0.4).run()
+        self.assertEqual(len(stages), 1)
+        self.assertEqual(stages[0].name, 'final')
+
+    def test_invalid_settings(self):
+        with self.assertRaises(CustomTypeError):
+            KnockoutBracket(generate(5).runners(), 1)
+        with self.assertRaises(CustomValueError):
+            KnockoutBracket(generate(5).runners(), 0.4, advance_by_place=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
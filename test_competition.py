@@ -1,8 +1,11 @@
+import random
+import threading
 import unittest
 from competition import Competition
 from runner import Runner
-from custom_errors import CustomTypeError, CustomValueError
+from custom_errors import CustomTypeError, CustomValueError, CustomKeyError, RunnerDoesntExistError
 from race import Race, ShortRace, MarathonRace
+from results import DNF
 
 class SimpleShortRace(ShortRace):
     """A simple race implementation to simulate ShortRace"""
@@ -258,7 +261,7 @@ class TestCompetition(unittest.TestCase):
         """
         race_results = [
             (self.runners[0], 20.0),
-            (self.runners[1], 'DNF'),  
+            (self.runners[1], DNF),  
             (self.runners[2], 19.0),
             (self.runners[3], 4.0),
             (self.runners[4], 8.0)
@@ -345,6 +348,149 @@ class TestCompetition(unittest.TestCase):
         with self.assertRaises(CustomValueError):
             Competition(self.runners, 3, [1.5], [2.5, 16.0])
 
+    def test_submit_results_concurrently(self):
+        """
+        Stress test: many threads submit results at once and the final standings match applying them one by one
+        """
+        rng = random.Random(7)
+        races = [[(runner, rng.choice([rng.uniform(5.0, 50.0), DNF])) for runner in self.runners] for _ in range(800)]
+        expected = Competition(self.runners, 3, self.distances_short, self.distances_marathon)
+        for results in races:
+            expected.update_leaderboard(results)
+
+        start = threading.Barrier(8)
+        def producer(chunk):
+            start.wait()
+            for results in chunk:
+                self.competition.submit_results(results)
+        threads = [threading.Thread(target=producer, args=(races[i::8],)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.competition.flush_results()
+
+        self.assertEqual(self.competition.intial_leaderboard, expected.intial_leaderboard)
+        self.assertEqual(self.competition.leaderboard, expected.leaderboard)
+
+    def test_category_leaderboards(self):
+        """
+        Testing that the country and age group standings match filtering the global standings
+        """
+        rng = random.Random(11)
+        for _ in range(50):
+            self.competition.update_leaderboard([(runner, rng.choice([rng.uniform(5.0, 50.0), DNF])) for runner in self.runners])
+        overall = sorted(self.competition.intial_leaderboard.items(), key=lambda x: x[1], reverse=True)
+        teens = {runner.name for runner in self.runners if runner.age < 18}
+        self.assertEqual(self.competition.category_leaderboard('age_group', 'U18'), [entry for entry in overall if entry[0] in teens])
+        self.assertEqual(self.competition.category_leaderboard('age_group', '18-34', 1), [entry for entry in overall if entry[0] in ('Elijah', 'Chloe')][:1])
+        self.assertEqual(self.competition.category_leaderboard('country', 'France'), [('Phoebe', self.competition.intial_leaderboard['Phoebe'])])
+        with self.assertRaises(CustomKeyError):
+            self.competition.category_leaderboard('country', 'Chile')
+        with self.assertRaises(CustomKeyError):
+            self.competition.category_leaderboard('club', 'France')
+        # the boards are built by the first query above and kept up to date by later updates
+        for _ in range(20):
+            self.competition.update_leaderboard([(runner, rng.choice([rng.uniform(5.0, 50.0), DNF])) for runner in self.runners])
+        overall = sorted(self.competition.intial_leaderboard.items(), key=lambda x: x[1], reverse=True)
+        self.assertEqual(self.competition.category_leaderboard('age_group', 'U18'), [entry for entry in overall if entry[0] in teens])
+
+    def test_snapshots_during_updates(self):
+        """
+        Stress test: a reader thread never sees a partly updated leaderboard or standings
+        """
+        rng = random.Random(5)
+        races = [[(runner, rng.uniform(5.0, 50.0)) for runner in self.runners] for _ in range(300)]
+        done = threading.Event()
+        torn = []
+        def reader():
+            while not done.is_set():
+                standings = self.competition.snapshot()
+                points = list(standings.points)
+                # every race of 5 finishers hands out 4 + 3 + 2 + 1 + 0 points
+                if sum(points) != 10 * standings.version or points != sorted(points, reverse=True):
+                    torn.append(standings.version)
+                board = self.competition.leaderboard
+                if board and (None in board.values() or sum(p for _, p in board.values()) % 10):
+                    torn.append(board)
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for results in races:
+            self.competition.update_leaderboard(results)
+        done.set()
+        thread.join()
+        self.assertEqual(torn, [])
+        self.assertEqual(self.competition.snapshot().version, 300)
+        self.assertEqual(self.competition.snapshot().leaderboard(), self.competition.leaderboard)
+
+    def test_many_rounds(self):
+        """
+        Testing a league of many rounds with its own round limit against sorting every runner's points
+        """
+        with self.assertRaises(CustomValueError):
+            Competition(self.runners, 150, [0.5] * 150, [4.0] * 150, max_rounds=100)
+        with self.assertRaises(CustomTypeError):
+            Competition(self.runners, 3, self.distances_short, self.distances_marathon, max_rounds='3')
+        league = Competition(self.runners, 150, [0.5, 0.6, 1.2] * 50, [4.0, 11.0, 4.5] * 50, max_rounds=200)
+        leaderboard = league.conduct_competition()
+        ranked = sorted(league.intial_leaderboard.items(), key=lambda x: x[1], reverse=True)
+        self.assertEqual(list(leaderboard.values()), ranked)
+        self.assertEqual(list(leaderboard), ['1st', '2nd', '3rd', '4th', '5th'])
+        self.assertEqual(league.snapshot().version, 300)
+        # each distance is run 50 times, so all six are precomputed
+        self.assertEqual(len(league.timing_table), 6)
+
+    def test_amend_result(self):
+        """
+        Testing that amending a result gives the standings of a competition scored with the corrected result
+        """
+        rng = random.Random(3)
+        races = [[(runner, rng.choice([rng.uniform(5.0, 50.0), DNF])) for runner in self.runners] for _ in range(6)]
+        self.competition.keep_history = True
+        for results in races:
+            self.competition.update_leaderboard(results)
+        version = self.competition.snapshot().version
+        energies = [runner.energy for runner in self.runners]
+
+        hypothetical = self.competition.what_if(2, self.runners[3], 1.0)
+        self.assertEqual(self.competition.snapshot().version, version)
+        races[2][3] = (self.runners[3], 1.0)
+        standings = self.competition.amend_result(2, self.runners[3], 1.0)
+        self.assertEqual(standings.version, version + 1)
+        self.assertEqual(hypothetical.top(), standings.top())
+
+        expected = Competition(self.runners, 3, self.distances_short, self.distances_marathon)
+        for results in races:
+            expected.update_leaderboard(results)
+        self.assertEqual(self.competition.leaderboard, expected.leaderboard)
+        self.assertEqual(self.competition.intial_leaderboard, expected.intial_leaderboard)
+        self.assertEqual(self.competition.category_leaderboard('country', 'Iceland'), expected.category_leaderboard('country', 'Iceland'))
+        self.assertEqual([runner.energy for runner in self.runners], energies)
+
+        with self.assertRaises(CustomValueError):
+            self.competition.amend_result(6, self.runners[0], 1.0)
+        with self.assertRaises(CustomTypeError):
+            self.competition.amend_result(0, self.runners[0], 1)
+        with self.assertRaises(RunnerDoesntExistError):
+            self.competition.amend_result(0, Runner("Lauren", 13, 'Iceland', 4.4, 5.1), 1.0)
+        with self.assertRaises(CustomValueError):
+            expected.amend_result(0, self.runners[0], 1.0)
+
+    def test_concurrent_energy_updates(self):
+        """
+        Testing that draining energy from several threads loses no updates
+        """
+        runner = self.runners[0]
+        def drain():
+            for _ in range(100):
+                runner.drain_energy(1)
+        threads = [threading.Thread(target=drain) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(runner.energy, 200)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from runner import Runner
+from competition import Competition
+from pipeline import RacePipeline, load_generator, run_load
+from results import DNF
+
+class TestRacePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+            Runner("Lauren", 13, 'Iceland', 4.4, 5.1),
+        ]
+        self.competition = Competition(self.runners, 1, [0.5], [1.0])
+
+    def test_run_load_scores_every_race(self):
+        """
+        Testing that every generated race is scored once, whatever order the producers interleave in
+        """
+        pipeline = run_load(self.competition, 25, producers=3, batch_size=7)
+        self.assertEqual(pipeline.events, 300)
+        self.assertEqual(pipeline.races_scored, 75)
+        self.assertEqual(pipeline.rejected, 0)
+        # each race of 4 finishers hands out 3 + 2 + 1 + 0 points
+        self.assertEqual(sum(points for _, points in self.competition.leaderboard.values()), 75 * 6)
+        races, standings = pipeline.latest
+        self.assertEqual(races, 75)
+        self.assertIs(standings, self.competition.snapshot())
+        self.assertEqual(standings.leaderboard(self.competition.runners_count), self.competition.leaderboard)
+
+    def test_matches_update_leaderboard(self):
+        """
+        Testing that a scored race awards the same points as update_leaderboard
+        """
+        expected = Competition(self.runners, 1, [0.5], [1.0])
+        expected.update_leaderboard([(self.runners[0], 20.0), (self.runners[1], DNF), (self.runners[2], 10.0), (self.runners[3], 30.0)])
+        async def main():
+            async with RacePipeline(self.competition) as pipeline:
+                for runner_id, time_taken in [(1, DNF), (3, 30.0), (0, 20.0), (2, 10.0)]:
+                    await pipeline.put(runner_id, 'final', time_taken)
+        asyncio.run(main())
+        self.assertEqual(self.competition.leaderboard, expected.leaderboard)
+
+    def test_backpressure(self):
+        """
+        Testing that a producer faster than the scorer never gets more than queue_size events queued
+        """
+        async def main():
+            async with RacePipeline(self.competition, queue_size=8) as pipeline:
+                produced = await load_generator(pipeline, 500)
+            return pipeline, produced
+        pipeline, produced = asyncio.run(main())
+        self.assertEqual(produced, 2000)
+        self.assertEqual(pipeline.races_scored, 500)
+        self.assertEqual(pipeline.max_depth, 8)
+
+    def test_slow_publisher_gets_latest_snapshot(self):
+        published = []
+        async def slow(snapshot):
+            published.append(snapshot[0])
+            await asyncio.sleep(0.001)
+        async def main():
+            async with RacePipeline(self.competition, batch_size=4, on_snapshot=slow) as pipeline:
+                await load_generator(pipeline, 200)
+        asyncio.run(main())
+        self.assertEqual(published[-1], 200)
+        self.assertEqual(published, sorted(published))
+        self.assertLess(len(published), 200)
+
+    def test_rejected_and_incomplete(self):
+        """
+        Testing that unknown runners and repeated results are rejected, and incomplete races are not scored
+        """
+        async def main():
+            async with RacePipeline(self.competition) as pipeline:
+                await pipeline.put(9, 'a', 10.0)
+                await pipeline.put(0, 'a', 10.0)
+                await pipeline.put(0, 'a', 12.0)
+                await pipeline.put(1, 'a', 11.0)
+            return pipeline
+        pipeline = asyncio.run(main())
+        self.assertEqual(pipeline.rejected, 2)
+        self.assertEqual(pipeline.races_scored, 0)
+        self.assertIsNone(pipeline.latest)
+
+    def test_invalid_times(self):
+        """
+        Testing that times which are neither positive numbers nor DNF are rejected instead of reaching the scorer
+        """
+        async def main():
+            async with RacePipeline(self.competition) as pipeline:
+                for runner_id, time_taken in [(0, 'DNF'), (0, None), (0, -1.0), (0, float('nan')), (0, True),
+                                              (0, 10.0), (1, DNF), (2, 12), (3, 11.5)]:
+                    await pipeline.put(runner_id, 'a', time_taken)
+            return pipeline
+        pipeline = asyncio.run(asyncio.wait_for(main(), 10))
+        self.assertEqual(pipeline.rejected, 5)
+        self.assertEqual(pipeline.races_scored, 1)
+
+    def test_scorer_failure(self):
+        """
+        Testing that an error in the scorer is raised by put() and close() instead of leaving producers waiting
+        """
+        def fail(races):
+            raise CustomValueError("scoring failed")
+        self.competition.update_leaderboards = fail
+        async def main():
+            pipeline = RacePipeline(self.competition, queue_size=2).start()
+            with self.assertRaises(CustomValueError):
+                await load_generator(pipeline, 50)
+            with self.assertRaises(CustomValueError):
+                await pipeline.close()
+        asyncio.run(asyncio.wait_for(main(), 10))
+
+    def test_max_open(self):
+        """
+        Testing that races that are never completed are dropped once more than max_open are waiting
+        """
+        async def main():
+            async with RacePipeline(self.competition, max_open=3) as pipeline:
+                for race_id in range(10):
+                    await pipeline.put(0, race_id, 10.0)
+                for runner_id in range(4):
+                    await pipeline.put(runner_id, 'final', 10.0 + runner_id)
+            return pipeline
+        pipeline = asyncio.run(main())
+        self.assertEqual(pipeline.dropped, 8)
+        self.assertEqual(len(pipeline._open), 2)
+        self.assertEqual(pipeline.races_scored, 1)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(CustomValueError):
+            RacePipeline(self.competition, queue_size=0)
+        with self.assertRaises(CustomValueError):
+            RacePipeline(self.competition, field_size=5)
+        with self.assertRaises(CustomTypeError):
+            RacePipeline(self.competition, on_snapshot='print')
+        with self.assertRaises(CustomValueError):
+            RacePipeline(self.competition, max_open=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
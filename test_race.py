@@ -1,7 +1,9 @@
 import unittest
 from custom_errors import CustomValueError,CustomTypeError, RunnerAlreadyExistsError, RunnerDoesntExistError,RaceIsFullError
-from race import Race, ShortRace, MarathonRace
+from race import Race, ShortRace, MarathonRace, MiddleDistanceRace, TrailRace
+from race_types import RACE_TYPES, RaceType, register_race_type, timed_kernel
 from runner import Runner
+from results import DNF
 import math
 
 class TestRaces(unittest.TestCase):
@@ -45,7 +47,28 @@ class TestRaces(unittest.TestCase):
         # Test removing an existing runner
         short_race.remove_runner(runner)
         self.assertNotIn(runner, short_race.runners)
-    
+
+    def test_runners_changed_directly(self):
+        """
+        Test add_runner and remove_runner still see runners that were added to or removed from the list directly.
+        """
+        eli = Runner('Elijah', 18, 'Australia', 5.8, 4.4)
+        rup = Runner('Rupert', 23, 'Aruba', 5.2, 3.4)
+        short_race = ShortRace(0.5, [])
+        short_race.runners.append(eli)
+        with self.assertRaises(RunnerAlreadyExistsError):
+            short_race.add_runner(eli)
+        short_race.remove_runner(eli)
+        self.assertEqual(short_race.runners, [])
+        short_race.runners = [rup]
+        with self.assertRaises(RunnerAlreadyExistsError):
+            short_race.add_runner(rup)
+        short_race.runners.remove(rup)
+        short_race.add_runner(rup)
+        short_race.runners.clear()
+        with self.assertRaises(RunnerDoesntExistError):
+            short_race.remove_runner(rup)
+
     def test_conduct_race_short(self):
         # Create a short race and runners
         short_race = ShortRace(5.0, [])
@@ -91,10 +114,10 @@ class TestRaces(unittest.TestCase):
         # Conduct the race and get the results
         results = marathon.conduct_race()
         
-        # Both runners should run out of energy and get 'DNF'
+        # Both runners should run out of energy and get DNF
         self.assertIsInstance(results, list, f"Results returned from short race's conduct race should be a list")
         list_of_racer_times = [y[1] for y in results]
-        self.assertIn("DNF", list_of_racer_times, f"Runner John should DNF but didn't")
+        self.assertIn(DNF, list_of_racer_times, f"Runner John should DNF but didn't")
 
     def test_shortRace_class_1(self):
         """
@@ -378,9 +401,9 @@ class TestRaces(unittest.TestCase):
         result_1=(eli.run_race('long',36.2))
         result_2=(rup.run_race('long',36.2)) # calculating results
         result_3=(lau.run_race('long',36.2))
-        self.assertEqual(results[0][1],'DNF')
-        self.assertEqual(results[1][1],'DNF') # checking if results match 
-        self.assertEqual(results[2][1],'DNF')
+        self.assertEqual(results[0][1],DNF)
+        self.assertEqual(results[1][1],DNF) # checking if results match 
+        self.assertEqual(results[2][1],DNF)
 
     def test_init1(self):
         """
@@ -401,6 +424,40 @@ class TestRaces(unittest.TestCase):
         with self.assertRaises(CustomTypeError):
             short_race = ShortRace(2.5, '9')
 
+
+    def test_middle_distance_race(self):
+        """
+        Test a middle-distance race uses the average speed, its multiplier and drains energy per kilometre.
+        """
+        eli = Runner('Elijah', 18, 'Australia', 5.8, 4.4)
+        middle = MiddleDistanceRace(1.5, [eli])
+        self.assertEqual(middle.race_type, 'middle')
+        results = middle.conduct_race()
+        lap = eli.run_race('middle', 1.5) * middle.time_multiplier
+        self.assertEqual(eli.run_race('middle', 1.5), round(1500 / 5.1, 2))
+        self.assertEqual(results[0][1], lap + lap)
+        self.assertEqual(eli.energy, 1000 - 2 * middle.energy_per_km)
+
+    def test_trail_race_dnf(self):
+        """
+        Test a long trail race exhausts the runners.
+        """
+        rup = Runner('Rupert', 23, 'Aruba', 5.2, 3.4)
+        results = TrailRace(8.0, [rup]).conduct_race()
+        self.assertEqual(results[0][1], DNF)
+
+    def test_register_race_type(self):
+        """
+        Test a registered race type is usable by Runner.run_race and rejects duplicates.
+        """
+        name = 'test_uphill'
+        register_race_type(RaceType(name, lambda runner: runner.endurance_speed / 2, 1.0, 0, 4, timed_kernel))
+        self.addCleanup(RACE_TYPES.pop, name) # the registry is global, later tests must not see the test type
+        eli = Runner('Elijah', 18, 'Australia', 5.8, 4.4)
+        self.assertEqual(eli.run_race(name, 1.0), round(1000 / 2.2, 2))
+        with self.assertRaises(CustomValueError):
+            register_race_type(RaceType(name, lambda runner: 1.0, 1.0, 0, 4, timed_kernel))
+
     
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from race import ShortRace, MarathonRace
+from runner import Runner, ALL_ENERGY_LOCKS
+from competition import Competition
+from race_cache import RaceResultCache
+
+class TestRaceResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+        ]
+
+    def test_hit_returns_same_result(self):
+        """
+        Testing that a repeated short race is answered from the cache
+        """
+        cache = RaceResultCache()
+        first = cache.conduct(ShortRace(0.5, self.runners))
+        second = cache.conduct(ShortRace(0.5, self.runners))
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_marathon_energy_restored_on_hit(self):
+        """
+        Testing that a cached marathon leaves the runners with the same energy as conducting it
+        """
+        cache = RaceResultCache()
+        expected = cache.conduct(MarathonRace(4.0, self.runners))
+        energies = [runner.energy for runner in self.runners]
+        for runner in self.runners:
+            runner.energy = runner.max_energy
+        result = cache.conduct(MarathonRace(4.0, self.runners))
+        self.assertEqual(result, expected)
+        self.assertEqual([runner.energy for runner in self.runners], energies)
+        self.assertEqual(cache.hits, 1)
+
+    def test_hit_takes_energy_locks(self):
+        """
+        Testing that a cache hit restores the energies only once no other thread holds the energy locks
+        """
+        cache = RaceResultCache()
+        cache.conduct(MarathonRace(4.0, self.runners))
+        energies = [runner.energy for runner in self.runners]
+        for runner in self.runners:
+            runner.energy = runner.max_energy
+        hit = threading.Thread(target=cache.conduct, args=(MarathonRace(4.0, self.runners),))
+        with ALL_ENERGY_LOCKS:
+            hit.start()
+            hit.join(0.05)
+            self.assertTrue(hit.is_alive())
+            self.assertEqual([runner.energy for runner in self.runners], [1000] * 3)
+        hit.join()
+        self.assertEqual([runner.energy for runner in self.runners], energies)
+
+    def test_different_field_misses(self):
+        """
+        Testing that a different distance, speed or energy is a different scenario
+        """
+        cache = RaceResultCache()
+        cache.conduct(ShortRace(0.5, self.runners))
+        cache.conduct(ShortRace(0.6, self.runners))
+        self.runners[0].sprint_speed = 5.0
+        cache.conduct(ShortRace(0.5, self.runners))
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 0)
+
+    def test_memory_budget_evicts(self):
+        """
+        Testing that the least recently used entries are evicted to stay within the budget
+        """
+        cache = RaceResultCache(max_bytes=2000)
+        for i in range(20):
+            cache.conduct(ShortRace(0.5 + i, self.runners))
+        self.assertLessEqual(cache.current_bytes, 2000)
+        self.assertGreater(cache.evictions, 0)
+        self.assertEqual(len(cache), 20 - cache.evictions)
+
+    def test_shared_across_competitions(self):
+        """
+        Testing that the cache hits across Competition instances
+        """
+        cache = RaceResultCache()
+        first = Competition(self.runners, 1, [0.5], [4.0])
+        first.result_cache = cache
+        leaderboard = dict(first.conduct_competition())
+        for runner in self.runners:
+            runner.energy = runner.max_energy
+        second = Competition(self.runners, 1, [0.5], [4.0])
+        second.result_cache = cache
+        self.assertEqual(second.conduct_competition(), leaderboard)
+        self.assertEqual(cache.hits, 2)
+
+    def test_invalid_budget(self):
+        with self.assertRaises(CustomTypeError):
+            RaceResultCache(1.5)
+        with self.assertRaises(CustomValueError):
+            RaceResultCache(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from runner import Runner
+from competition import Competition
+from recovery import RecoveryPolicy, FixedRecovery, ProportionalRecovery, AgeBasedRecovery, recover_roster, recover_shared
+from shared_state import SharedRoster
+
+class TestRecovery(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+        ]
+        for runner, energy in zip(self.runners, [100, 950, 0]):
+            runner.energy = energy
+
+    def test_fixed_recovery(self):
+        recover_roster(self.runners, FixedRecovery(200))
+        self.assertEqual([runner.energy for runner in self.runners], [300, 1000, 200])
+
+    def test_proportional_recovery(self):
+        recover_roster(self.runners, ProportionalRecovery(0.5))
+        self.assertEqual([runner.energy for runner in self.runners], [550, 975, 500])
+
+    def test_age_based_recovery(self):
+        """
+        Testing that runners further from the peak age recover less, down to the minimum fraction
+        """
+        policy = AgeBasedRecovery(400, peak_age=25, decline_per_year=0.02, minimum_fraction=0.25)
+        recover_roster(self.runners, policy)
+        # 19 is 6 years from the peak (88%), 67 is past the floor (25%), 12 is 13 years away (74%)
+        self.assertEqual([runner.energy for runner in self.runners], [452, 1000, 296])
+        self.assertEqual(policy.amount_for(25), 400)
+
+    def test_invalid_policies(self):
+        with self.assertRaises(CustomValueError):
+            FixedRecovery(-1)
+        with self.assertRaises(CustomTypeError):
+            ProportionalRecovery(1)
+        with self.assertRaises(CustomValueError):
+            ProportionalRecovery(1.5)
+        with self.assertRaises(CustomTypeError):
+            recover_roster(self.runners, 100)
+        with self.assertRaises(TypeError):
+            RecoveryPolicy()
+
+    def test_recover_shared(self):
+        """
+        Testing that a policy applied to the shared energy column matches the list version
+        """
+        expected = FixedRecovery(300).apply([100, 950, 0], [19, 67, 12], 1000)
+        with SharedRoster(self.runners) as roster:
+            recover_shared(roster, FixedRecovery(300))
+            energies = roster.column('energy')
+            self.assertEqual(list(energies), [float(e) for e in expected])
+            energies.release()
+        self.assertEqual([runner.energy for runner in self.runners], expected)
+
+    def test_competition_recovers_between_rounds(self):
+        """
+        Testing that the policy runs between rounds but not after the last one
+        """
+        for runner in self.runners:
+            runner.energy = runner.max_energy
+        competition = Competition(self.runners, 2, [0.5, 0.5], [4.0, 4.0])
+        competition.recovery_policy = FixedRecovery(1000)
+        competition.conduct_competition()
+        # the 4 km marathon of the last round drains 400 and nothing recovers it afterwards
+        self.assertEqual([runner.energy for runner in self.runners], [600, 600, 600])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError, RunnerAlreadyExistsError, RunnerDoesntExistError
+from runner import Runner
+from relay import Team, RelayRace, TeamLeaderboard
+from results import DNF
+
+class TestRelay(unittest.TestCase):
+
+    def setUp(self):
+        self.fast = Team('Fast', [Runner('Elijah', 19, 'Australia', 6.4, 5.2), Runner('Lauren', 13, 'Iceland', 4.4, 5.1)])
+        self.slow = Team('Slow', [Runner('Rupert', 67, 'Botswana', 2.2, 1.8), Runner('Phoebe', 12, 'France', 3.4, 2.8)])
+
+    def test_team_validation(self):
+        with self.assertRaises(CustomValueError):
+            Team('Empty', [])
+        with self.assertRaises(CustomTypeError):
+            Team('Bad', 'not a list')
+        runner = self.fast.runners[0]
+        with self.assertRaises(CustomValueError):
+            Team('Twice', [runner, runner])
+
+    def test_leg_times(self):
+        """
+        Testing that a team's time is the sum of its leg times over an even split of the distance
+        """
+        relay = RelayRace(4.0, [self.fast, self.slow])
+        results = relay.conduct_race()
+        expected = sum(runner.run_race('relay', 2.0) for runner in self.slow.runners)
+        self.assertEqual(results[1], (self.slow, expected))
+        self.assertLess(results[0][1], results[1][1])
+        # every leg of 2 km costs 200 energy
+        self.assertEqual([runner.energy for runner in self.fast.runners], [800, 800])
+
+    def test_dnf(self):
+        """
+        Testing that a team whose runner has no energy left does not finish, and its later legs do not run
+        """
+        self.slow.runners[0].energy = 100
+        relay = RelayRace(4.0, [self.fast, self.slow])
+        results = relay.conduct_race()
+        self.assertEqual(results[1][1], DNF)
+        self.assertEqual(self.slow.runners[0].energy, 0)
+        self.assertEqual(self.slow.runners[1].energy, 1000)
+
+    def test_runner_in_two_teams(self):
+        relay = RelayRace(4.0, [self.fast])
+        with self.assertRaises(RunnerAlreadyExistsError):
+            relay.add_team(Team('Copy', [self.fast.runners[0]]))
+
+    def test_add_remove_runner(self):
+        """
+        Testing that add_runner and remove_runner of Race still work on a relay, whose team members are already runners
+        """
+        relay = RelayRace(4.0, [self.fast])
+        with self.assertRaises(RunnerAlreadyExistsError):
+            relay.add_runner(self.fast.runners[1])
+        runner = self.slow.runners[0]
+        relay.add_runner(runner)
+        self.assertEqual(relay.runners, self.fast.runners + [runner])
+        relay.remove_runner(self.fast.runners[0])
+        self.assertEqual(relay.runners, [self.fast.runners[1], runner])
+        with self.assertRaises(RunnerDoesntExistError):
+            relay.remove_runner(self.fast.runners[0])
+
+    def test_team_leaderboard(self):
+        """
+        Testing that teams are scored like individual runners
+        """
+        board = TeamLeaderboard()
+        board.update(RelayRace(4.0, [self.fast, self.slow]).conduct_race())
+        board.update([(self.fast, DNF), (self.slow, 100.0)])
+        self.assertEqual(board.leaderboard, {'1st': ('Fast', 1), '2nd': ('Slow', 1)})
+
+
+if __name__ == '__main__':
+    unittest.main()
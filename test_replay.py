@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from custom_errors import CustomValueError
+from competition import Competition
+from runner import Runner
+from replay import ReplayWriter, ReplayLog, RACE_START, RESULT, DRAIN, RECOVER, POINTS, CHECKPOINT_INTERVAL
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'competition.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_runners(self):
+        return [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+            Runner("Lauren", 13, 'Iceland', 4.4, 5.1),
+            Runner("Chloe", 21, 'Timor-Leste', 5.2, 1.9)
+        ]
+
+    def conduct(self, rounds, distances_short, distances_marathon, log=None):
+        runners = self.make_runners()
+        competition = Competition(runners, rounds, distances_short, distances_marathon)
+        return competition.conduct_competition(log), runners
+
+    def test_final_leaderboard(self):
+        """
+        Testing that replaying the whole log gives the final leaderboard
+        """
+        runners = self.make_runners()
+        competition = Competition(runners, 3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5])
+        with ReplayWriter(self.path, runners) as log:
+            leaderboard = competition.conduct_competition(log)
+        replay = ReplayLog(self.path)
+        self.assertEqual(replay.race_count, 6)
+        self.assertEqual(replay.leaderboard_at(6), leaderboard)
+        self.assertEqual(replay.energies_at(6), {runner.name: runner.energy for runner in runners})
+
+    def test_intermediate_leaderboard(self):
+        """
+        Testing that the leaderboard after the first round matches a one round competition
+        """
+        runners = self.make_runners()
+        with ReplayWriter(self.path, runners) as log:
+            Competition(runners, 3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5]).conduct_competition(log)
+        first_round, one_round_runners = self.conduct(1, [0.5], [4.0])
+        replay = ReplayLog(self.path)
+        self.assertEqual(replay.leaderboard_at(2), first_round)
+        self.assertEqual(replay.energies_at(2), {runner.name: runner.energy for runner in one_round_runners})
+        self.assertEqual(replay.points_at(0), {runner.name: 0 for runner in runners})
+
+    def test_checkpoints(self):
+        """
+        Testing that points and energies rebuilt from the checkpoints of a long log match replaying it from the start
+        """
+        runners = self.make_runners()
+        rounds = CHECKPOINT_INTERVAL + 6
+        with ReplayWriter(self.path, runners) as log:
+            Competition(runners, rounds, [0.5] * rounds, [4.0] * rounds, max_rounds=rounds).conduct_competition(log)
+        replay = ReplayLog(self.path)
+        self.assertEqual(len(replay._checkpoints), 3)
+        for races in (0, 1, CHECKPOINT_INTERVAL - 1, CHECKPOINT_INTERVAL, 2 * CHECKPOINT_INTERVAL + 5, replay.race_count):
+            points, energies = [0] * len(runners), list(replay.starting_energy)
+            for kind, index, _, value in replay.events(races):
+                if kind == POINTS:
+                    points[index] += value
+                elif kind == DRAIN:
+                    energies[index] -= value
+                elif kind == RECOVER:
+                    energies[index] += value
+            self.assertEqual(replay.points_at(races), {name: int(total) for name, total in zip(replay.names, points)})
+            self.assertEqual(replay.energies_at(races), {name: int(energy) for name, energy in zip(replay.names, energies)})
+
+    def test_events(self):
+        """
+        Testing the decoded events of a single short race
+        """
+        runners = self.make_runners()[:2]
+        with ReplayWriter(self.path, runners) as log:
+            Competition(runners, 1, [0.5], [1.0]).conduct_competition(log)
+        events = list(ReplayLog(self.path).events(1))
+        self.assertEqual(events[0], (RACE_START, 1, 0, 0.5))
+        self.assertEqual([kind for kind, _, _, _ in events[1:]], [RESULT, RESULT, POINTS, POINTS])
+
+    def test_out_of_range(self):
+        runners = self.make_runners()
+        with ReplayWriter(self.path, runners) as log:
+            Competition(runners, 1, [0.5], [1.0]).conduct_competition(log)
+        with self.assertRaises(CustomValueError):
+            ReplayLog(self.path).leaderboard_at(3)
+
+    def test_not_a_log(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a replay log at all')
+        with self.assertRaises(CustomValueError):
+            ReplayLog(self.path)
+
+    def test_truncated_header(self):
+        """
+        Testing that an empty log and a log cut off inside its runner table are reported as not being replay logs
+        """
+        with ReplayWriter(self.path, self.make_runners()) as log:
+            pass
+        with open(self.path, 'rb') as file:
+            header = file.read()
+        for size in (0, 5, 12, 15, len(header) - 1):
+            with open(self.path, 'wb') as file:
+                file.write(header[:size])
+            with self.assertRaises(CustomValueError):
+                ReplayLog(self.path)
+        with open(self.path, 'wb') as file:
+            file.write(header)
+        self.assertEqual(ReplayLog(self.path).race_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import pickle
+import unittest
+from array import array
+from race import ShortRace, MarathonRace
+from runner import Runner
+from results import DNF, FINISHED, DID_NOT_FINISH, RaceResult, ScoredRace, status_of, pack_results, unpack_results
+
+class TestRaceResult(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+        ]
+
+    def test_record(self):
+        result = RaceResult(self.runners[0], 120.5)
+        runner, time_taken = result
+        self.assertIs(runner, self.runners[0])
+        self.assertEqual(result, (self.runners[0], 120.5))
+        self.assertTrue(result.finished)
+        self.assertEqual(result.status, FINISHED)
+        self.assertEqual(RaceResult(self.runners[1], DNF).status, DID_NOT_FINISH)
+        self.assertEqual(status_of(DNF), DID_NOT_FINISH)
+        self.assertEqual(pickle.loads(pickle.dumps(RaceResult("Elijah", 120.5))), ("Elijah", 120.5))
+        self.assertEqual(repr(RaceResult(1, 2.0)), 'RaceResult(runner=1, time=2.0)')
+
+    def test_dnf_sorts_last(self):
+        results = [RaceResult(self.runners[0], DNF), RaceResult(self.runners[1], 300.0), RaceResult(self.runners[2], 100.0)]
+        self.assertEqual([result.runner for result in sorted(results, key=lambda result: result.time)],
+                         [self.runners[2], self.runners[1], self.runners[0]])
+
+    def test_races_return_records(self):
+        for result in ShortRace(1.0, self.runners).conduct_race():
+            self.assertIsInstance(result, RaceResult)
+            self.assertIsInstance(result.time, float)
+        self.runners[1].energy = 0
+        results = MarathonRace(2.0, self.runners).conduct_race()
+        self.assertEqual([result.status for result in results], [FINISHED, DID_NOT_FINISH, FINISHED])
+
+    def test_pack(self):
+        results = [RaceResult(self.runners[0], 10.0), RaceResult(self.runners[1], DNF)]
+        runners, times, statuses = pack_results(results)
+        self.assertEqual(runners, self.runners[:2])
+        self.assertEqual(times, array('d', [10.0, DNF]))
+        self.assertEqual(statuses, array('b', [FINISHED, DID_NOT_FINISH]))
+        self.assertEqual(unpack_results(runners, times), results)
+
+    def test_scored_race(self):
+        a, b, c = self.runners
+        scored = ScoredRace.score([(a, 30.0), (b, DNF), (c, 10.0)])
+        self.assertEqual(list(scored.points), [1, 0, 2])
+        self.assertEqual(scored.index_of(b), 1)
+        self.assertIsNone(scored.index_of(Runner("Lauren", 13, 'Iceland', 4.4, 5.1)))
+        # b is corrected to the fastest time, a and c each lose a place
+        self.assertEqual(scored.amend(1, 5.0), [(a, -1), (b, 2), (c, -1)])
+        self.assertEqual(list(scored.points), [0, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+from custom_errors import CustomTypeError, RunnerAlreadyExistsError, RunnerDoesntExistError
+from runner import Runner
+from roster_index import RosterIndex
+from synthetic import generate
+
+class TestRosterIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.runners = generate(500, seed=3).runners()
+        for runner in self.runners:
+            runner.age = rng.randint(5, 60)
+            runner.country = rng.choice(['Australia', 'France', 'Iceland', 'Botswana'])
+        self.index = RosterIndex(self.runners)
+
+    def scan(self, country=None, age=None, sprint_speed=None, endurance_speed=None):
+        # the linear scan the index replaces
+        def within(value, bounds):
+            return bounds is None or ((bounds[0] is None or value >= bounds[0]) and (bounds[1] is None or value <= bounds[1]))
+        return [i for i, r in enumerate(self.runners)
+                if (country is None or r.country == country) and within(r.age, age)
+                and within(r.sprint_speed, sprint_speed) and within(r.endurance_speed, endurance_speed)]
+
+    def test_queries_match_scan(self):
+        queries = [
+            {'country': 'Australia', 'age': (18, 25), 'sprint_speed': (5.0, None)},
+            {'age': (30, 30)},
+            {'sprint_speed': (None, 2.5), 'endurance_speed': (4.0, 5.4)},
+            {'country': 'Iceland'},
+            {'country': 'Canada', 'age': (18, 25)},
+            {'age': (40, 20)},
+            {},
+        ]
+        for query in queries:
+            self.assertEqual(self.index.query(**query), self.scan(**query), query)
+
+    def test_bulk_build_matches_add(self):
+        """
+        Testing that the indexes sorted once by the constructor are the same as adding the runners one by one
+        """
+        added = RosterIndex()
+        for runner in self.runners:
+            added.add(runner)
+        self.assertEqual(self.index._keys, added._keys)
+        self.assertEqual(self.index._order, added._order)
+        self.assertEqual(self.index._countries, added._countries)
+        with self.assertRaises(RunnerAlreadyExistsError):
+            RosterIndex(self.runners[:3] + self.runners[:1])
+
+    def test_add_and_reindex(self):
+        """
+        Testing that added runners and changed attributes are picked up
+        """
+        runner = Runner('Lauren', 22, 'Iceland', 6.7, 5.1)
+        runner_id = self.index.add(runner)
+        self.runners.append(runner)
+        self.assertEqual(runner_id, 500)
+        self.assertIn(runner_id, self.index.query(country='Iceland', sprint_speed=(6.7, None)))
+
+        moved = self.runners[0]
+        moved.country, moved.age, moved.sprint_speed = 'Timor-Leste', 99, 2.2
+        self.index.reindex(moved)
+        self.assertEqual(self.index.query(country='Timor-Leste'), [0])
+        self.assertEqual(self.index.query(age=(99, None)), [0])
+        for query in [{'country': 'Australia'}, {'age': (18, 25)}, {'sprint_speed': (None, 2.3)}]:
+            self.assertEqual(self.index.query(**query), self.scan(**query))
+
+    def test_errors(self):
+        with self.assertRaises(RunnerAlreadyExistsError):
+            self.index.add(self.runners[0])
+        with self.assertRaises(RunnerDoesntExistError):
+            self.index.id_of(Runner('Lauren', 22, 'Iceland', 6.7, 5.1))
+        with self.assertRaises(CustomTypeError):
+            self.index.query(age=18)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
+import threading
 import unittest
 from custom_errors import CustomValueError,CustomTypeError,CustomAttributeError
-from runner import Runner
+from runner import Runner, ALL_ENERGY_LOCKS
 
 class TestRunner(unittest.TestCase):
     def test_runner_initialization(self):
@@ -33,6 +34,28 @@ class TestRunner(unittest.TestCase):
         with self.assertRaises(CustomValueError):
             Runner('Elijah', 18, 'Atla', 6.8, 4.4)
     
+    def test_valid_countries_cached(self):
+        """
+        Testing that the country csv is read once and shared by every runner
+        """
+        countries = Runner.valid_countries()
+        self.assertIn('Australia', countries)
+        self.assertIs(Runner.valid_countries(), countries)
+
+    def test_all_energy_locks(self):
+        """
+        Testing that drain_energy waits while another thread holds every energy lock for a bulk update
+        """
+        runner = Runner('Elijah', 18, 'Australia', 5.8, 4.4)
+        drainer = threading.Thread(target=runner.drain_energy, args=(100,))
+        with ALL_ENERGY_LOCKS:
+            drainer.start()
+            drainer.join(0.05)
+            self.assertTrue(drainer.is_alive())
+            runner.energy = 500
+        drainer.join()
+        self.assertEqual(runner.energy, 400)
+
     def test_drain_energy_1(self):
         """
         Test the drain energy method.
@@ -0,0 +1,130 @@
+import gc
+import math
+import time
+import tracemalloc
+import unittest
+from competition import Competition
+from race import MarathonRace
+from standings import RankedBoard
+from synthetic import generate
+
+# Field sizes every engine is timed at, a factor of 8 from the smallest to the largest
+SIZES = (2000, 4000, 8000, 16000)
+# Each timing is the best of this many runs, which drops the runs slowed down by the rest of the machine
+REPEATS = 5
+# Largest log-log slopes allowed: 1 is linear, n log n fits about 1.1 at these sizes and quadratic is 2,
+# so the limits leave room for a noisy CI box and still catch a quadratic regression
+LINEAR_SLOPE = 1.4
+NEAR_LINEAR_SLOPE = 1.6
+# Largest slope of work that should not depend on the size at all, about 0.3 measured
+FLAT_SLOPE = 0.6
+# Runners awarded points by each race of test_ranked_board_race, whatever the size of the board
+RACE_FIELD = 100
+# Peak bytes allocated per runner while a marathon is conducted and scored, about 300 measured
+MEMORY_PER_RUNNER = 1024
+
+def best_time(setup, action) -> float:
+    """
+    Returns the fastest of REPEATS runs of action(setup()), with garbage collection off while it is timed.
+    """
+    best = math.inf
+    for _ in range(REPEATS):
+        state = setup()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            action(state)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def slope(sizes, timings) -> float:
+    """
+    Returns the least squares slope of log(timing) against log(size), the exponent k of timing ~ size ** k.
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(timing) for timing in timings]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+            / sum((x - mean_x) * (x - mean_x) for x in xs))
+
+def marathon(runners) -> MarathonRace:
+    race = MarathonRace(5.0, runners)
+    race.maximum_participants = len(race.runners) # the engines are measured beyond the usual field limit
+    return race
+
+class TestScalability(unittest.TestCase):
+    """
+    Checks how the race and competition engines grow with the number of runners, by fitting the exponent of
+    their timings at several field sizes rather than comparing a single time with a limit.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        roster = generate(SIZES[-1], seed=1)
+        cls.fields = {size: roster.runners(0, size) for size in SIZES}
+
+    def assertSlope(self, timings, limit):
+        fitted = slope(SIZES, timings)
+        self.assertLess(fitted, limit, f"timings {[f'{timing:.4f}' for timing in timings]} grow as n ** {fitted:.2f}")
+
+    def test_helpers(self):
+        self.assertAlmostEqual(slope([1, 2, 4], [3, 6, 12]), 1.0)
+        self.assertAlmostEqual(slope([1, 2, 4], [3, 12, 48]), 2.0)
+
+    def test_conduct_race_linear(self):
+        timings = [best_time(lambda: marathon(self.fields[size]), MarathonRace.conduct_race) for size in SIZES]
+        self.assertSlope(timings, LINEAR_SLOPE)
+
+    def test_add_runner_not_quadratic(self):
+        def add_all(race):
+            for runner in race.runners_to_add:
+                race.add_runner(runner)
+        def empty_race(size):
+            race = marathon([])
+            race.maximum_participants = size
+            race.runners_to_add = self.fields[size]
+            return race
+        timings = [best_time(lambda: empty_race(size), add_all) for size in SIZES]
+        self.assertSlope(timings, LINEAR_SLOPE)
+
+    def test_update_leaderboard(self):
+        # sorting the standings makes an update n log n
+        def competition(size):
+            runners = self.fields[size]
+            return Competition(runners, 1, [1.0], [4.0]), marathon(runners).conduct_race()
+        timings = [best_time(lambda: competition(size), lambda state: state[0].update_leaderboard(state[1]))
+                   for size in SIZES]
+        self.assertSlope(timings, NEAR_LINEAR_SLOPE)
+
+    def test_ranked_board_race(self):
+        """
+        The cost of bringing a board up to date after a race depends on the field of the race, not on the size of the board
+        """
+        def board(size):
+            ranked = RankedBoard()
+            for position, runner in enumerate(self.fields[size]):
+                ranked.add(runner.name, position, position % 50)
+            # a field spread over the whole board, so the changed entries move all over it
+            for place, runner in enumerate(self.fields[size][::size // RACE_FIELD]):
+                ranked.add_points(runner.name, RACE_FIELD - place)
+            return ranked
+        timings = [best_time(lambda: board(size), lambda ranked: ranked.top(1)) for size in SIZES]
+        self.assertSlope(timings, FLAT_SLOPE)
+
+    def test_memory_per_runner(self):
+        for size in (SIZES[0], SIZES[-1]):
+            runners = self.fields[size]
+            competition = Competition(runners, 1, [1.0], [4.0])
+            tracemalloc.start()
+            try:
+                competition.update_leaderboard(marathon(runners).conduct_race())
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak / size, MEMORY_PER_RUNNER)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import copy
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from runner import Runner
+from competition import Competition
+from race import ShortRace, MarathonRace
+from schedule import Schedule
+
+class TestSchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+            Runner("Lauren", 13, 'Iceland', 4.4, 5.1),
+        ]
+        self.schedule = Schedule(3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5])
+
+    def test_races(self):
+        self.assertEqual(len(self.schedule), 3)
+        self.assertEqual(list(self.schedule.distances_marathon), [4.0, 11.0, 4.5])
+        short, marathon = self.schedule.races[1]
+        self.assertEqual((short.round, short.race_type, short.distance), (2, 'short', 0.6))
+        self.assertIsInstance(marathon.build(self.runners), MarathonRace)
+        self.assertIsInstance(short.build(self.runners), ShortRace)
+
+    def test_shared_by_competitions(self):
+        """
+        Testing that competitions sharing one schedule give the same standings as competitions built from lists
+        """
+        expected = Competition(copy.deepcopy(self.runners), 3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5]).conduct_competition()
+        for _ in range(3):
+            competition = Competition.from_schedule(copy.deepcopy(self.runners), self.schedule)
+            self.assertEqual(competition.conduct_competition(), expected)
+            self.assertIs(competition.schedule, self.schedule)
+
+    def test_invalid_plans(self):
+        with self.assertRaises(CustomTypeError):
+            Schedule(3, [0.5, '2', 1.2], [4.0, 11.0, 4.5])
+        with self.assertRaises(CustomValueError):
+            Schedule(2, [0.5, -0.6], [4.0, 11.0])
+        with self.assertRaises(CustomValueError):
+            Schedule(3, [1.5], [2.5, 16.0, 1.0])
+        with self.assertRaises(CustomValueError):
+            Schedule(4, [1.0] * 4, [1.0] * 4, max_rounds=3)
+        with self.assertRaises(CustomTypeError):
+            Competition.from_schedule(self.runners, [1.0])
+
+    def test_from_schedule_checks_max_rounds(self):
+        class TwoRounds(Competition):
+            MAX_ROUNDS = 2
+        with self.assertRaises(CustomValueError):
+            TwoRounds.from_schedule(self.runners, self.schedule)
+
+
+if __name__ == '__main__':
+    unittest.main()
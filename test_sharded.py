@@ -0,0 +1,48 @@
+import random
+import unittest
+from custom_errors import CustomKeyError
+from sharded import ShardedLeaderboard
+from results import DNF
+
+class TestShardedLeaderboard(unittest.TestCase):
+
+    def setUp(self):
+        self.board = ShardedLeaderboard(500, shards=3).start()
+
+    def tearDown(self):
+        self.board.close()
+
+    def test_top_and_rank_match_single_board(self):
+        """
+        Testing that the merged top-k and ranks match a single in-process board
+        """
+        rng = random.Random(3)
+        totals = {}
+        for _ in range(20):
+            pairs = [(rng.randrange(500), rng.randrange(10)) for _ in range(100)]
+            self.board.add_points(pairs)
+            for runner_id, points in pairs:
+                totals[runner_id] = totals.get(runner_id, 0) + points
+        expected = sorted(((-points, runner_id) for runner_id, points in totals.items()))[:10]
+        self.assertEqual(self.board.top(10), [(runner_id, -negative) for negative, runner_id in expected])
+        self.assertEqual(len(self.board), len(totals))
+        for runner_id in list(totals)[:20]:
+            above = sum(1 for points in totals.values() if points > totals[runner_id])
+            self.assertEqual(self.board.rank(runner_id), above + 1)
+
+    def test_award_race(self):
+        """
+        Testing that races are scored like Competition.update_leaderboard
+        """
+        self.board.award_race([(0, 20.0), (1, DNF), (2, 10.0), (3, 15.0)])
+        self.assertEqual(self.board.top(4), [(2, 3.0), (3, 2.0), (0, 1.0), (1, 0.0)])
+        self.assertEqual(self.board.rank(1), 4)
+        self.assertIsNone(self.board.rank(7))
+
+    def test_unknown_id(self):
+        with self.assertRaises(CustomKeyError):
+            self.board.add_points([(500, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import copy
+import threading
+import unittest
+from custom_errors import CustomValueError
+from race import ShortRace, MarathonRace
+from runner import Runner, ALL_ENERGY_LOCKS
+from shared_state import SharedRoster
+from results import DNF
+
+class TestSharedRoster(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+            Runner("Lauren", 13, 'Iceland', 4.4, 5.1),
+            Runner("Chloe", 21, 'Timor-Leste', 5.2, 1.9)
+        ]
+        self.runners[2].energy = 300
+
+    def test_marathon_matches_race(self):
+        """
+        Testing that a marathon run in worker processes matches MarathonRace.conduct_race, energies included
+        """
+        copies = [copy.copy(runner) for runner in self.runners]
+        expected = MarathonRace(5.5, copies).conduct_race()
+        with SharedRoster(self.runners) as roster:
+            results = roster.conduct(MarathonRace(5.5, self.runners), processes=2)
+            self.assertEqual([time for _, time in results], [time for _, time in expected])
+            self.assertEqual([runner.energy for runner in self.runners], [runner.energy for runner in copies])
+            energies = roster.column('energy')
+            self.assertEqual(list(energies), [float(runner.energy) for runner in copies])
+            energies.release()
+        self.assertEqual(results[2][1], DNF)
+
+    def test_store_energies_takes_energy_locks(self):
+        """
+        Testing that the energies are copied back only once no other thread holds the energy locks
+        """
+        with SharedRoster(self.runners) as roster:
+            self.runners[0].energy = 100
+            store = threading.Thread(target=roster.store_energies)
+            with ALL_ENERGY_LOCKS:
+                store.start()
+                store.join(0.05)
+                self.assertTrue(store.is_alive())
+                self.assertEqual(self.runners[0].energy, 100)
+            store.join()
+        self.assertEqual(self.runners[0].energy, 1000)
+
+    def test_short_race(self):
+        """
+        Testing a short race over the shared arrays
+        """
+        expected = ShortRace(0.8, self.runners).conduct_race()
+        with SharedRoster(self.runners) as roster:
+            self.assertEqual(roster.conduct(ShortRace(0.8, self.runners), processes=3), expected)
+
+    def test_other_runners(self):
+        with SharedRoster(self.runners[:2]) as roster:
+            with self.assertRaises(CustomValueError):
+                roster.conduct(MarathonRace(2.0, self.runners))
+
+
+if __name__ == '__main__':
+    unittest.main()
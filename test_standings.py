@@ -0,0 +1,85 @@
+import unittest
+from custom_errors import RunnerAlreadyExistsError, RunnerDoesntExistError
+from array import array
+from standings import RankedBoard, Standings, age_group, ordinal_labels
+
+class TestRankedBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.board = RankedBoard()
+        for position, name in enumerate(['Elijah', 'Rupert', 'Phoebe', 'Lauren']):
+            self.board.add(name, position)
+
+    def test_points_and_ties(self):
+        """
+        Testing that runners are ordered by points and that ties keep the order they were added in
+        """
+        self.board.add_points('Phoebe', 3)
+        self.board.add_points('Rupert', 1)
+        self.board.add_points('Lauren', 1)
+        self.assertEqual(self.board.top(), [('Phoebe', 3), ('Rupert', 1), ('Lauren', 1), ('Elijah', 0)])
+        self.assertEqual(self.board.top(2), [('Phoebe', 3), ('Rupert', 1)])
+        self.assertEqual(self.board.rank('Lauren'), 3)
+        self.assertEqual(self.board.points('Phoebe'), 3)
+        self.assertEqual(len(self.board), 4)
+
+    def test_blocks(self):
+        """
+        Testing that small and whole-field races keep a board cut into many blocks in the same order as a full sort
+        """
+        board = RankedBoard()
+        board.BLOCK = 4
+        points = {}
+        for position in range(100):
+            board.add(f"Runner{position}", position, position % 7)
+            points[f"Runner{position}"] = position % 7
+        for race in range(20):
+            # every third race awards the whole field, the others a field of 5
+            field = list(points)[race % 10::1 if race % 3 == 0 else 20]
+            for place, name in enumerate(field):
+                board.add_points(name, len(field) - place)
+                points[name] += len(field) - place
+            expected = sorted(points.items(), key=lambda item: -item[1]) # stable, so ties stay in position order
+            self.assertEqual(board.top(), expected)
+            self.assertEqual(board.rank(expected[37][0]), 38)
+        self.assertGreater(len(board._blocks), 100 // 8)
+
+    def test_unknown_and_duplicate_runners(self):
+        with self.assertRaises(RunnerAlreadyExistsError):
+            self.board.add('Elijah', 9)
+        with self.assertRaises(RunnerDoesntExistError):
+            self.board.add_points('Chloe', 1)
+        with self.assertRaises(RunnerDoesntExistError):
+            self.board.rank('Chloe')
+
+    def test_age_group(self):
+        self.assertEqual([age_group(age) for age in (5, 17, 18, 34, 35, 49, 50, 120)],
+                         ['U18', 'U18', '18-34', '18-34', '35-49', '35-49', '50+', '50+'])
+
+
+class TestStandings(unittest.TestCase):
+
+    def test_snapshot(self):
+        standings = Standings(2, ('Phoebe', 'Rupert', 'Elijah'), array('q', [5, 3, 1]))
+        self.assertEqual(standings.top(2), [('Phoebe', 5), ('Rupert', 3)])
+        self.assertEqual(standings[2], ('Elijah', 1))
+        self.assertEqual(len(standings), 3)
+        self.assertEqual(standings.leaderboard(), {'1st': ('Phoebe', 5), '2nd': ('Rupert', 3), '3rd': ('Elijah', 1)})
+        with self.assertRaises(AttributeError):
+            standings.extra = 1
+
+    def test_ordinal_labels(self):
+        """
+        Testing the shared ordinal table, including the 11th-13th exceptions
+        """
+        labels = ordinal_labels(113)
+        self.assertEqual(labels[:4], ['1st', '2nd', '3rd', '4th'])
+        self.assertEqual(labels[10:13], ['11th', '12th', '13th'])
+        self.assertEqual(labels[20:23], ['21st', '22nd', '23rd'])
+        self.assertEqual(labels[110:113], ['111th', '112th', '113th'])
+        # asking again for fewer labels reuses the same strings
+        self.assertIs(ordinal_labels(2)[0], labels[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
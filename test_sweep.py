@@ -0,0 +1,89 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError, CustomKeyError
+from competition import Competition
+from race_types import RACE_TYPES
+from runner import Runner
+from schedule import Schedule
+from sweep import SweepModel, sweep, ranks, rank_correlation
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.schedule = Schedule(3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5])
+        self.runners = self.make_runners()
+
+    def make_runners(self):
+        return [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+            Runner("Lauren", 13, 'Iceland', 4.4, 5.1),
+            Runner("Chloe", 21, 'Timor-Leste', 5.2, 1.9)
+        ]
+
+    def test_matches_competition(self):
+        """
+        Testing that the model gives the points of a competition conducted with the same settings
+        """
+        model = SweepModel(self.runners, self.schedule)
+        long = RACE_TYPES['long']
+        saved = long.energy_per_km, Runner.max_energy
+        try:
+            for energy_per_km, max_energy in [(100, 1000), (50, 1000), (300, 2000), (0, 1500)]:
+                long.energy_per_km, Runner.max_energy = energy_per_km, max_energy
+                competition = Competition(self.make_runners(), 3, [0.5, 0.6, 1.2], [4.0, 11.0, 4.5])
+                competition.conduct_competition()
+                points, _ = model.evaluate(energy_per_km, max_energy)
+                self.assertEqual(dict(zip(model.names, points)), competition.intial_leaderboard)
+        finally:
+            long.energy_per_km, Runner.max_energy = saved
+
+    def test_dnf_rate(self):
+        model = SweepModel(self.runners, self.schedule)
+        # 11 km at 100 per km: nobody has energy left for the last kilometre of round 2
+        self.assertEqual(model.evaluate(100, 1000)[1], 5)
+        self.assertEqual(model.evaluate(50, 1000)[1], 0)
+        # runners starting with less energy drop out sooner
+        tired = SweepModel(self.runners, self.schedule, start_energy=[1.0, 0.2, 1.0, 1.0, 1.0])
+        self.assertEqual(tired.evaluate(200, 1000)[1], 6)
+
+    def test_sweep_table(self):
+        table = sweep(self.runners, self.schedule, [1.0, 1.2], [50, 100], [1000, 2000], processes=1)
+        self.assertEqual(len(table), 8)
+        self.assertEqual(table.rows[0][:3], (1.0, 50, 1000))
+        self.assertEqual(table.column('dnf_rate')[:4], [0.0, 0.0, 5 / 15, 0.0])
+        # the current settings are the baseline
+        self.assertEqual(table.rows[2][4], 1.0)
+        self.assertAlmostEqual(table.column('mean_short_time')[4], table.column('mean_short_time')[0] * 1.2)
+        self.assertIn('rank_stability', table.format().splitlines()[0])
+        with self.assertRaises(CustomKeyError):
+            table.column('winner')
+
+    def test_processes(self):
+        grid = ([1.2], [0, 100, 200, 400], [1000, 3000])
+        self.assertEqual(sweep(self.runners, self.schedule, *grid, processes=2).rows,
+                         sweep(self.runners, self.schedule, *grid, processes=1).rows)
+
+    def test_ranks(self):
+        self.assertEqual(ranks([3, 5, 3, 0]), [1, 0, 2, 3])
+        self.assertEqual(rank_correlation([0, 1, 2], [0, 1, 2]), 1.0)
+        self.assertEqual(rank_correlation([0, 1, 2], [2, 1, 0]), -1.0)
+
+    def test_invalid_grid(self):
+        with self.assertRaises(CustomTypeError):
+            sweep(self.runners, self.schedule, [1], [100], [1000])
+        with self.assertRaises(CustomValueError):
+            sweep(self.runners, self.schedule, [1.2], [-1], [1000])
+        with self.assertRaises(CustomTypeError):
+            sweep(self.runners, self.schedule, [], [100], [1000])
+        with self.assertRaises(CustomValueError):
+            SweepModel(self.runners, self.schedule, start_energy=[1.0])
+        # conduct_competition recovers 1000 energy after a DNF, which a lower max_energy cannot hold
+        with self.assertRaises(CustomValueError):
+            sweep(self.runners, self.schedule, [1.2], [100], [1000, 999])
+        with self.assertRaises(CustomValueError):
+            SweepModel(self.runners, self.schedule).evaluate(100, 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
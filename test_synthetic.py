@@ -0,0 +1,92 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from runner import Runner
+from synthetic import generate, Distribution, Uniform, Normal, Triangular, CHUNK
+from validation import validate_runner_columns
+
+class TestSynthetic(unittest.TestCase):
+
+    def test_valid_runners(self):
+        """
+        Testing that every generated runner passes the checks of Runner, with every distribution
+        """
+        for distribution in (Uniform(), Normal(), Normal(6.0, 3.0), Triangular(), Triangular(2.0)):
+            roster = generate(2000, seed=1, age=distribution, sprint_speed=distribution, endurance_speed=distribution)
+            self.assertEqual(len(roster), 2000)
+            names = [roster.name(i) for i in range(len(roster))]
+            countries = [roster.countries[code] for code in roster.country]
+            report = validate_runner_columns(names, list(roster.age), countries, list(roster.sprint_speed), list(roster.endurance_speed))
+            self.assertTrue(report.ok, [str(error) for error in report.errors[:3]])
+
+    def test_seeded(self):
+        first, second = generate(CHUNK + 10, seed=7), generate(CHUNK + 10, seed=7)
+        self.assertEqual(first.sprint_speed, second.sprint_speed)
+        self.assertEqual(first.country, second.country)
+        self.assertNotEqual(generate(100, seed=8).age, generate(100, seed=7).age)
+        self.assertEqual(len(first.age), CHUNK + 10)
+
+    def test_distributions(self):
+        ages = generate(5000, age=Normal(30.0, 5.0)).age
+        self.assertAlmostEqual(sum(ages) / len(ages), 30, delta=1)
+        self.assertEqual(set(generate(5000).age), set(range(5, 121)))
+        speeds = generate(5000, sprint_speed=Triangular(6.0)).sprint_speed
+        self.assertGreater(sum(speeds) / len(speeds), 4.5)
+
+    def test_country_weights(self):
+        roster = generate(1000, country_weights={'Australia': 3, 'France': 1, 'Kenya': 0})
+        counts = [list(roster.country).count(code) for code in range(3)]
+        self.assertEqual(roster.countries, ('Australia', 'France', 'Kenya'))
+        self.assertGreater(counts[0], counts[1])
+        self.assertEqual(counts[2], 0)
+
+    def test_runners(self):
+        roster = generate(10, seed=3)
+        runners = roster.runners(2, 5)
+        self.assertEqual([runner.name for runner in runners], ['Runner2', 'Runner3', 'Runner4'])
+        self.assertEqual(runners[0].sprint_speed, roster.sprint_speed[2])
+        self.assertEqual(runners[0].energy, Runner.max_energy)
+        self.assertEqual(len(roster.runners()), 10)
+
+    def test_invalid_input(self):
+        with self.assertRaises(CustomTypeError):
+            generate(10.0)
+        with self.assertRaises(CustomValueError):
+            generate(-1)
+        with self.assertRaises(CustomTypeError):
+            generate(10, age='uniform')
+        with self.assertRaises(CustomValueError):
+            generate(10, country_weights={'Narnia': 1})
+        with self.assertRaises(CustomValueError):
+            generate(10, country_weights={'France': 0})
+        with self.assertRaises(CustomValueError):
+            generate(10, prefix='Runner 1')
+        with self.assertRaises(CustomValueError):
+            Normal(sd=0.0)
+        with self.assertRaises(TypeError):
+            Distribution()
+
+    def test_custom_distribution_checked(self):
+        """
+        Testing that values a custom distribution draws outside the range of a field are rejected
+        """
+        class Constant(Distribution):
+            def __init__(self, value):
+                self.value = value
+            def sample(self, rng, count, low, high):
+                return [self.value] * count
+        self.assertEqual(set(generate(10, sprint_speed=Constant(3.0)).sprint_speed), {3.0})
+        for value in (7.5, 1.0, float('nan')):
+            with self.assertRaises(CustomValueError):
+                generate(10, sprint_speed=Constant(value))
+        class ConstantAge(Constant):
+            def integers(self, rng, count, low, high):
+                return [self.value] * count
+        self.assertEqual(set(generate(10, age=ConstantAge(30)).age), {30})
+        with self.assertRaises(CustomValueError):
+            generate(10, age=ConstantAge(300))
+        with self.assertRaises(CustomTypeError):
+            generate(10, age=ConstantAge(30.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from task4 import main, parse_competition, read_fields, run_batch
+
+FIELDS = """Elijah/19/Australia/6.4/5.2
+Rupert/67/Botswana/2.2/1.8
+
+Phoebe/12/France/3.4/2.8
+Lauren/13/Iceland/4.4/5.1
+Chloe/21/Timor-Leste/5.2/1.9
+"""
+
+class TestBatch(unittest.TestCase):
+
+    def test_parse_competition(self):
+        self.assertEqual(parse_competition('2/0.5,0.6/4.0,4.5'), (2, [0.5, 0.6], [4.0, 4.5]))
+        with self.assertRaises(ValueError):
+            parse_competition('2/0.5,0.6')
+        with self.assertRaises(ValueError):
+            parse_competition('two/0.5/4.0')
+
+    def test_read_fields(self):
+        """
+        Testing that blank lines separate fields and every problem of a bad line is reported with its line number
+        """
+        errors = io.StringIO()
+        fields = list(read_fields(io.StringIO(FIELDS + "\nEmma/3/France/3.4/2.8\nNoah/20/France\nLiam/20/France/3.4/2.8\n"), errors))
+        self.assertEqual([[runner.name for runner in field] for field in fields],
+                         [['Elijah', 'Rupert'], ['Phoebe', 'Lauren', 'Chloe'], ['Liam']])
+        lines = errors.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('line 8: Error creating runner'))
+        self.assertEqual(lines[1], 'line 9: ERROR : Incorrect number of fields')
+
+    def test_run_batch(self):
+        output, errors = io.StringIO(), io.StringIO()
+        failed = run_batch(io.StringIO(FIELDS), '1/0.5/4.0', output, errors)
+        leaderboards = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(failed, 0)
+        self.assertEqual(errors.getvalue(), '')
+        self.assertEqual(len(leaderboards), 2)
+        self.assertEqual(leaderboards[0]['1st'], ['Elijah', 2])
+
+    def test_run_batch_failed_competition(self):
+        output, errors = io.StringIO(), io.StringIO()
+        # more rounds than distances
+        self.assertEqual(run_batch(io.StringIO(FIELDS), '2/0.5/4.0', output, errors), 2)
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(errors.getvalue().count('Error creating competition'), 2)
+
+    def run_main(self, argv):
+        output, errors = io.StringIO(), io.StringIO()
+        with redirect_stdout(output), redirect_stderr(errors):
+            status = main(argv)
+        return status, output.getvalue(), errors.getvalue()
+
+    def test_main_exit_codes(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'runners.txt')
+            with open(path, 'w') as stream:
+                stream.write(FIELDS)
+            status, output, errors = self.run_main([path, '-c', '1/0.5/4.0'])
+            self.assertEqual((status, len(output.splitlines()), errors), (0, 2, ''))
+            status, output, errors = self.run_main([path, '-c', '2/0.5/4.0'])
+            self.assertEqual(status, 1)
+            status, output, errors = self.run_main([path, '-c', '1/0.5'])
+            self.assertEqual(status, 2)
+            self.assertIn('Error creating competition', errors)
+            status, output, errors = self.run_main([os.path.join(folder, 'missing.txt'), '-c', '1/0.5/4.0'])
+            self.assertEqual(status, 2)
+            self.assertIn('Error reading input', errors)
+            status, output, errors = self.run_main([folder, '-c', '1/0.5/4.0'])
+            self.assertEqual(status, 2)
+
+    def test_main_needs_competition(self):
+        with redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['runners.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
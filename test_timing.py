@@ -0,0 +1,79 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from race import ShortRace, MarathonRace
+from runner import Runner
+from competition import Competition
+from timing import TimingTable
+
+class TestTimingTable(unittest.TestCase):
+
+    def setUp(self):
+        self.runners = [
+            Runner("Elijah", 19, 'Australia', 6.4, 5.2),
+            Runner("Rupert", 67, 'Botswana', 2.2, 1.8),
+            Runner("Phoebe", 12, 'France', 3.4, 2.8),
+        ]
+        self.table = TimingTable(self.runners, {'short': [0.5, 1.0], 'long': [4.0], 'middle': [2.0]})
+
+    def test_matches_run_race(self):
+        for race_type, distance in [('short', 0.5), ('short', 1.0), ('long', 4.0), ('middle', 2.0)]:
+            self.assertEqual(self.table.race_times(race_type, distance, self.runners),
+                             [runner.run_race(race_type, distance) for runner in self.runners])
+        self.assertEqual(len(self.table), 4)
+
+    def test_missing_entries_fall_back(self):
+        """
+        Testing that distances and runners that are not in the table are still timed
+        """
+        stranger = Runner("Lauren", 13, 'Iceland', 4.4, 5.1)
+        self.assertEqual(self.table.time(stranger, 'short', 0.5), stranger.run_race('short', 0.5))
+        self.assertEqual(self.table.time(self.runners[0], 'short', 0.8), self.runners[0].run_race('short', 0.8))
+
+    def test_speed_change_invalidates_row(self):
+        before = self.table.time(self.runners[1], 'middle', 2.0)
+        self.runners[1].endurance_speed = 3.0
+        after = self.table.time(self.runners[1], 'middle', 2.0)
+        self.assertNotEqual(before, after)
+        self.assertEqual(after, self.runners[1].run_race('middle', 2.0))
+        # the other columns of the row were recomputed too
+        self.assertEqual(self.table.time(self.runners[1], 'long', 4.0), self.runners[1].run_race('long', 4.0))
+
+    def test_races_use_table(self):
+        """
+        Testing that races with a timing table give the same results as races without one
+        """
+        expected = ShortRace(1.0, self.runners).conduct_race()
+        race = ShortRace(1.0, self.runners)
+        race.timing_table = self.table
+        self.assertEqual(race.conduct_race(), expected)
+
+        expected = MarathonRace(4.0, self.runners).conduct_race()
+        energies = [runner.energy for runner in self.runners]
+        for runner in self.runners:
+            runner.energy = runner.max_energy
+        race = MarathonRace(4.0, self.runners)
+        race.timing_table = self.table
+        self.assertEqual(race.conduct_race(), expected)
+        self.assertEqual([runner.energy for runner in self.runners], energies)
+
+    def test_competition_builds_table(self):
+        """
+        Testing that a competition precomputes only the distances it runs more than once
+        """
+        competition = Competition(self.runners, 2, [0.5, 0.5], [4.0, 5.0])
+        competition.conduct_competition()
+        self.assertEqual(len(competition.timing_table), 1)
+
+    def test_invalid_input(self):
+        with self.assertRaises(CustomValueError):
+            TimingTable(self.runners, {'sprint': [1.0]})
+        with self.assertRaises(CustomTypeError):
+            TimingTable(self.runners, {'short': [1]})
+        with self.assertRaises(CustomValueError):
+            TimingTable(self.runners, {'short': [-1.0]})
+        with self.assertRaises(CustomTypeError):
+            TimingTable(self.runners, [('short', 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
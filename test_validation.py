@@ -0,0 +1,87 @@
+import unittest
+from custom_errors import CustomValueError, CustomTypeError
+from runner import Runner
+from competition import Competition
+from validation import (FieldError, validate_runner_columns, validate_runner_rows, parse_runner_rows,
+                        build_runners, validate_competition)
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            ("Elijah", 19, 'Australia', 6.4, 5.2),
+            ("", 200, 'Narnia', 6.4, 5.2),
+            ("Rupert", 67, 'Botswana', 2.2, 1.8),
+            ("12345", 30, 'France', 7, 9.9),
+        ]
+
+    def test_every_problem_reported(self):
+        report = validate_runner_rows(self.rows)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.bad_rows(), {1, 3})
+        self.assertEqual(report.valid_rows(), [0, 2])
+        self.assertEqual([(error.field, error.error) for error in report.by_row()[1]],
+                         [('name', CustomValueError), ('age', CustomValueError), ('country', CustomValueError)])
+        self.assertEqual([(error.field, error.error) for error in report.by_row()[3]],
+                         [('name', CustomValueError), ('sprint_speed', CustomTypeError), ('endurance_speed', CustomValueError)])
+        self.assertIn(FieldError(3, 'sprint_speed', CustomTypeError,
+                                 "Incorrect input type for sprint_speed, expected float got <class 'int'> instead"), report.errors)
+
+    def test_matches_runner(self):
+        """
+        Testing that a row is reported exactly when Runner refuses it, with the same exception as the first problem
+        """
+        for row in self.rows:
+            report = validate_runner_rows([row])
+            try:
+                Runner(*row)
+            except (CustomTypeError, CustomValueError) as e:
+                self.assertFalse(report.ok)
+                self.assertIn(type(e), {error.error for error in report})
+            else:
+                self.assertTrue(report.ok)
+
+    def test_raise_first(self):
+        validate_runner_rows(self.rows[:1]).raise_first()
+        with self.assertRaises(CustomValueError):
+            validate_runner_rows(self.rows).raise_first()
+
+    def test_columns_must_match(self):
+        with self.assertRaises(CustomValueError):
+            validate_runner_columns(["Elijah"], [19], [], [6.4], [5.2])
+        self.assertEqual(len(validate_runner_rows([])), 0)
+
+    def test_text_rows(self):
+        rows = [[" Elijah ", "19", "Australia ", "6.4", "5.2"], ["Phoebe", "twelve", "France", "3.4", "fast"]]
+        (names, ages, countries, sprints, endurances), report = parse_runner_rows(rows)
+        self.assertEqual((names[0], ages[0], countries[0], sprints[0]), ("Elijah", 19, "Australia", 6.4))
+        self.assertEqual([(error.row, error.field) for error in report], [(1, 'age'), (1, 'endurance_speed')])
+        with self.assertRaises(CustomValueError):
+            parse_runner_rows([["Elijah", "19"]])
+
+    def test_build_runners(self):
+        runners, report = build_runners(self.rows)
+        self.assertEqual([runner.name for runner in runners], ["Elijah", "Rupert"])
+        self.assertEqual(report.bad_rows(), {1, 3})
+        runners, report = build_runners([["Lauren", "13", "Iceland", "4.4", "5.1"], ["Lauren", "x", "Iceland", "4.4", "5.1"]], text=True)
+        self.assertEqual(len(runners), 1)
+        self.assertEqual(runners[0].age, 13)
+        self.assertEqual(len(report), 1)
+
+    def test_competition(self):
+        self.assertTrue(validate_competition([], 2, [0.5, 1.0], [4.0, 5.0]).ok)
+        report = validate_competition((), 5, [0.5, -1.0, 2], [4.0], max_rounds=3)
+        self.assertEqual([(error.row, error.field) for error in report],
+                         [(None, 'runners'), (None, 'rounds'), (1, 'distances_short'), (2, 'distances_short'),
+                          (None, 'distances_short'), (None, 'distances_marathon')])
+        report = validate_competition([], 2, [0.5, 1.0], [4.0])
+        self.assertEqual([(error.row, error.field, error.error) for error in report],
+                         [(None, 'distances_marathon', CustomValueError)])
+        with self.assertRaises(CustomValueError):
+            report.raise_first()
+        with self.assertRaises(CustomValueError):
+            Competition([], 2, [0.5, 1.0], [4.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from array import array
+from custom_errors import *
+from race_types import RACE_TYPES
+
+class TimingTable:
+    """
+    Precomputed race times of a field of runners for a fixed set of race types and distances.
+    Every (race type, distance) pair gets one float64 array holding each runner's Runner.run_race time,
+    so races over those distances look the times up instead of recomputing and re-validating them.
+    The table remembers the sprint and endurance speed every row was computed from, and a runner
+    whose speeds have changed since gets their row recomputed on the next lookup.
+
+    Attributes:
+    runners(list[Runner]):The runners of the table, in row order.
+
+    Methods:
+    race_times:Returns the times of a list of runners for one race type and distance.
+    time:Returns the time of one runner.
+    """
+
+    def __init__(self, runners: list, distances: dict) -> None:
+        """
+        Computes the times of every runner for every distance.
+
+        Args:
+        runners(list[Runner]):The runners of the field.
+        distances(dict):Maps a race type name to the list of distances (floats, in kilometers) run at that type.
+
+        Raises:
+        CustomTypeError:Error is raised, if 'runners' is not a list, 'distances' is not a dict or a distance is not a float.
+        CustomValueError:Error is raised, if a race type is not registered or a distance is not positive.
+        """
+        if not isinstance(runners, list):
+            raise CustomTypeError(f"Incorrect input type for runners, expected list got {type(runners)} instead")
+        if not isinstance(distances, dict):
+            raise CustomTypeError(f"Incorrect input type for distances, expected dict got {type(distances)} instead")
+        self.runners = list(runners)
+        self._rows = {id(runner): row for row, runner in enumerate(self.runners)}
+        # sprint and endurance speed of every row, interleaved, as the rows were computed
+        self._speeds = array('d')
+        for runner in self.runners:
+            self._speeds.append(runner.sprint_speed)
+            self._speeds.append(runner.endurance_speed)
+        self._columns = {} # (race type, distance) -> array of times, one per row
+        for race_type, race_distances in distances.items():
+            spec = RACE_TYPES.get(race_type)
+            if spec is None:
+                raise CustomValueError(f"Incorrect input value for race_type, race_type must be one of {', '.join(RACE_TYPES)}")
+            for distance in race_distances:
+                if not isinstance(distance, float):
+                    raise CustomTypeError(f"Incorrect input type for distance, expected float got {type(distance)} instead")
+                if distance <= 0:
+                    raise CustomValueError("Incorrect input value for distance, distance must be a positive integer")
+                if (race_type, distance) not in self._columns:
+                    meters = distance * 1000
+                    speed = spec.speed
+                    # the same rounding as Runner.run_race
+                    self._columns[race_type, distance] = array('d', [round(meters / speed(runner), 2) for runner in self.runners])
+
+    def _refresh(self, row: int, runner) -> None:
+        # the runner's speeds changed, so every time in their row is stale
+        for (race_type, distance), column in self._columns.items():
+            column[row] = round(distance * 1000 / RACE_TYPES[race_type].speed(runner), 2)
+        self._speeds[2 * row] = runner.sprint_speed
+        self._speeds[2 * row + 1] = runner.endurance_speed
+
+    def race_times(self, race_type: str, distance: float, runners: list) -> list[float]:
+        """
+        Returns the times of the given runners, as Runner.run_race(race_type, distance) would.
+        Runners or distances that are not in the table are computed with Runner.run_race.
+
+        Args:
+        race_type(str):The race type.
+        distance(float):The distance in kilometers.
+        runners(list[Runner]):The runners.
+        Returns:
+        list[float]: The time of every runner, in the same order.
+        """
+        column = self._columns.get((race_type, distance))
+        if column is None:
+            return [runner.run_race(race_type, distance) for runner in runners]
+        rows, speeds = self._rows, self._speeds
+        times = []
+        for runner in runners:
+            row = rows.get(id(runner))
+            if row is None:
+                times.append(runner.run_race(race_type, distance))
+                continue
+            if speeds[2 * row] != runner.sprint_speed or speeds[2 * row + 1] != runner.endurance_speed:
+                self._refresh(row, runner)
+            times.append(column[row])
+        return times
+
+    def time(self, runner, race_type: str, distance: float) -> float:
+        """
+        Returns the time of one runner, as Runner.run_race(race_type, distance) would.
+        """
+        return self.race_times(race_type, distance, [runner])[0]
+
+    def __len__(self) -> int:
+        return len(self._columns)
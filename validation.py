@@ -0,0 +1,307 @@
+from __future__ import annotations
+import re
+from custom_errors import *
+from runner import Runner
+
+# Text that int() and float() accept for ages and speeds, checked before converting so a bad
+# value is reported without raising and catching a ValueError
+_INT_TEXT = re.compile(r'[+-]?\d+')
+_FLOAT_TEXT = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+# The fields of a runner row, in the order of the name/age/country/sprint/endurance input format
+RUNNER_FIELDS = ('name', 'age', 'country', 'sprint_speed', 'endurance_speed')
+
+class FieldError:
+    """
+    One problem found in the input.
+
+    Attributes:
+    row(int):The index of the row, or of the distance for a distance list, None for a whole field.
+    field(str):The name of the field.
+    error(type):The exception the matching constructor would raise, CustomTypeError or CustomValueError.
+    message(str):What is wrong with the value.
+    """
+
+    __slots__ = ('row', 'field', 'error', 'message')
+
+    def __init__(self, row: int, field: str, error: type, message: str) -> None:
+        self.row = row
+        self.field = field
+        self.error = error
+        self.message = message
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FieldError):
+            return NotImplemented
+        return (self.row, self.field, self.error, self.message) == (other.row, other.field, other.error, other.message)
+
+    def __repr__(self) -> str:
+        return f"FieldError({self.row!r}, {self.field!r}, {self.error.__name__}, {self.message!r})"
+
+    def __str__(self) -> str:
+        return self.message if self.row is None else f"row {self.row}: {self.message}"
+
+
+class ValidationReport:
+    """
+    Every problem found while validating a batch of input, instead of only the first one.
+    Nothing is raised while checking, so a batch with many bad rows costs no more than a clean one.
+
+    Attributes:
+    rows(int):The number of rows checked.
+    errors(list[FieldError]):The problems found, in the order the fields were checked.
+
+    Methods:
+    add:Records a problem.
+    bad_rows:Returns the indexes of the rows with at least one problem.
+    valid_rows:Returns the indexes of the rows without problems.
+    by_row:Returns the problems grouped by row.
+    raise_first:Raises the first problem as the exception the constructors raise.
+    """
+
+    def __init__(self, rows: int = 0) -> None:
+        self.rows = rows
+        self.errors = []
+
+    def add(self, row: int, field: str, error: type, message: str) -> None:
+        """
+        Records a problem.
+        """
+        self.errors.append(FieldError(row, field, error, message))
+
+    @property
+    def ok(self) -> bool:
+        """
+        True when no problem was found.
+        """
+        return not self.errors
+
+    def bad_rows(self) -> set[int]:
+        """
+        Returns the indexes of the rows with at least one problem.
+        """
+        return {error.row for error in self.errors if error.row is not None}
+
+    def valid_rows(self) -> list[int]:
+        """
+        Returns the indexes of the rows without problems, in increasing order.
+        """
+        bad = self.bad_rows()
+        return [row for row in range(self.rows) if row not in bad]
+
+    def by_row(self) -> dict:
+        """
+        Returns the problems grouped by row, as a dict of row index to a list of FieldError.
+        """
+        rows = {}
+        for error in self.errors:
+            rows.setdefault(error.row, []).append(error)
+        return rows
+
+    def raise_first(self) -> None:
+        """
+        Raises the first problem found, if any.
+
+        Raises:
+        CustomTypeError, CustomValueError: The exception of the first problem, with its message.
+        """
+        if self.errors:
+            first = self.errors[0]
+            raise first.error(str(first))
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def __iter__(self):
+        return iter(self.errors)
+
+
+def _check_names(names: list, report: ValidationReport) -> None:
+    # a clean column is accepted with a few whole-column checks that run in C: every name a non-blank str,
+    # the names together alphanumeric once whitespace is removed, and none of them only digits
+    if (set(map(type, names)) <= {str} and all(map(str.strip, names))
+            and ''.join(''.join(names).split()).isalnum() and not any(map(str.isdigit, names))):
+        return
+    # otherwise one comprehension finds the bad rows, only those are looked at again to tell what is wrong with them
+    bad = [row for row, name in enumerate(names)
+           if not (isinstance(name, str) and (name.isalnum() or ''.join(name.split()).isalnum()) and not name.isdigit())]
+    add = report.add
+    for row in bad:
+        name = names[row]
+        if not name:
+            add(row, 'name', CustomValueError, "Incorrect input value for name, as name cannot be empty strings")
+        elif not isinstance(name, str):
+            add(row, 'name', CustomTypeError, f"Incorrect input type for name, expected str got {type(name)} instead")
+        else:
+            add(row, 'name', CustomValueError, "Incorrect input type for name,name is not alphanumeric")
+
+def _check_range(field: str, values: list, kind: type, low, high, report: ValidationReport) -> None:
+    if set(map(type, values)) <= {kind} and (not values or low <= min(values) and max(values) <= high):
+        return
+    bad = [row for row, value in enumerate(values) if not (isinstance(value, kind) and low <= value <= high)]
+    add = report.add
+    out_of_range = f"Incorrect input value for {field}, {field} is not between {low} and {high}"
+    for row in bad:
+        value = values[row]
+        if not isinstance(value, kind):
+            add(row, field, CustomTypeError, f"Incorrect input type for {field}, expected {kind.__name__} got {type(value)} instead")
+        else:
+            add(row, field, CustomValueError, out_of_range)
+
+def _check_countries(countries: list, report: ValidationReport) -> None:
+    valid = Runner.valid_countries()
+    if set(map(type, countries)) <= {str} and valid.issuperset(countries):
+        return
+    bad = [row for row, country in enumerate(countries) if not (isinstance(country, str) and country in valid)]
+    add = report.add
+    for row in bad:
+        country = countries[row]
+        if not isinstance(country, str):
+            add(row, 'country', CustomTypeError, f"Incorrect input type for country, expected str got {type(country)} instead")
+        else:
+            add(row, 'country', CustomValueError, f"Incorrect input value for country, {country!r} is not present in the provided csv")
+
+def validate_runner_columns(names: list, ages: list, countries: list, sprint_speeds: list, endurance_speeds: list) -> ValidationReport:
+    """
+    Checks whole columns of runner fields with the rules of Runner.__init__, one column at a time.
+    Every bad field of every row is reported, where Runner stops at the first one.
+
+    Args:
+    names(list):The names of the runners.
+    ages(list):The ages of the runners.
+    countries(list):The countries of the runners.
+    sprint_speeds(list):The sprint speeds of the runners.
+    endurance_speeds(list):The endurance speeds of the runners.
+    Returns:
+    ValidationReport: The problems found, rows are the indexes in the columns.
+    Raises:
+    CustomValueError:Error is raised, if the columns do not have the same length.
+    """
+    columns = (names, ages, countries, sprint_speeds, endurance_speeds)
+    rows = len(names)
+    if any(len(column) != rows for column in columns):
+        raise CustomValueError("Incorrect input value for the runner columns, every column must have one value per row")
+    report = ValidationReport(rows)
+    _check_names(names, report)
+    _check_range('age', ages, int, 5, 120, report)
+    _check_range('sprint_speed', sprint_speeds, float, 2.2, 6.8, report)
+    _check_range('endurance_speed', endurance_speeds, float, 1.8, 5.4, report)
+    _check_countries(countries, report)
+    return report
+
+def validate_runner_rows(rows: list) -> ValidationReport:
+    """
+    Checks runner rows of (name, age, country, sprint_speed, endurance_speed) with validate_runner_columns.
+
+    Args:
+    rows(list):The runner rows.
+    Returns:
+    ValidationReport: The problems found, rows are the indexes in 'rows'.
+    """
+    if not rows:
+        return ValidationReport(0)
+    return validate_runner_columns(*(list(column) for column in zip(*rows)))
+
+def _convert(field: str, values: list, pattern: re.Pattern, kind: type, report: ValidationReport) -> list:
+    # the text values as numbers, None where the text is not a number
+    converted = []
+    for row, value in enumerate(values):
+        value = value.strip()
+        if pattern.fullmatch(value):
+            converted.append(kind(value))
+        else:
+            report.add(row, field, CustomTypeError, f"Incorrect input type for {field}, {value!r} is not a valid {kind.__name__}")
+            converted.append(None)
+    return converted
+
+def parse_runner_rows(rows: list) -> tuple[list, ValidationReport]:
+    """
+    Converts rows of text fields in the name/age/country/sprint/endurance format and validates them.
+    Text that is not a number is reported like any other problem rather than raising a ValueError.
+
+    Args:
+    rows(list):Rows of five strings.
+    Returns:
+    tuple: The converted columns as a tuple of five lists and the ValidationReport of every row.
+    Raises:
+    CustomValueError:Error is raised, if a row does not have five fields.
+    """
+    if any(len(row) != len(RUNNER_FIELDS) for row in rows):
+        raise CustomValueError("Incorrect input value for rows, every row must have five fields")
+    report = ValidationReport(len(rows))
+    if not rows:
+        return ([], [], [], [], []), report
+    names, ages, countries, sprints, endurances = (list(column) for column in zip(*rows))
+    names = [name.strip() for name in names]
+    countries = [country.strip() for country in countries]
+    ages = _convert('age', ages, _INT_TEXT, int, report)
+    sprints = _convert('sprint_speed', sprints, _FLOAT_TEXT, float, report)
+    endurances = _convert('endurance_speed', endurances, _FLOAT_TEXT, float, report)
+    # fields that could not be converted are already reported, so only the converted ones are checked
+    checked = validate_runner_columns(names, ages, countries, sprints, endurances)
+    converted = {(error.row, error.field) for error in report.errors}
+    report.errors.extend(error for error in checked.errors if (error.row, error.field) not in converted)
+    report.errors.sort(key=lambda error: (error.row, RUNNER_FIELDS.index(error.field)))
+    return (names, ages, countries, sprints, endurances), report
+
+def build_runners(rows: list, text: bool = False) -> tuple[list, ValidationReport]:
+    """
+    Validates runner rows in one batch and creates a Runner for every valid row.
+
+    Args:
+    rows(list):Rows of (name, age, country, sprint_speed, endurance_speed).
+    text(bool):True if the fields are text that still has to be converted, by default False.
+    Returns:
+    tuple: The runners of the valid rows, in row order, and the ValidationReport of every row.
+    """
+    if text:
+        columns, report = parse_runner_rows(rows)
+        rows = list(zip(*columns))
+    else:
+        report = validate_runner_rows(rows)
+    bad = report.bad_rows()
+    runners = [Runner(*row) for index, row in enumerate(rows) if index not in bad]
+    return runners, report
+
+def _check_distances(field: str, distances: list, rounds, report: ValidationReport) -> None:
+    if not isinstance(distances, list):
+        report.add(None, field, CustomTypeError, f"Incorrect input type for {field}, expected list got {type(distances)} instead")
+        return
+    for row, distance in enumerate(distances):
+        if not isinstance(distance, float):
+            report.add(row, field, CustomTypeError, f"Incorrect input type for {field}, expected float got {type(distance)} instead")
+        elif distance <= 0:
+            report.add(row, field, CustomValueError, f"Incorrect input value for {field}, {field} must be positive")
+    if isinstance(rounds, int) and len(distances) != rounds:
+        report.add(None, field, CustomValueError, f"the number of {field} is not equal to the number of rounds")
+
+def validate_competition(runners: list, rounds: int, distances_short: list, distances_marathon: list, max_rounds: int = None) -> ValidationReport:
+    """
+    Checks the arguments of a Competition with the rules of Competition.__init__ and Schedule,
+    reporting every problem instead of raising the first one.
+
+    Args:
+    runners(list):The runners of the competition.
+    rounds(int):The number of rounds.
+    distances_short(list):The short race distance of every round.
+    distances_marathon(list):The marathon distance of every round.
+    max_rounds(int):The largest number of rounds allowed, by default Competition.MAX_ROUNDS.
+    Returns:
+    ValidationReport: The problems found, rows are the indexes in the distance lists.
+    """
+    if max_rounds is None:
+        from competition import Competition
+        max_rounds = Competition.MAX_ROUNDS
+    report = ValidationReport(max(len(distances_short) if isinstance(distances_short, list) else 0,
+                                  len(distances_marathon) if isinstance(distances_marathon, list) else 0))
+    if not isinstance(runners, list):
+        report.add(None, 'runners', CustomTypeError, f"Incorrect input type for runners, expected list got {type(runners)} instead")
+    if not isinstance(rounds, int):
+        report.add(None, 'rounds', CustomTypeError, f"Incorrect input type for rounds, expected int got {type(rounds)} instead")
+    elif rounds <= 0:
+        report.add(None, 'rounds', CustomValueError, "Incorrect input type for rounds,rounds is cannot be a negative integer")
+    elif rounds > max_rounds:
+        report.add(None, 'rounds', CustomValueError, "Incorrect input type for rounds,rounds cannot be more than max rounds")
+    _check_distances('distances_short', distances_short, rounds, report)
+    _check_distances('distances_marathon', distances_marathon, rounds, report)
+    return report